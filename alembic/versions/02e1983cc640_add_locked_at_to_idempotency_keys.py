@@ -0,0 +1,28 @@
+"""add locked_at to idempotency_keys
+
+Revision ID: 02e1983cc640
+Revises: cb5a5b36c1a3
+Create Date: 2026-10-18 19:02:18.540113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02e1983cc640'
+down_revision: Union[str, None] = 'cb5a5b36c1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('idempotency_keys', sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+    # Keys claimed before this column existed count as claimed when created.
+    op.execute("UPDATE idempotency_keys SET locked_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column('idempotency_keys', 'locked_at')
@@ -0,0 +1,49 @@
+"""create reservation_series and reservations.series_id
+
+Revision ID: 13920a1842eb
+Revises: 6273880e5a36
+Create Date: 2026-10-18 13:02:15.274860
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '13920a1842eb'
+down_revision: Union[str, None] = '6273880e5a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reservation_series',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('space_name', sa.String(), nullable=False),
+    sa.Column('start_datetime', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_datetime', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('frequency', sa.String(), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('by_weekday', sa.String(), nullable=True),
+    sa.Column('until', sa.Date(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservation_series_id'), 'reservation_series', ['id'], unique=False)
+    op.add_column('reservations', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_reservations_series_id'), 'reservations', ['series_id'], unique=False)
+    op.create_foreign_key('reservations_series_id_fkey', 'reservations', 'reservation_series', ['series_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('reservations_series_id_fkey', 'reservations', type_='foreignkey')
+    op.drop_index(op.f('ix_reservations_series_id'), table_name='reservations')
+    op.drop_column('reservations', 'series_id')
+    op.drop_index(op.f('ix_reservation_series_id'), table_name='reservation_series')
+    op.drop_table('reservation_series')
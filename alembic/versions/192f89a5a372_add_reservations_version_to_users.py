@@ -0,0 +1,26 @@
+"""add reservations_version to users
+
+Revision ID: 192f89a5a372
+Revises: b34780025e07
+Create Date: 2026-10-18 15:47:30.215877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '192f89a5a372'
+down_revision: Union[str, None] = 'b34780025e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('reservations_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'reservations_version')
@@ -0,0 +1,47 @@
+"""add usage_day to reservations
+
+Revision ID: 2543315e0776
+Revises: 02e1983cc640
+Create Date: 2026-10-18 21:05:12.604318
+
+Records the calendar day each reservation counts toward for the daily limit,
+the day of its start in the offset the client sent. The offset of existing
+reservations is not stored, so they are backfilled with the UTC day of their
+start, which is what user_daily_usage has been keyed by so far.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2543315e0776'
+down_revision: Union[str, None] = '02e1983cc640'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reservations', sa.Column('usage_day', sa.Date(), nullable=True))
+    op.execute("UPDATE reservations SET usage_day = CAST(start_datetime AT TIME ZONE 'UTC' AS DATE)")
+    op.alter_column('reservations', 'usage_day', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('reservations', 'usage_day')
+
+    # Key the ledger by the UTC day again.
+    op.execute("DELETE FROM user_daily_usage")
+    op.execute(
+        """
+        INSERT INTO user_daily_usage (user_id, day, minutes)
+        SELECT
+            user_id,
+            CAST(start_datetime AT TIME ZONE 'UTC' AS DATE),
+            CAST(SUM(EXTRACT(EPOCH FROM end_datetime - start_datetime)) / 60 AS INTEGER)
+        FROM reservations
+        WHERE status = 'active'
+        GROUP BY user_id, CAST(start_datetime AT TIME ZONE 'UTC' AS DATE)
+        """
+    )
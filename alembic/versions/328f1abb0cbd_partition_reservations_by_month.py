@@ -0,0 +1,132 @@
+"""partition reservations by month
+
+Revision ID: 328f1abb0cbd
+Revises: 192f89a5a372
+Create Date: 2026-10-18 17:05:12.604311
+
+Rebuilds reservations as a table range-partitioned on start_datetime, one
+partition per UTC month plus a default partition, and copies the rows over.
+The table is locked while the rows are copied; run it in a maintenance window.
+
+- The primary key becomes (id, start_datetime), since a partitioned table's
+  unique constraints must include the partition key; ids still come from
+  reservations_id_seq.
+- Postgres cannot enforce exclusion constraints across partitions, so each
+  partition gets its own reservations_no_{space,user}_overlap_yYYYYmMM pair.
+  Overlapping reservations always start in the same UTC month unless one
+  spans a month boundary, which the slot locks in app.slots still cover.
+- Partitions cover every month from the oldest reservation (or the current
+  month) to the newest one, and at least 12 months ahead;
+  `python -m app.maintenance create-partitions` adds later ones.
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '328f1abb0cbd'
+down_revision: Union[str, None] = '192f89a5a372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_MONTHS_AHEAD = 12
+COLUMNS = "id, user_id, space_name, start_datetime, end_datetime, status, series_id, created_at, updated_at"
+
+
+def _reservation_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('reservations_id_seq'::regclass)"), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('space_name', sa.String(), nullable=False),
+        sa.Column('start_datetime', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_datetime', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('series_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _add_overlap_constraints(table: str, suffix: str = ""):
+    for column, name in (("space_name", "space"), ("user_id", "user")):
+        op.execute(
+            f"""
+            ALTER TABLE {table}
+            ADD CONSTRAINT reservations_no_{name}_overlap{suffix}
+            EXCLUDE USING gist (
+                {column} WITH =,
+                tstzrange(start_datetime, end_datetime) WITH &&
+            )
+            WHERE (status = 'active')
+            """
+        )
+
+
+def _create_month_partition(parent: str, month: date):
+    suffix = f"_y{month.year}m{month.month:02d}"
+    op.execute(
+        f"CREATE TABLE reservations{suffix} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{_next_month(month).isoformat()} 00:00:00+00')"
+    )
+    _add_overlap_constraints(f"reservations{suffix}", suffix)
+
+
+def _create_indexes_and_keys(table: str):
+    op.create_foreign_key('reservations_user_id_fkey', table, 'users', ['user_id'], ['id'])
+    op.create_foreign_key('reservations_series_id_fkey', table, 'reservation_series', ['series_id'], ['id'])
+    op.create_index('ix_reservations_id', table, ['id'], unique=False)
+    op.create_index('ix_reservations_series_id', table, ['series_id'], unique=False)
+    op.create_index('ix_reservations_user_status_start', table, ['user_id', 'status', 'start_datetime', 'id'], unique=False)
+
+
+def upgrade() -> None:
+    op.create_table('reservations_partitioned', *_reservation_columns(), postgresql_partition_by='RANGE (start_datetime)')
+
+    oldest, newest = op.get_bind().execute(
+        sa.text("SELECT min(start_datetime), max(start_datetime) FROM reservations")
+    ).one()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    last = current
+    for _ in range(PARTITION_MONTHS_AHEAD):
+        last = _next_month(last)
+
+    month = current
+    if oldest is not None:
+        month = min(month, oldest.astimezone(timezone.utc).date().replace(day=1))
+        last = max(last, newest.astimezone(timezone.utc).date().replace(day=1))
+
+    while month <= last:
+        _create_month_partition('reservations_partitioned', month)
+        month = _next_month(month)
+
+    op.execute("CREATE TABLE reservations_default PARTITION OF reservations_partitioned DEFAULT")
+    _add_overlap_constraints("reservations_default", "_default")
+
+    op.execute(f"INSERT INTO reservations_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM reservations")
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations_partitioned.id")
+    op.drop_table('reservations')
+    op.rename_table('reservations_partitioned', 'reservations')
+
+    op.create_primary_key('reservations_pkey', 'reservations', ['id', 'start_datetime'])
+    _create_indexes_and_keys('reservations')
+
+
+def downgrade() -> None:
+    op.create_table('reservations_unpartitioned', *_reservation_columns())
+
+    op.execute(f"INSERT INTO reservations_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM reservations")
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations_unpartitioned.id")
+    # Drops every partition with it.
+    op.drop_table('reservations')
+    op.rename_table('reservations_unpartitioned', 'reservations')
+
+    op.create_primary_key('reservations_pkey', 'reservations', ['id'])
+    _create_indexes_and_keys('reservations')
+    _add_overlap_constraints('reservations')
@@ -0,0 +1,92 @@
+"""add reservation overlap exclusion constraints
+
+Revision ID: 602b877c87ea
+Revises: 153846ad19ec
+Create Date: 2026-10-18 09:12:41.503218
+
+Adding the constraints fails if active reservations already overlap, which
+the previous check-then-insert validation could let through under
+concurrency. The upgrade looks for such pairs first and aborts with their
+ids instead of cancelling anyone's booking. Resolve them by hand (usually by
+cancelling the later booking of each pair:
+`UPDATE reservations SET status = 'cancelled' WHERE id IN (...)`), then rerun it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '602b877c87ea'
+down_revision: Union[str, None] = '153846ad19ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _overlapping_pairs(column: str, limit: int = 20):
+    return op.get_bind().execute(sa.text(
+        f"""
+        SELECT earlier.id, later.id
+        FROM reservations earlier
+        JOIN reservations later
+          ON later.{column} = earlier.{column}
+         AND later.id > earlier.id
+         AND later.start_datetime < earlier.end_datetime
+         AND earlier.start_datetime < later.end_datetime
+        WHERE earlier.status = 'active' AND later.status = 'active'
+        ORDER BY earlier.id, later.id
+        LIMIT {limit}
+        """
+    )).all()
+
+
+def _check_no_overlaps():
+    problems = []
+    for column, name in (("space_name", "space"), ("user_id", "user")):
+        pairs = _overlapping_pairs(column)
+        if pairs:
+            problems.append(f"{name}: " + ", ".join(f"({first}, {second})" for first, second in pairs))
+
+    if problems:
+        raise RuntimeError(
+            "Active reservations overlap, so the exclusion constraints cannot be added. "
+            "Cancel one reservation of each pair of ids and rerun the migration "
+            "(at most 20 pairs shown per kind). " + "; ".join(problems)
+        )
+
+
+def upgrade() -> None:
+    _check_no_overlaps()
+
+    # btree_gist provides the GiST equality operators for space_name and user_id.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.execute(
+        """
+        ALTER TABLE reservations
+        ADD CONSTRAINT reservations_no_space_overlap
+        EXCLUDE USING gist (
+            space_name WITH =,
+            tstzrange(start_datetime, end_datetime) WITH &&
+        )
+        WHERE (status = 'active')
+        """
+    )
+
+    op.execute(
+        """
+        ALTER TABLE reservations
+        ADD CONSTRAINT reservations_no_user_overlap
+        EXCLUDE USING gist (
+            user_id WITH =,
+            tstzrange(start_datetime, end_datetime) WITH &&
+        )
+        WHERE (status = 'active')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('reservations_no_user_overlap', 'reservations')
+    op.drop_constraint('reservations_no_space_overlap', 'reservations')
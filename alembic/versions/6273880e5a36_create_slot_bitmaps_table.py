@@ -0,0 +1,71 @@
+"""create slot_bitmaps table
+
+Revision ID: 6273880e5a36
+Revises: 953c473a1284
+Create Date: 2026-10-18 11:26:53.640912
+
+"""
+from datetime import datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6273880e5a36'
+down_revision: Union[str, None] = '953c473a1284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BITMAP_BYTES = 24 * 60 // 8
+
+
+def _day_masks(start, end):
+    # Same rasterization as app.slots.reservation_masks at the time of writing.
+    start = start.replace(tzinfo=timezone.utc) if start.tzinfo is None else start.astimezone(timezone.utc)
+    end = end.replace(tzinfo=timezone.utc) if end.tzinfo is None else end.astimezone(timezone.utc)
+
+    while start < end:
+        day = start.date()
+        piece_end = min(end, datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc))
+        first_minute = start.hour * 60 + start.minute
+        minutes = int((piece_end - start).total_seconds() // 60)
+        yield day, ((1 << minutes) - 1) << first_minute
+        start = piece_end
+
+
+def upgrade() -> None:
+    slot_bitmaps = op.create_table('slot_bitmaps',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('owner', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('bits', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'owner', 'day')
+    )
+
+    rows = op.get_bind().execute(sa.text(
+        "SELECT user_id, space_name, start_datetime, end_datetime "
+        "FROM reservations WHERE status = 'active'"
+    ))
+
+    bitmaps = {}
+    for user_id, space_name, start_datetime, end_datetime in rows:
+        for day, mask in _day_masks(start_datetime, end_datetime):
+            for key in (('space', space_name, day), ('user', str(user_id), day)):
+                bitmaps[key] = bitmaps.get(key, 0) | mask
+
+    if bitmaps:
+        op.bulk_insert(slot_bitmaps, [
+            {
+                'scope': scope,
+                'owner': owner,
+                'day': day,
+                'bits': bits.to_bytes(BITMAP_BYTES, 'little')
+            }
+            for (scope, owner, day), bits in bitmaps.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('slot_bitmaps')
@@ -0,0 +1,31 @@
+"""add user status start index to reservations
+
+Revision ID: 7ef4f4d77705
+Revises: 13920a1842eb
+Create Date: 2026-10-18 14:21:37.918402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ef4f4d77705'
+down_revision: Union[str, None] = '13920a1842eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_reservations_user_status_start',
+        'reservations',
+        ['user_id', 'status', 'start_datetime', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_user_status_start', table_name='reservations')
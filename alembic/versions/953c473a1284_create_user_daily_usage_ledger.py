@@ -0,0 +1,46 @@
+"""create user_daily_usage ledger
+
+Revision ID: 953c473a1284
+Revises: 602b877c87ea
+Create Date: 2026-10-18 10:04:27.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '953c473a1284'
+down_revision: Union[str, None] = '602b877c87ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_daily_usage',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Days are accounted in UTC, matching app.validators.reservation_day.
+    op.execute(
+        """
+        INSERT INTO user_daily_usage (user_id, day, minutes)
+        SELECT
+            user_id,
+            CAST(start_datetime AT TIME ZONE 'UTC' AS DATE),
+            CAST(SUM(EXTRACT(EPOCH FROM end_datetime - start_datetime)) / 60 AS INTEGER)
+        FROM reservations
+        WHERE status = 'active'
+        GROUP BY user_id, CAST(start_datetime AT TIME ZONE 'UTC' AS DATE)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_daily_usage')
@@ -0,0 +1,113 @@
+"""active partial indexes and enum columns
+
+Revision ID: cb5a5b36c1a3
+Revises: f313461833eb
+Create Date: 2026-10-18 18:12:40.311927
+
+Converts reservations.status and reservations.space_name (and the same
+columns of reservations_archive) from VARCHAR to native enums and indexes
+active reservations with partial indexes. The column type change rewrites
+every partition under an exclusive lock; run it in a maintenance window.
+
+- The per-partition exclusion constraints are dropped and recreated around
+  the type change, so their `status = 'active'` predicate compares enums.
+- ix_reservations_user_status_start is replaced by ix_reservations_user_start:
+  active lookups now use ix_reservations_active_user_start, and exports and
+  listings including cancelled reservations want (start_datetime, id) order.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb5a5b36c1a3'
+down_revision: Union[str, None] = 'f313461833eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('active', 'cancelled')
+SPACES = ('meeting_room_a', 'meeting_room_b', 'conference_hall', 'desk_1', 'desk_2', 'desk_3')
+ACTIVE_ONLY = sa.text("status = 'active'")
+
+
+def _partitions():
+    return op.get_bind().execute(sa.text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'reservations' ORDER BY child.relname"
+    )).scalars().all()
+
+
+def _drop_overlap_constraints(partitions):
+    for partition in partitions:
+        suffix = partition[len('reservations'):]
+        for name in ('space', 'user'):
+            op.execute(f"ALTER TABLE {partition} DROP CONSTRAINT reservations_no_{name}_overlap{suffix}")
+
+
+def _add_overlap_constraints(partitions):
+    for partition in partitions:
+        suffix = partition[len('reservations'):]
+        for column, name in (("space_name", "space"), ("user_id", "user")):
+            op.execute(
+                f"""
+                ALTER TABLE {partition}
+                ADD CONSTRAINT reservations_no_{name}_overlap{suffix}
+                EXCLUDE USING gist (
+                    {column} WITH =,
+                    tstzrange(start_datetime, end_datetime) WITH &&
+                )
+                WHERE (status = 'active')
+                """
+            )
+
+
+def upgrade() -> None:
+    status_type = sa.Enum(*STATUSES, name='reservation_status')
+    space_type = sa.Enum(*SPACES, name='space_name')
+    status_type.create(op.get_bind())
+    space_type.create(op.get_bind())
+
+    partitions = _partitions()
+    _drop_overlap_constraints(partitions)
+    op.drop_index('ix_reservations_user_status_start', table_name='reservations')
+
+    for table in ('reservations', 'reservations_archive'):
+        op.alter_column(table, 'status', type_=status_type, postgresql_using='status::reservation_status')
+        op.alter_column(table, 'space_name', type_=space_type, postgresql_using='space_name::space_name')
+
+    _add_overlap_constraints(partitions)
+    op.create_index('ix_reservations_user_start', 'reservations', ['user_id', 'start_datetime', 'id'], unique=False)
+    op.create_index(
+        'ix_reservations_active_space_start', 'reservations', ['space_name', 'start_datetime', 'end_datetime'],
+        unique=False, postgresql_where=ACTIVE_ONLY
+    )
+    op.create_index(
+        'ix_reservations_active_user_start', 'reservations', ['user_id', 'start_datetime', 'id'],
+        unique=False, postgresql_where=ACTIVE_ONLY
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_active_user_start', table_name='reservations')
+    op.drop_index('ix_reservations_active_space_start', table_name='reservations')
+    op.drop_index('ix_reservations_user_start', table_name='reservations')
+
+    partitions = _partitions()
+    _drop_overlap_constraints(partitions)
+
+    for table in ('reservations', 'reservations_archive'):
+        op.alter_column(table, 'status', type_=sa.String(), postgresql_using='status::text')
+        op.alter_column(table, 'space_name', type_=sa.String(), postgresql_using='space_name::text')
+
+    sa.Enum(name='space_name').drop(op.get_bind())
+    sa.Enum(name='reservation_status').drop(op.get_bind())
+
+    _add_overlap_constraints(partitions)
+    op.create_index(
+        'ix_reservations_user_status_start', 'reservations',
+        ['user_id', 'status', 'start_datetime', 'id'], unique=False
+    )
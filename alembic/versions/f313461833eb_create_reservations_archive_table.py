@@ -0,0 +1,41 @@
+"""create reservations_archive table
+
+Revision ID: f313461833eb
+Revises: 328f1abb0cbd
+Create Date: 2026-10-18 17:21:48.118902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f313461833eb'
+down_revision: Union[str, None] = '328f1abb0cbd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reservations_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('space_name', sa.String(), nullable=False),
+    sa.Column('start_datetime', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_datetime', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('series_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reservations_archive_user_start', 'reservations_archive', ['user_id', 'start_datetime'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_archive_user_start', table_name='reservations_archive')
+    op.drop_table('reservations_archive')
@@ -0,0 +1,130 @@
+"""
+Moves old reservations into reservations_archive.
+
+Reservations are only ever cancelled, never deleted, so without archiving the
+table (and every range query over it) keeps growing. The same goes for the
+slot_bitmaps and user_daily_usage rows written with every booking, which are
+purged for the archived days. Run
+`python -m app.maintenance archive-reservations` periodically.
+"""
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.crud import bump_reservations_version
+from app.models import Reservation, ReservationArchive, SlotBitmap, UserDailyUsage
+
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "365"))
+
+ARCHIVED_COLUMNS = [
+    "id", "user_id", "space_name", "start_datetime", "end_datetime",
+    "status", "series_id", "created_at", "updated_at"
+]
+
+
+def archivable(cutoff: datetime):
+    """
+    Reservations that ended before the cutoff, or were cancelled before it.
+    """
+    return or_(
+        Reservation.end_datetime < cutoff,
+        and_(
+            Reservation.status == "cancelled",
+            func.coalesce(Reservation.updated_at, Reservation.created_at) < cutoff
+        )
+    )
+
+
+def archive_reservations(
+    db: Session,
+    retention_days: int = ARCHIVE_RETENTION_DAYS,
+    batch_size: int = 1000,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Moves reservations older than retention_days into reservations_archive in
+    batches of batch_size, one transaction per batch.
+
+    Business rules:
+    - Active future reservations are never archived.
+    - Ids are preserved.
+    - The owners' reservations_version is bumped, so listing ETags change.
+
+    Returns the number of archived reservations.
+    """
+
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    columns = [getattr(Reservation, name) for name in ARCHIVED_COLUMNS]
+    archived = 0
+    last_id = 0
+
+    while True:
+        # Keyset on id: each batch resumes where the previous one stopped
+        # instead of rescanning the rows already visited.
+        batch = db.execute(
+            select(Reservation.id, Reservation.user_id)
+            .where(archivable(cutoff), Reservation.id > last_id)
+            .order_by(Reservation.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not batch:
+            return archived
+
+        ids = [row.id for row in batch]
+        last_id = ids[-1]
+        db.execute(
+            insert(ReservationArchive).from_select(
+                ARCHIVED_COLUMNS,
+                select(*columns).where(Reservation.id.in_(ids))
+            )
+        )
+        db.execute(
+            delete(Reservation)
+            .where(Reservation.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        bump_reservations_version(db, [row.user_id for row in batch])
+        db.commit()
+
+        archived += len(batch)
+        if len(batch) < batch_size:
+            return archived
+
+
+def purge_day_rows(db: Session, before: date, batch_size: int = 1000) -> int:
+    """
+    Deletes the slot_bitmaps and user_daily_usage rows of days before `before`
+    in batches of batch_size, one transaction per batch.
+
+    Only run it with the cutoff of archive_reservations: once a day's
+    reservations are archived nothing reads these rows again.
+
+    Returns the number of deleted rows.
+    """
+
+    deleted = 0
+    keys = (
+        (SlotBitmap, (SlotBitmap.scope, SlotBitmap.owner, SlotBitmap.day)),
+        (UserDailyUsage, (UserDailyUsage.user_id, UserDailyUsage.day))
+    )
+
+    for model, key in keys:
+        while True:
+            old = select(*key).where(model.day < before).limit(batch_size)
+            result = db.execute(
+                delete(model)
+                .where(tuple_(*key).in_(old))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+    return deleted
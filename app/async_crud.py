@@ -0,0 +1,186 @@
+"""
+Async counterparts of app.crud for the AsyncSession request path.
+
+Reads are written natively against the AsyncSession. Writes reuse the sync
+functions from app.crud (and through them app.validators) via
+AsyncSession.run_sync, which runs them on the session's async connection
+inside a greenlet: the business rules stay in one place and every query they
+issue is still awaited on the event loop.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import crud
+from app.availability import availability_index
+from app.models import User, Reservation
+from app.security import hash_password_async, verify_password_async
+from app.user_cache import CurrentUser
+from app.schemas import (
+    UserCreate,
+    UserLogin,
+    ReservationCreate,
+    ReservationUpdate,
+    ReservationBatchItem,
+    ReservationSeriesCreate
+)
+
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+
+async def get_current_user_fields(db: AsyncSession, user_id: int):
+    """
+    Loads only the columns cached for authenticated users, without hydrating an ORM User.
+    """
+
+    result = await db.execute(
+        select(User.id, User.role, User.is_active).where(User.id == user_id)
+    )
+    row = result.first()
+    if not row:
+        return None
+    return CurrentUser(id=row.id, role=row.role, is_active=bool(row.is_active))
+
+
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+
+async def create_user(db: AsyncSession, user: UserCreate):
+    hashed_password = await hash_password_async(user.password)
+    db_user = await db.run_sync(crud.create_user, user, hashed_password)
+    await db.refresh(db_user, attribute_names=["reservations"])
+    return db_user
+
+
+async def authenticate_user(db: AsyncSession, user_login: UserLogin):
+    """
+    Async version of crud.authenticate_user; bcrypt runs on the hashing executor.
+    """
+
+    user = await get_user_by_email(db, user_login.email)
+    if not user:
+        return False
+    if not await verify_password_async(user_login.password, user.hashed_password):
+        return False
+    return user
+
+
+async def get_user_with_reservations(db: AsyncSession, user_id: int):
+    """
+    Loads a user together with the reservations relationship, which cannot be
+    lazy-loaded outside a greenlet.
+    """
+
+    result = await db.execute(
+        select(User).where(User.id == user_id).options(selectinload(User.reservations))
+    )
+    return result.scalars().first()
+
+
+async def get_reservations_version(db: AsyncSession, user_id: int) -> int:
+    return await find_reservations_version(db, user_id) or 0
+
+
+async def find_reservations_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    """
+    Like get_reservations_version, but None when the user row does not exist
+    (yet, on a replica that is behind).
+    """
+    result = await db.execute(select(User.reservations_version).where(User.id == user_id))
+    return result.scalar_one_or_none()
+
+
+async def get_reservation_by_id(db: AsyncSession, reservation_id: int, user_id: int):
+    result = await db.execute(
+        select(Reservation).where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def get_user_reservations(
+    db: AsyncSession,
+    user_id: int,
+    include_cancelled: bool = False,
+    **filters
+) -> List[Reservation]:
+    result = await db.execute(
+        crud.user_reservations_statement(user_id, include_cancelled, **filters)
+    )
+    return result.scalars().all()
+
+
+async def get_user_reservation_rows(
+    db: AsyncSession,
+    user_id: int,
+    columns,
+    include_cancelled: bool = False,
+    **filters
+):
+    """
+    Same listing as get_user_reservations, but returns only `columns` as row tuples.
+    """
+
+    statement = crud.user_reservations_statement(user_id, include_cancelled, **filters)
+    result = await db.execute(statement.with_only_columns(*columns))
+    return result.all()
+
+
+async def create_reservation(db: AsyncSession, reservation: ReservationCreate, user_id: int):
+    return await db.run_sync(crud.create_reservation, reservation, user_id)
+
+
+async def create_reservations_batch(
+    db: AsyncSession,
+    reservations: List[ReservationBatchItem],
+    user_id: int,
+    atomic: bool = True
+):
+    return await db.run_sync(crud.create_reservations_batch, reservations, user_id, atomic)
+
+
+async def create_reservation_series(db: AsyncSession, series: ReservationSeriesCreate, user_id: int):
+    return await db.run_sync(crud.create_reservation_series, series, user_id)
+
+
+async def update_reservation(
+    db: AsyncSession,
+    reservation_id: int,
+    reservation_update: ReservationUpdate,
+    user_id: int
+):
+    return await db.run_sync(crud.update_reservation, reservation_id, reservation_update, user_id)
+
+
+async def delete_reservation(db: AsyncSession, reservation_id: int, user_id: int):
+    return await db.run_sync(crud.delete_reservation, reservation_id, user_id)
+
+
+async def cancel_reservation_series(db: AsyncSession, series_id: int, user_id: int):
+    return await db.run_sync(crud.cancel_reservation_series, series_id, user_id)
+
+
+async def get_space_free_windows(db: AsyncSession, space_name: str, day, tz):
+    return await db.run_sync(availability_index.free_windows, space_name, day, tz)
+
+
+async def get_space_utilization(db: AsyncSession, start_day, end_day, granularity_minutes: int):
+    # Imported here so NumPy is only loaded once the analytics endpoint is used.
+    from app.utilization import space_utilization
+
+    return await db.run_sync(space_utilization, start_day, end_day, granularity_minutes)
@@ -1,7 +1,9 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
 from fastapi import HTTPException, status
+from app.cache import TTLCache
 from app.schemas import UserResponse
 import os
 from dotenv import load_dotenv
@@ -17,6 +19,10 @@ ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 )
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Verified payloads keyed by the token's SHA-256 digest, kept until the token's exp.
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 def create_access_token(user: UserResponse, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -37,6 +43,8 @@ def create_access_token(user: UserResponse, expires_delta: Optional[timedelta] =
     if getattr(user, "username", None):
         to_encode["username"] = user.username
     
+    from jose import jwt
+
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -44,7 +52,19 @@ def verify_access_token(token: str) -> Dict[str, Any]:
     """
     Verify token and return full payload with user information.
     Throws an HTTPException if the token is invalid.
+
+    Successfully verified tokens are cached until they expire, so a token
+    seen before is resolved without re-running the signature check.
     """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    # python-jose (and the cryptography backend it pulls in) is imported on the
+    # first token operation rather than at startup; see app.startup.warm_up.
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         
@@ -56,13 +76,17 @@ def verify_access_token(token: str) -> Dict[str, Any]:
                     detail=f"Invalid token: missing field {field}"
                 )
         
-        return {
+        verified = {
             "email": payload.get("sub"),
             "user_id": payload.get("user_id"),
             "role": payload.get("role"),
             "username": payload.get("username"),
             "exp": payload.get("exp")
         }
+        if verified["exp"] is not None:
+            token_cache.set(cache_key, verified, ttl_seconds=verified["exp"] - time.time())
+
+        return dict(verified)
         
     except JWTError as e:
         raise HTTPException(
@@ -76,6 +100,8 @@ def unsafe_decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     Decode tokens WITHOUT validating errors.
     Use only for debugging, never on production endpoints.
     """
+    from jose import JWTError, jwt
+
     try:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
@@ -0,0 +1,135 @@
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from time import monotonic
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import Reservation
+from app.validators import BUSINESS_OPEN, BUSINESS_CLOSE, active, overlapping
+
+AVAILABILITY_CACHE_TTL_SECONDS = float(
+    os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "30")
+)
+
+Interval = Tuple[datetime, datetime]
+
+
+def offset_timezone(utc_offset: str) -> timezone:
+    """
+    Parses a "+HH:MM" UTC offset such as "-05:00".
+    """
+    return datetime.strptime(utc_offset, "%z").tzinfo
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+class AvailabilityIndex:
+    """
+    In-process index of busy intervals per (space_name, day).
+
+    Each entry is a list of (start, end) intervals sorted by start, loaded lazily
+    from the database on first use. crud invalidates the affected entries on
+    every reservation write; the TTL bounds staleness for writes made by other
+    worker processes.
+    """
+
+    def __init__(self, ttl_seconds: float = AVAILABILITY_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, date], Tuple[float, List[Interval]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def busy_intervals(self, db: Session, space_name: str, day: date) -> List[Interval]:
+        key = (space_name, day)
+        now = monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+
+        if entry and now - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        intervals = self._load(db, space_name, day)
+
+        with self._lock:
+            # Skip caching if a write invalidated entries while we were loading.
+            if generation == self._generation:
+                self._entries[key] = (now, intervals)
+
+        return intervals
+
+    def free_windows(
+        self,
+        db: Session,
+        space_name: str,
+        day: date,
+        tz: timezone = timezone.utc
+    ) -> List[Interval]:
+        """
+        Returns the gaps between busy intervals, clipped to business hours.
+
+        Business hours are taken in tz, the client's offset, like
+        validate_reservation_time does, so every window can be booked as
+        returned. They may span two UTC days, whose entries are merged.
+        """
+
+        opening = datetime.combine(day, BUSINESS_OPEN, tzinfo=tz)
+        closing = datetime.combine(day, BUSINESS_CLOSE, tzinfo=tz)
+
+        busy = []
+        utc_day = opening.astimezone(timezone.utc).date()
+        while utc_day <= closing.astimezone(timezone.utc).date():
+            busy.extend(self.busy_intervals(db, space_name, utc_day))
+            utc_day += timedelta(days=1)
+
+        windows = []
+        cursor = opening
+
+        for start, end in sorted(busy):
+            if end <= cursor:
+                continue
+            if start >= closing:
+                break
+            if start > cursor:
+                windows.append((cursor, start))
+            cursor = max(cursor, end)
+
+        if cursor < closing:
+            windows.append((cursor, closing))
+
+        return [(start.astimezone(tz), end.astimezone(tz)) for start, end in windows]
+
+    def invalidate(self, space_name: str, day: date):
+        with self._lock:
+            self._entries.pop((space_name, day), None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _load(self, db: Session, space_name: str, day: date) -> List[Interval]:
+        day_start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        day_end = day_start + timedelta(days=1)
+
+        rows = db.query(
+            Reservation.start_datetime,
+            Reservation.end_datetime
+        ).filter(
+            Reservation.space_name == space_name,
+            active(),
+            *overlapping(day_start, day_end)
+        ).order_by(Reservation.start_datetime).all()
+
+        return [(_as_utc(start), _as_utc(end)) for start, end in rows]
+
+
+availability_index = AvailabilityIndex()
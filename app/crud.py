@@ -1,25 +1,54 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.models import User, Reservation
-from app.schemas import UserCreate, UserLogin, ReservationCreate, ReservationUpdate
+from app.availability import availability_index
+from app.metrics import timed
+from app.models import User, Reservation, ReservationSeries, UserDailyUsage
+from app.pagination import Cursor, as_utc
+from app.recurrence import expand_occurrences
+from app.slots import (
+    slot_masks,
+    load_slot_bitmaps,
+    store_slot_bitmaps,
+    claim_slots,
+    release_slots
+)
+from app.schemas import UserCreate, UserLogin, ReservationCreate, ReservationUpdate, ReservationBatchItem, ReservationSeriesCreate
 from app.security import hash_password, verify_password
 from app.validators import (
     normalize_datetime,
+    reservation_day,
+    reservation_minutes,
+    usage_day,
     validate_reservation_time,
-    validate_no_overlap,
-    validate_daily_reservation_limit
+    validate_slots_available,
+    validate_daily_reservation_limit,
+    validate_daily_minutes,
+    lock_daily_usage,
+    raise_for_overlap_violation,
+    active
 )
 
+@timed("crud")
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+@timed("crud")
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
 
-def create_user(db: Session, user: UserCreate):
+@timed("crud")
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
     db_user = User(
         email=user.email,
         username=user.username,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password or hash_password(user.password),
         role=user.role.value
     )
     db.add(db_user)
@@ -28,6 +57,7 @@ def create_user(db: Session, user: UserCreate):
     return db_user
 
 
+@timed("crud")
 def authenticate_user(db: Session, user_login: UserLogin):
     """
     Authenticates a user using email and password credentials.
@@ -45,12 +75,95 @@ def authenticate_user(db: Session, user_login: UserLogin):
     return user
 
 
-def get_reservation_by_id(db: Session, reservation_id: int, user_id: int):
-    return db.query(Reservation).filter(
+def _apply_daily_usage(db: Session, deltas: Dict[Tuple[int, date], int]):
+    """
+    Adds minute deltas to the user_daily_usage ledger, keyed by (user_id, day).
+
+    Runs as a single multi-row upsert inside the caller's transaction, so the
+    ledger commits or rolls back together with the reservation writes.
+    """
+
+    if not deltas:
+        return
+
+    upsert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+    statement = upsert(UserDailyUsage).values([
+        {"user_id": user_id, "day": day, "minutes": minutes}
+        for (user_id, day), minutes in sorted(deltas.items())
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[UserDailyUsage.user_id, UserDailyUsage.day],
+        set_={"minutes": UserDailyUsage.minutes + statement.excluded.minutes}
+    )
+
+    db.execute(statement)
+
+
+def _adjust_daily_usage(
+    db: Session,
+    user_id: int,
+    day: date,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    sign: int
+):
+    """
+    Adds (sign=1) or removes (sign=-1) a reservation's minutes from the user_daily_usage ledger.
+
+    day is the reservation's usage_day.
+    """
+
+    _apply_daily_usage(db, {
+        (user_id, day): sign * reservation_minutes(start_datetime, end_datetime)
+    })
+
+
+def bump_reservations_version(db: Session, user_ids: Iterable[int]):
+    """
+    Increments users.reservations_version, which backs the reservation ETags.
+
+    Users are updated one by one in id order so concurrent transactions lock
+    them in the same order.
+    """
+    for user_id in sorted(set(user_ids)):
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(reservations_version=User.reservations_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@timed("crud")
+def _commit_reservation(db: Session, db_reservation: Reservation):
+    """
+    Commits a reservation write, mapping overlap constraint violations to 409 responses.
+    """
+
+    try:
+        db.commit()
+    except IntegrityError as error:
+        db.rollback()
+        raise_for_overlap_violation(error)
+
+    db.refresh(db_reservation)
+
+
+@timed("crud")
+def get_reservation_by_id(db: Session, reservation_id: int, user_id: int, for_update: bool = False):
+    query = db.query(Reservation).filter(
         Reservation.id == reservation_id, 
         Reservation.user_id == user_id
-    ).first()
+    )
+
+    if for_update:
+        # Locks the row and re-reads it, even if the session already holds it.
+        query = query.with_for_update().populate_existing()
+
+    return query.first()
 
+@timed("crud")
 def create_reservation(db: Session, reservation: ReservationCreate, user_id: int):
     """
     Creates a new reservation after applying all business validations.
@@ -58,9 +171,14 @@ def create_reservation(db: Session, reservation: ReservationCreate, user_id: int
     Business rules:
     - Reservation dates are normalized before validation.
     - Temporal reservation policies must be satisfied.
-    - Overlapping reservations are not allowed.
-    - Users cannot exceed the daily reservation limit.
+    - Overlapping reservations are not allowed. They are detected on the
+      space/user minute bitmaps, which are updated in the same transaction;
+      on PostgreSQL the exclusion constraints remain as a backstop at commit.
+    - Users cannot exceed the daily reservation limit. The reservation's minutes
+      are added to the daily usage ledger in the same transaction.
     - Reservations are created with active status by default.
+    - Dates are validated in the client's offset and stored in UTC, so the
+      bitmaps released from a row read back later match the ones claimed.
     """
 
     start_datetime = normalize_datetime(reservation.start_datetime)
@@ -71,13 +189,10 @@ def create_reservation(db: Session, reservation: ReservationCreate, user_id: int
         end_datetime
     )
 
-    validate_no_overlap(
-        db=db,
-        user_id=user_id,
-        space_name=reservation.space_name.value,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime
-    )
+    masks = slot_masks(user_id, reservation.space_name.value, start_datetime, end_datetime)
+    bitmaps = load_slot_bitmaps(db, masks, for_update=True)
+
+    validate_slots_available(bitmaps, masks)
 
     validate_daily_reservation_limit(
     db=db,
@@ -89,16 +204,22 @@ def create_reservation(db: Session, reservation: ReservationCreate, user_id: int
     db_reservation = Reservation(
         user_id=user_id,
         space_name=reservation.space_name.value,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime
+        start_datetime=as_utc(start_datetime),
+        end_datetime=as_utc(end_datetime),
+        usage_day=usage_day(start_datetime)
     )
 
     db.add(db_reservation)
-    db.commit()
-    db.refresh(db_reservation)
+    _adjust_daily_usage(db, user_id, usage_day(start_datetime), start_datetime, end_datetime, 1)
+    store_slot_bitmaps(db, claim_slots(bitmaps, masks))
+    bump_reservations_version(db, [user_id])
+    _commit_reservation(db, db_reservation)
+
+    availability_index.invalidate(db_reservation.space_name, reservation_day(start_datetime))
 
     return db_reservation
 
+@timed("crud")
 def update_reservation(db: Session, reservation_id: int, reservation_update: ReservationUpdate, user_id: int):
     """
     Updates an existing reservation and revalidates all business rules.
@@ -110,14 +231,24 @@ def update_reservation(db: Session, reservation_id: int, reservation_update: Res
     - Updates cannot create overlaps with other active reservations.
     - Updates cannot cause the user to exceed the daily reservation limit.
     - The current reservation is excluded from overlap and daily limit checks.
+    - The daily usage ledger and the slot bitmaps move from the previous time
+      range to the new one in the same transaction.
+    - The reservation row is locked first, so an update racing a cancel sees
+      the cancelled status and does not claim slots or minutes for it.
     """
     
-    db_reservation = get_reservation_by_id(db, reservation_id, user_id)
+    db_reservation = get_reservation_by_id(db, reservation_id, user_id, for_update=True)
     if not db_reservation:
         return None
+
+    previous_space = db_reservation.space_name
+    previous_start = db_reservation.start_datetime
+    previous_end = db_reservation.end_datetime
+    previous_usage_day = db_reservation.usage_day
+    was_active = db_reservation.status == "active"
+    changes = reservation_update.model_dump(exclude_unset=True)
     
-    
-    for field, value in reservation_update.model_dump(exclude_unset=True).items():
+    for field, value in changes.items():
         if hasattr(db_reservation, field):
             if field == "space_name" and value:
                 setattr(db_reservation, field, value.value)
@@ -133,6 +264,9 @@ def update_reservation(db: Session, reservation_id: int, reservation_update: Res
     db_reservation.end_datetime = normalize_datetime(
         db_reservation.end_datetime
     )
+
+    if "start_datetime" in changes:
+        db_reservation.usage_day = usage_day(db_reservation.start_datetime)
     
                 
     validate_reservation_time(
@@ -140,27 +274,61 @@ def update_reservation(db: Session, reservation_id: int, reservation_update: Res
         db_reservation.end_datetime
     )
 
-    validate_no_overlap(
-        db=db,
-        user_id=user_id,
-        space_name=db_reservation.space_name,
-        start_datetime=db_reservation.start_datetime,
-        end_datetime=db_reservation.end_datetime,
-        reservation_id=reservation_id
+    previous_masks = slot_masks(user_id, previous_space, previous_start, previous_end) if was_active else {}
+    masks = slot_masks(
+        user_id,
+        db_reservation.space_name,
+        db_reservation.start_datetime,
+        db_reservation.end_datetime
     )
+    bitmaps = load_slot_bitmaps(db, previous_masks.keys() | masks.keys(), for_update=True)
+    bitmaps = release_slots(bitmaps, previous_masks)
+
+    validate_slots_available(bitmaps, masks)
+
+    # Both ledger rows, in key order, before either is read or written.
+    lock_daily_usage(db, [(user_id, previous_usage_day), (user_id, db_reservation.usage_day)])
     
     validate_daily_reservation_limit(
     db=db,
     user_id=user_id,
     start_datetime=db_reservation.start_datetime,
     end_datetime=db_reservation.end_datetime,
-    reservation_id=reservation_id
+    reservation_id=reservation_id,
+    day=db_reservation.usage_day
     )
+
+    if was_active:
+        _adjust_daily_usage(db, user_id, previous_usage_day, previous_start, previous_end, -1)
+
+    if db_reservation.status == "active":
+        _adjust_daily_usage(
+            db,
+            user_id,
+            db_reservation.usage_day,
+            db_reservation.start_datetime,
+            db_reservation.end_datetime,
+            1
+        )
+        bitmaps = claim_slots(bitmaps, masks)
+
+    store_slot_bitmaps(db, bitmaps)
+    bump_reservations_version(db, [user_id])
+
+    db_reservation.start_datetime = as_utc(db_reservation.start_datetime)
+    db_reservation.end_datetime = as_utc(db_reservation.end_datetime)
     
-    db.commit()
-    db.refresh(db_reservation)
+    _commit_reservation(db, db_reservation)
+
+    availability_index.invalidate(previous_space, reservation_day(previous_start))
+    availability_index.invalidate(
+        db_reservation.space_name,
+        reservation_day(db_reservation.start_datetime)
+    )
+
     return db_reservation
 
+@timed("crud")
 def delete_reservation(db: Session, reservation_id: int, user_id: int):
     """
     Cancels a reservation using a soft delete strategy.
@@ -169,30 +337,484 @@ def delete_reservation(db: Session, reservation_id: int, user_id: int):
     - Reservations are not physically removed from the database.
     - Status is changed from active to cancelled.
     - Cancelled reservations are excluded from overlap validations.
-    - Cancelled reservations do not count toward the daily reservation limit.
+    - Cancelled reservations do not count toward the daily reservation limit,
+      so their minutes are released from the daily usage ledger.
+    - Their minutes are also released from the space and user slot bitmaps.
+    - Cancelling an already cancelled reservation changes nothing.
     """
 
-    db_reservation = get_reservation_by_id(db, reservation_id, user_id)
-    if not db_reservation:
-        return None
-    
-    db_reservation.status = "cancelled"
+    # Only the transaction that flips the row from active releases its
+    # minutes, so concurrent cancels of one reservation release them once.
+    db_reservation = db.scalars(
+        update(Reservation)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == user_id,
+            active()
+        )
+        .values(status="cancelled")
+        .returning(Reservation),
+        execution_options={"synchronize_session": False}
+    ).first()
+
+    if db_reservation is None:
+        # Unknown, owned by someone else or already cancelled.
+        db.rollback()
+        return get_reservation_by_id(db, reservation_id, user_id)
+
+    # Bitmaps before the ledger, the lock order of every write path.
+    masks = slot_masks(
+        user_id,
+        db_reservation.space_name,
+        db_reservation.start_datetime,
+        db_reservation.end_datetime
+    )
+    bitmaps = load_slot_bitmaps(db, masks, for_update=True)
+    store_slot_bitmaps(db, release_slots(bitmaps, masks))
+
+    _adjust_daily_usage(
+        db,
+        user_id,
+        db_reservation.usage_day,
+        db_reservation.start_datetime,
+        db_reservation.end_datetime,
+        -1
+    )
+
+    bump_reservations_version(db, [user_id])
     db.commit()
     db.refresh(db_reservation)
+
+    availability_index.invalidate(
+        db_reservation.space_name,
+        reservation_day(db_reservation.start_datetime)
+    )
+
     return db_reservation  
 
-def get_user_reservations(db: Session, user_id: int, include_cancelled: bool = False):
+def user_reservations_statement(
+    user_id: int,
+    include_cancelled: bool = False,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    space_name: Optional[str] = None,
+    after: Optional[Cursor] = None,
+    limit: Optional[int] = None
+):
     """
-    Returns reservations belonging to a specific user.
+    Builds the SELECT behind a user's reservation listing.
 
     Business rules:
     - Active reservations are returned by default.
     - Cancelled reservations are included only when include_cancelled is explicitly enabled.
+    - start_from/start_to bound start_datetime to [start_from, start_to).
+    - Rows are ordered by (start_datetime, id); `after` resumes strictly after
+      that position (keyset pagination), so a page costs the same however deep
+      it is. Served by ix_reservations_active_user_start, or by
+      ix_reservations_user_start when cancelled reservations are included.
     """
-    
-    query = db.query(Reservation).filter(Reservation.user_id == user_id)
-    
+
+    statement = select(Reservation).where(Reservation.user_id == user_id)
+
     if not include_cancelled:
-        query = query.filter(Reservation.status == "active")
-    
-    return query.all()
\ No newline at end of file
+        statement = statement.where(active())
+    if start_from is not None:
+        statement = statement.where(Reservation.start_datetime >= as_utc(start_from))
+    if start_to is not None:
+        statement = statement.where(Reservation.start_datetime < as_utc(start_to))
+    if space_name is not None:
+        statement = statement.where(Reservation.space_name == space_name)
+
+    if after is not None:
+        after_start, after_id = after
+        # The redundant >= gives the planner an index range; the OR breaks ties on id.
+        statement = statement.where(
+            Reservation.start_datetime >= after_start,
+            or_(
+                Reservation.start_datetime > after_start,
+                Reservation.id > after_id
+            )
+        )
+
+    statement = statement.order_by(Reservation.start_datetime, Reservation.id)
+
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    return statement
+
+
+@timed("crud")
+def get_user_reservations(db: Session, user_id: int, include_cancelled: bool = False, **filters):
+    """
+    Returns reservations belonging to a specific user.
+
+    Accepts the same filters and cursor as user_reservations_statement.
+    """
+
+    return db.execute(
+        user_reservations_statement(user_id, include_cancelled, **filters)
+    ).scalars().all()
+
+
+ReservationCandidate = Tuple[int, str, datetime, datetime]
+
+
+def _plan_reservations(
+    db: Session,
+    candidates: List[ReservationCandidate],
+    errors: Optional[List[Optional[HTTPException]]] = None
+):
+    """
+    Validates many (user_id, space_name, start_datetime, end_datetime) candidates in one pass.
+
+    Business rules are the same as create_reservation, plus:
+    - Slot bitmaps are loaded with one query per affected day, and the daily
+      usage rows are locked with one query.
+    - Candidates are checked in order against the persisted state and against
+      the candidates accepted before them, so intra-batch conflicts are caught.
+
+    Candidates already rejected in errors are skipped. Returns the normalized
+    candidates, a list holding None for accepted candidates or the
+    HTTPException that rejected them, the claimed bitmaps and the daily usage
+    deltas to persist.
+    """
+
+    normalized = []
+    errors = list(errors) if errors is not None else [None] * len(candidates)
+    masks_by_index = {}
+
+    for index, (user_id, space_name, start_datetime, end_datetime) in enumerate(candidates):
+        start_datetime = normalize_datetime(start_datetime)
+        end_datetime = normalize_datetime(end_datetime)
+        normalized.append((user_id, space_name, start_datetime, end_datetime))
+
+        if errors[index] is not None:
+            continue
+
+        try:
+            validate_reservation_time(start_datetime, end_datetime)
+        except HTTPException as error:
+            errors[index] = error
+            continue
+
+        masks_by_index[index] = slot_masks(user_id, space_name, start_datetime, end_datetime)
+
+    bitmap_keys_by_day = defaultdict(set)
+    user_ids_by_day = defaultdict(set)
+
+    for index, masks in masks_by_index.items():
+        for key in masks:
+            bitmap_keys_by_day[key[2]].add(key)
+        user_id, _, start_datetime, _ = normalized[index]
+        user_ids_by_day[usage_day(start_datetime)].add(user_id)
+
+    bitmaps = {}
+    for day in sorted(bitmap_keys_by_day):
+        bitmaps.update(load_slot_bitmaps(db, bitmap_keys_by_day[day], for_update=True))
+
+    usage = lock_daily_usage(db, (
+        (user_id, day) for day, user_ids in user_ids_by_day.items() for user_id in user_ids
+    ))
+
+    usage_deltas = defaultdict(int)
+
+    for index, masks in masks_by_index.items():
+        user_id, _, start_datetime, end_datetime = normalized[index]
+        usage_key = (user_id, usage_day(start_datetime))
+        minutes = reservation_minutes(start_datetime, end_datetime)
+
+        try:
+            validate_slots_available(bitmaps, masks)
+            validate_daily_minutes(usage.get(usage_key, 0) + minutes)
+        except HTTPException as error:
+            errors[index] = error
+            continue
+
+        bitmaps = claim_slots(bitmaps, masks)
+        usage[usage_key] = usage.get(usage_key, 0) + minutes
+        usage_deltas[usage_key] += minutes
+
+    return normalized, errors, bitmaps, usage_deltas
+
+
+def _insert_planned_reservations(
+    db: Session,
+    normalized: List[ReservationCandidate],
+    errors: List[Optional[HTTPException]],
+    bitmaps,
+    usage_deltas,
+    **values
+) -> Dict[int, Reservation]:
+    """
+    Inserts the accepted candidates with a single multi-row INSERT ... RETURNING and commits.
+
+    Extra keyword values (e.g. series_id) are set on every inserted row.
+    Returns the created reservations keyed by candidate index.
+    """
+
+    accepted = [index for index, error in enumerate(errors) if error is None]
+    if not accepted:
+        db.rollback()
+        return {}
+
+    rows = [
+        {
+            "user_id": normalized[index][0],
+            "space_name": normalized[index][1],
+            "start_datetime": as_utc(normalized[index][2]),
+            "end_datetime": as_utc(normalized[index][3]),
+            "usage_day": usage_day(normalized[index][2]),
+            **values
+        }
+        for index in accepted
+    ]
+
+    created = db.scalars(
+        insert(Reservation).returning(Reservation, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+    store_slot_bitmaps(db, bitmaps)
+    _apply_daily_usage(db, usage_deltas)
+    bump_reservations_version(db, (row["user_id"] for row in rows))
+
+    # RETURNING already loaded every column; detach the rows so the commit
+    # does not expire them and trigger one SELECT per reservation.
+    for reservation in created:
+        db.expunge(reservation)
+
+    try:
+        db.commit()
+    except IntegrityError as error:
+        db.rollback()
+        raise_for_overlap_violation(error)
+
+    for reservation in created:
+        availability_index.invalidate(
+            reservation.space_name,
+            reservation_day(reservation.start_datetime)
+        )
+
+    return dict(zip(accepted, created))
+
+
+@timed("crud")
+def get_existing_user_ids(db: Session, user_ids: Iterable[int]) -> set:
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+    return {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))}
+
+
+@timed("crud")
+def create_reservations_batch(
+    db: Session,
+    reservations: List[ReservationBatchItem],
+    user_id: int,
+    atomic: bool = True
+) -> List[Reservation | HTTPException]:
+    """
+    Creates several reservations with a single validation pass and a single insert.
+
+    Business rules:
+    - Every item is validated with the same rules as create_reservation.
+    - Items are also checked against each other, in request order.
+    - Items without user_id are booked for the requesting user.
+    - Items for unknown users are rejected.
+    - atomic=True creates nothing unless every item is valid; otherwise the
+      valid items are created and the invalid ones reported.
+
+    Returns, per item, the created Reservation or the HTTPException that rejected it.
+    """
+
+    owners = [item.user_id if item.user_id is not None else user_id for item in reservations]
+    existing_user_ids = get_existing_user_ids(db, owners)
+
+    unknown_user_errors = [
+        None if owner in existing_user_ids else HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+        for owner in owners
+    ]
+
+    normalized, errors, bitmaps, usage_deltas = _plan_reservations(db, [
+        (owner, item.space_name.value, item.start_datetime, item.end_datetime)
+        for owner, item in zip(owners, reservations)
+    ], unknown_user_errors)
+
+    if atomic and any(errors):
+        db.rollback()
+        return errors
+
+    created = _insert_planned_reservations(db, normalized, errors, bitmaps, usage_deltas)
+
+    return [created.get(index, error) for index, error in enumerate(errors)]
+
+
+@timed("crud")
+def create_reservation_series(db: Session, series: ReservationSeriesCreate, user_id: int):
+    """
+    Creates a recurring reservation series and all of its occurrences.
+
+    Business rules:
+    - The rule is expanded into concrete occurrences (see app.recurrence).
+    - Every occurrence must satisfy the same rules as create_reservation; they
+      are validated together with _plan_reservations, not one query each.
+    - The series is all-or-nothing: if any occurrence fails, nothing is
+      created and the failing occurrences are reported.
+    - Occurrences are bulk-inserted and linked to the series through series_id.
+
+    Returns the series and its reservations.
+    """
+
+    start_datetime = normalize_datetime(series.start_datetime)
+    end_datetime = normalize_datetime(series.end_datetime)
+    space_name = series.space_name.value
+
+    occurrences = expand_occurrences(
+        start_datetime,
+        end_datetime,
+        series.frequency.value,
+        series.interval,
+        series.by_weekday,
+        series.until,
+        series.count
+    )
+
+    normalized, errors, bitmaps, usage_deltas = _plan_reservations(db, [
+        (user_id, space_name, occurrence_start, occurrence_end)
+        for occurrence_start, occurrence_end in occurrences
+    ])
+
+    failures = [(index, error) for index, error in enumerate(errors) if error is not None]
+
+    if failures:
+        db.rollback()
+        raise HTTPException(
+            status_code=failures[0][1].status_code,
+            detail=[
+                {
+                    "index": index,
+                    "start_datetime": normalized[index][2].isoformat(),
+                    "status_code": error.status_code,
+                    "detail": error.detail
+                }
+                for index, error in failures
+            ]
+        )
+
+    db_series = ReservationSeries(
+        user_id=user_id,
+        space_name=space_name,
+        start_datetime=start_datetime,
+        end_datetime=end_datetime,
+        frequency=series.frequency.value,
+        interval=series.interval,
+        by_weekday=",".join(str(day) for day in sorted(set(series.by_weekday))) if series.by_weekday else None,
+        until=series.until,
+        count=series.count
+    )
+    db.add(db_series)
+    db.flush()
+
+    created = _insert_planned_reservations(
+        db,
+        normalized,
+        errors,
+        bitmaps,
+        usage_deltas,
+        series_id=db_series.id
+    )
+
+    db.refresh(db_series)
+    return db_series, list(created.values())
+
+
+def _release_reservations(db: Session, reservations: List[Reservation]):
+    """
+    Releases the slot bitmaps and daily usage held by reservations that stop being active.
+    """
+
+    masks = {}
+    usage_deltas = defaultdict(int)
+
+    for reservation in reservations:
+        for key, mask in slot_masks(
+            reservation.user_id,
+            reservation.space_name,
+            reservation.start_datetime,
+            reservation.end_datetime
+        ).items():
+            masks[key] = masks.get(key, 0) | mask
+
+        usage_deltas[(reservation.user_id, reservation.usage_day)] -= reservation_minutes(
+            reservation.start_datetime,
+            reservation.end_datetime
+        )
+
+    keys_by_day = defaultdict(set)
+    for key in masks:
+        keys_by_day[key[2]].add(key)
+
+    bitmaps = {}
+    for day in sorted(keys_by_day):
+        bitmaps.update(load_slot_bitmaps(db, keys_by_day[day], for_update=True))
+
+    store_slot_bitmaps(db, release_slots(bitmaps, masks))
+    _apply_daily_usage(db, usage_deltas)
+
+
+@timed("crud")
+def cancel_reservation_series(db: Session, series_id: int, user_id: int):
+    """
+    Cancels the upcoming occurrences of a reservation series.
+
+    Business rules:
+    - Only series owned by the user can be cancelled.
+    - Active occurrences that have not started yet are cancelled with a single
+      UPDATE on series_id; past occurrences are kept as they are.
+    - Their slot bitmaps and daily usage are released in the same transaction.
+
+    Returns the series and the cancelled reservations, or None when not found.
+    """
+
+    db_series = db.query(ReservationSeries).filter(
+        ReservationSeries.id == series_id,
+        ReservationSeries.user_id == user_id
+    ).first()
+
+    if not db_series:
+        return None
+
+    cancelled = db.scalars(
+        update(Reservation)
+        .where(
+            Reservation.series_id == series_id,
+            active(),
+            Reservation.start_datetime > datetime.now(timezone.utc)
+        )
+        .values(status="cancelled")
+        .returning(Reservation),
+        execution_options={"synchronize_session": False}
+    ).all()
+
+    _release_reservations(db, cancelled)
+
+    db_series.status = "cancelled"
+    bump_reservations_version(db, [user_id])
+
+    for reservation in cancelled:
+        db.expunge(reservation)
+
+    db.commit()
+    db.refresh(db_series)
+
+    for reservation in cancelled:
+        availability_index.invalidate(
+            reservation.space_name,
+            reservation_day(reservation.start_datetime)
+        )
+
+    return db_series, cancelled
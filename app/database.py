@@ -1,8 +1,12 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import threading
 from dotenv import load_dotenv
+from app.pool import PoolMetrics, instrument_engine, instrumented_pool_class
 
 load_dotenv()
 
@@ -10,14 +14,177 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-    
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Optional read replica for read-only routes (see app.dependencies.get_read_db).
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+
+if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith("postgres://"):
+    DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace("postgres://", "postgresql://", 1)
+
+# Pool settings apply to each engine (sync and async) of every worker process.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+def to_async_url(url: str) -> str:
+    """
+    Maps a sync DATABASE_URL to its async driver: asyncpg for PostgreSQL, aiosqlite for SQLite.
+    """
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def pool_options(url: str, pool_class, metrics: PoolMetrics) -> dict:
+    """
+    Returns the create_engine pool arguments for a URL.
+
+    SQLite keeps SQLAlchemy's default pools: it has no server connections to size.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(pool_class, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
+
+
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
 Base = declarative_base()
 
+# Engines are built on first use rather than at import, so importing the app
+# does not load the database drivers; the lifespan hook creates them in the
+# background right after startup. `engine`, `SessionLocal`, `async_engine` and
+# `AsyncSessionLocal` stay importable from this module through __getattr__.
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _create_engines() -> dict:
+    engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, QueuePool, sync_pool_metrics))
+    async_engine = create_async_engine(
+        to_async_url(DATABASE_URL),
+        **pool_options(DATABASE_URL, AsyncAdaptedQueuePool, async_pool_metrics)
+    )
+
+    instrument_engine(engine, sync_pool_metrics)
+    instrument_engine(async_engine.sync_engine, async_pool_metrics)
+
+    engines = {
+        "engine": engine,
+        "SessionLocal": sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        "async_engine": async_engine,
+        "AsyncSessionLocal": async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False),
+        "replica_async_engine": None,
+        "ReplicaAsyncSessionLocal": None
+    }
+
+    if DATABASE_REPLICA_URL:
+        replica_engine = create_async_engine(
+            to_async_url(DATABASE_REPLICA_URL),
+            **pool_options(DATABASE_REPLICA_URL, AsyncAdaptedQueuePool, replica_pool_metrics)
+        )
+        instrument_engine(replica_engine.sync_engine, replica_pool_metrics)
+        engines["replica_async_engine"] = replica_engine
+        engines["ReplicaAsyncSessionLocal"] = async_sessionmaker(replica_engine, class_=AsyncSession, autoflush=False)
+
+    return engines
+
+
+def get_engines() -> dict:
+    """
+    Returns the sync and async engines and their session factories, creating them on first call.
+    """
+    if not _engines:
+        with _engines_lock:
+            if not _engines:
+                _engines.update(_create_engines())
+    return _engines
+
+
+def __getattr__(name: str):
+    if name in ("engine", "SessionLocal", "async_engine", "AsyncSessionLocal"):
+        return get_engines()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def dispose_engines():
+    """
+    Closes the pooled connections of every engine, if they were created.
+    """
+    if _engines:
+        await _engines["async_engine"].dispose()
+        _engines["engine"].dispose()
+        if _engines["replica_async_engine"] is not None:
+            await _engines["replica_async_engine"].dispose()
+
+
+def reset_engines_after_fork():
+    """
+    Gives a forked worker fresh, empty pools.
+
+    Connections the parent process may have opened stay open for the parent
+    (close=False) but are never handed out in the child, so two processes
+    never share a socket.
+    """
+    if _engines:
+        _engines["engine"].dispose(close=False)
+        _engines["async_engine"].sync_engine.dispose(close=False)
+        if _engines["replica_async_engine"] is not None:
+            _engines["replica_async_engine"].sync_engine.dispose(close=False)
+
+
+def pool_diagnostics() -> dict:
+    """
+    Pool settings and live counters for the sync, async and (if configured) replica engines.
+    """
+    engines = get_engines()
+    diagnostics = {
+        "settings": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING
+        },
+        "sync": sync_pool_metrics.snapshot(engines["engine"].pool),
+        "async": async_pool_metrics.snapshot(engines["async_engine"].sync_engine.pool)
+    }
+    if engines["replica_async_engine"] is not None:
+        diagnostics["replica"] = replica_pool_metrics.snapshot(engines["replica_async_engine"].sync_engine.pool)
+    return diagnostics
+
 def get_db():
-    db = SessionLocal()
+    db = get_engines()["SessionLocal"]()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with get_engines()["AsyncSessionLocal"]() as db:
+        yield db
+
+def get_async_session_factory():
+    """
+    Provides the session factory itself, for responses that must open their
+    session after the request's dependencies have been torn down (streaming).
+    """
+    return get_engines()["AsyncSessionLocal"]
+
+def get_replica_session_factory():
+    """
+    The replica session factory, or None when DATABASE_REPLICA_URL is not set.
+    """
+    return get_engines()["ReplicaAsyncSessionLocal"]
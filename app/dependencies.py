@@ -1,27 +1,94 @@
-from fastapi import Depends, HTTPException, status
+from typing import AsyncIterator
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_replica_session_factory
 from app.auth import verify_access_token
-from app.crud import get_user_by_email
-from app.models import User
+from app.async_crud import find_reservations_version, get_current_user_fields
+from app.replica import mark_write, wrote_recently
+from app.user_cache import CurrentUser, user_cache
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(
+async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """
+    Resolves the bearer token to the current user.
+
+    The id, role and is_active fields are cached per user_id (see
+    app.user_cache), so most requests skip the users lookup entirely.
+    Mutating requests also pin the user's reads to the primary for a
+    short while (see app.replica).
+    """
+
     payload = verify_access_token(token)
-    user = get_user_by_email(db, email=payload["email"])
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+
+    user = user_cache.get(payload["user_id"])
+    if user is None:
+        user = await get_current_user_fields(db, payload["user_id"])
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        user_cache.set(user.id, user)
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive User"
         )
+
+    if request.method not in READ_ONLY_METHODS:
+        mark_write(user.id)
     return user
+
+
+async def get_current_admin(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+
+async def get_read_db(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    replica_session_factory=Depends(get_replica_session_factory)
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only routes serving the current user's own data.
+
+    Business rules:
+    - Without DATABASE_REPLICA_URL this is the primary session.
+    - Users who wrote within REPLICA_STICKY_SECONDS read from the primary.
+    - Otherwise the replica is used only if it has caught up with the user's
+      reservations_version on the primary; a lagging replica (or one missing
+      the user row) falls back to the primary.
+    """
+
+    if replica_session_factory is None or wrote_recently(current_user.id):
+        yield db
+        return
+
+    async with replica_session_factory() as replica:
+        replica_version = await find_reservations_version(replica, current_user.id)
+        primary_version = await find_reservations_version(db, current_user.id)
+
+        if replica_version is None or replica_version < (primary_version or 0):
+            yield db
+            return
+
+        # Ends the primary's read transaction so its connection goes back to the pool.
+        await db.rollback()
+        yield replica
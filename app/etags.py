@@ -0,0 +1,37 @@
+"""
+Conditional GET support for reservation reads.
+
+ETags are derived from users.reservations_version, a per-user counter bumped
+by every crud write to that user's reservations. Checking If-None-Match
+therefore costs one primary key lookup, and a 304 skips both the row fetch
+and the serialization.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+
+
+def reservations_etag(user_id: int, version: int, variant: str = "") -> str:
+    """
+    Builds a weak ETag; variant distinguishes representations of the same
+    version (query parameters, a single reservation id).
+    """
+    suffix = hashlib.sha1(variant.encode()).hexdigest()[:12] if variant else "all"
+    return f'W/"{user_id}-{version}-{suffix}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    True when the request's If-None-Match header matches etag (weak comparison).
+    """
+
+    header: Optional[str] = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
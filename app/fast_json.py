@@ -0,0 +1,36 @@
+"""
+Opt-in fast serialization for reservation lists (FAST_JSON_RESPONSES=true).
+
+Instead of loading ORM objects, validating each into ReservationResponse and
+encoding with the stdlib json module, the listing selects only the response
+columns as tuples and encodes them with orjson. Routes keep their
+response_model, so the OpenAPI schema is unchanged; the output matches what
+the Pydantic path produces (UTC datetimes end in "Z").
+"""
+
+import os
+from typing import Any, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.models import Reservation
+from app.schemas import ReservationResponse
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+RESERVATION_RESPONSE_FIELDS = tuple(ReservationResponse.model_fields)
+RESERVATION_RESPONSE_COLUMNS = tuple(getattr(Reservation, field) for field in RESERVATION_RESPONSE_FIELDS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def reservation_rows_response(rows: Sequence[tuple], **kwargs) -> FastJSONResponse:
+    """
+    Encodes rows selected with RESERVATION_RESPONSE_COLUMNS as a ReservationResponse list.
+    """
+    fields = RESERVATION_RESPONSE_FIELDS
+    return FastJSONResponse([dict(zip(fields, row)) for row in rows], **kwargs)
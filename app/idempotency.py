@@ -0,0 +1,269 @@
+"""
+Idempotency-Key support for mutating endpoints.
+
+A client that retries a POST/PUT/PATCH/DELETE with the same Idempotency-Key
+gets the stored response of the first attempt, without the endpoint running
+again. Keys are scoped per user and kept for IDEMPOTENCY_TTL_SECONDS; expired
+rows are removed by `python -m app.maintenance purge-idempotency-keys`. A key
+left in progress by a worker that died mid-request is freed after
+IDEMPOTENCY_LOCK_SECONDS.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy import and_, delete, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth import verify_access_token
+from app.database import get_async_session_factory
+from app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+# Longer than any request may run (see GUNICORN_TIMEOUT), so a live attempt is never taken over.
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120"))
+IDEMPOTENCY_CLAIM_ATTEMPTS = 3
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENT_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query.encode(), body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _request_user_id(request: Request) -> Optional[int]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_access_token(token)["user_id"]
+    except HTTPException:
+        return None
+
+
+def _session_factory(request: Request):
+    # Resolved like a dependency so test overrides of the session factory apply.
+    overrides = request.app.dependency_overrides
+    return overrides.get(get_async_session_factory, get_async_session_factory)()
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still in progress.",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _is_duplicate_key(error: IntegrityError) -> bool:
+    message = str(error.orig)
+    return "duplicate key value" in message or "UNIQUE constraint failed" in message
+
+
+async def _claim_key(db, user_id: int, key: str, request_hash: str, claimed_at: datetime) -> Optional[IdempotencyKey]:
+    """
+    Records the key as in progress since claimed_at, or returns the existing
+    row for it.
+
+    An expired row, or the same request left in progress for longer than
+    IDEMPOTENCY_LOCK_SECONDS, is taken over as if the key were new. The
+    takeover is a conditional UPDATE, so only one of several retries wins it.
+    Integrity errors other than the duplicate key (e.g. the user was deleted)
+    are re-raised.
+    """
+
+    expires_at = claimed_at + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    values = {
+        "request_hash": request_hash,
+        "status_code": None,
+        "response_body": None,
+        "media_type": None,
+        "expires_at": expires_at,
+        "locked_at": claimed_at
+    }
+
+    for _ in range(IDEMPOTENCY_CLAIM_ATTEMPTS):
+        db.add(IdempotencyKey(user_id=user_id, key=key, **values))
+        try:
+            await db.commit()
+            return None
+        except IntegrityError as error:
+            await db.rollback()
+            if not _is_duplicate_key(error):
+                raise
+
+        taken = await db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                or_(
+                    IdempotencyKey.expires_at < claimed_at,
+                    and_(
+                        IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.request_hash == request_hash,
+                        IdempotencyKey.locked_at < claimed_at - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+                    )
+                )
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if taken.rowcount:
+            return None
+
+        existing = await db.get(IdempotencyKey, (user_id, key), populate_existing=True)
+        if existing is not None:
+            return existing
+        # Purged in the meantime: try the INSERT again.
+
+    raise _in_progress()
+
+
+def _own_claim(user_id: int, key: str, claimed_at: datetime):
+    # Matches the row only while this attempt still holds it.
+    return (
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.locked_at == claimed_at
+    )
+
+
+async def _release_key(db, user_id: int, key: str, claimed_at: datetime):
+    await db.execute(delete(IdempotencyKey).where(*_own_claim(user_id, key, claimed_at)))
+    await db.commit()
+
+
+async def _store_response(db, user_id: int, key: str, claimed_at: datetime, response: Response):
+    await db.execute(
+        update(IdempotencyKey)
+        .where(*_own_claim(user_id, key, claimed_at))
+        .values(
+            status_code=response.status_code,
+            response_body=bytes(response.body),
+            media_type=response.media_type
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+def _replay(stored: IdempotencyKey, request_hash: str) -> Response:
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="This Idempotency-Key was already used with a different request."
+        )
+    if stored.status_code is None:
+        raise _in_progress()
+
+    return Response(
+        content=stored.response_body,
+        status_code=stored.status_code,
+        media_type=stored.media_type,
+        headers={IDEMPOTENCY_REPLAYED_HEADER: "true"}
+    )
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Route class honouring the Idempotency-Key header on mutating methods.
+
+    Business rules:
+    - Only authenticated requests are deduplicated; keys are scoped per user.
+    - Reusing a key with a different method, path or body returns 422.
+    - A retry arriving while the first request still runs returns 409.
+    - Returned responses below 500 are stored and replayed. If the endpoint
+      raises, including the HTTPExceptions behind 4xx errors, or returns a
+      5xx, the key is released so the client can retry.
+    - A key still in progress after IDEMPOTENCY_LOCK_SECONDS (its worker died)
+      is taken over by the next retry of the same request.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def idempotent_handler(request: Request) -> Response:
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None or request.method not in IDEMPOTENT_METHODS:
+                return await handler(request)
+
+            if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters."
+                )
+
+            user_id = _request_user_id(request)
+            if user_id is None:
+                return await handler(request)
+
+            request_hash = request_fingerprint(
+                request.method,
+                request.url.path,
+                request.url.query,
+                await request.body()
+            )
+
+            claimed_at = datetime.now(timezone.utc)
+
+            async with _session_factory(request)() as db:
+                stored = await _claim_key(db, user_id, key, request_hash, claimed_at)
+                if stored is not None:
+                    return _replay(stored, request_hash)
+
+                try:
+                    response = await handler(request)
+                except BaseException:
+                    await _release_key(db, user_id, key, claimed_at)
+                    raise
+
+                if response.status_code >= 500 or getattr(response, "body", None) is None:
+                    await _release_key(db, user_id, key, claimed_at)
+                    return response
+
+                await _store_response(db, user_id, key, claimed_at, response)
+
+            return response
+
+        return idempotent_handler
+
+
+def purge_expired_keys(db: Session, batch_size: int = 1000, now: Optional[datetime] = None) -> int:
+    """
+    Deletes expired idempotency keys in batches of batch_size, committing
+    after each batch so no single transaction holds many row locks.
+
+    Returns the number of deleted keys.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    deleted = 0
+
+    while True:
+        expired = select(IdempotencyKey.user_id, IdempotencyKey.key).where(
+            IdempotencyKey.expires_at < now
+        ).limit(batch_size)
+
+        result = db.execute(
+            delete(IdempotencyKey).where(
+                tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+            ).execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
@@ -1,24 +1,62 @@
-from fastapi import Depends, FastAPI, status, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Query, Request, Response, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import text
 
-from app.database import get_db
-from app.schemas import UserCreate, UserResponse, UserLogin, ReservationResponse, ReservationCreate, ReservationUpdate
-from app.models import User, Reservation
-from app.crud import create_user, authenticate_user, get_user_by_email, get_user_reservations, create_reservation, get_reservation_by_id, update_reservation, delete_reservation
+from app.availability import offset_timezone
+from app.database import dispose_engines, get_async_db, get_async_session_factory, pool_diagnostics
+from app.export import EXPORT_MEDIA_TYPES, export_statement, stream_export
+from app.schemas import UserCreate, UserResponse, UserLogin, ReservationResponse, ReservationCreate, ReservationUpdate, ReservationBatchCreate, ReservationBatchResponse, ReservationBatchResult, ReservationSeriesCreate, ReservationSeriesResponse, SpaceEnum, SpaceAvailabilityResponse, TimeWindow, ExportFormatEnum, UtilizationResponse
+from app.models import Reservation
+from app.async_crud import create_user, authenticate_user, get_user_by_email, get_user_reservations, create_reservation, get_reservation_by_id, update_reservation, delete_reservation, create_reservations_batch, create_reservation_series, cancel_reservation_series, get_space_free_windows, get_user_with_reservations, get_space_utilization, get_reservations_version, get_user_reservation_rows
 from app.auth import create_access_token
-from datetime import datetime
-from app.dependencies import get_current_user 
+from datetime import datetime, date
+from app.dependencies import get_current_user, get_current_admin, get_read_db
+from app.user_cache import CurrentUser
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.fast_json import FAST_JSON_RESPONSES, RESERVATION_RESPONSE_COLUMNS, reservation_rows_response
+from app.etags import if_none_match, reservations_etag
+from app.idempotency import IDEMPOTENCY_REPLAYED_HEADER, IdempotentRoute
+from app.startup import WARM_UP_BEFORE_SERVING, warm_up
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import List
+from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolved like a dependency so test overrides of the session factory apply.
+    overrides = app.dependency_overrides
+    session_factory = overrides.get(get_async_session_factory, get_async_session_factory)()
+
+    if WARM_UP_BEFORE_SERVING:
+        await warm_up(session_factory)
+        warm_up_task = None
+    else:
+        # The server starts accepting requests while the warm-up runs.
+        warm_up_task = asyncio.create_task(warm_up(session_factory))
+
+    yield
+
+    if warm_up_task is not None:
+        await warm_up_task
+    await dispose_engines()
 
 
 app = FastAPI(
     title="Coworking Reservations",
     version="1.0.0",
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
+app.router.route_class = IdempotentRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,36 +66,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, IDEMPOTENCY_REPLAYED_HEADER, "ETag"],
 )
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Coworking Reservations API is running"}
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
 @app.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
 
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The email is already registered"
         )
     
-    return create_user(db=db, user=user)
+    return await create_user(db=db, user=user)
 
 @app.post("/login")
-def login_user(
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),  
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     user_login = UserLogin(email=form_data.username, password=form_data.password)
     
-    user = authenticate_user(db, user_login)
+    user = await authenticate_user(db, user_login)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,60 +118,293 @@ def login_user(
     
     
 @app.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_current_user_info(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await get_user_with_reservations(db, current_user.id)
 
 
 @app.get("/reservations", response_model=List[ReservationResponse])
-def get_my_reservations(
+async def get_my_reservations(
+    request: Request,
+    response: Response,
     include_cancelled: bool = False,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    start_from: Optional[datetime] = Query(None, alias="from"),
+    start_to: Optional[datetime] = Query(None, alias="to"),
+    space_name: Optional[SpaceEnum] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return get_user_reservations(db, current_user.id, include_cancelled)
+    """
+    Lists the current user's reservations ordered by start_datetime.
+
+    Without `limit` or `cursor` every matching reservation is returned.
+    Otherwise results are paginated with a keyset cursor, DEFAULT_PAGE_SIZE
+    rows per page unless `limit` says otherwise: when more rows exist the
+    X-Next-Cursor response header holds the value to pass as `cursor` for
+    the next page. `from`/`to` bound start_datetime to [from, to).
+    Supports If-None-Match: an unchanged listing returns 304.
+    """
+
+    etag = reservations_etag(
+        current_user.id,
+        await get_reservations_version(db, current_user.id),
+        request.url.query
+    )
+    if if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if limit is None and cursor is not None:
+        limit = DEFAULT_PAGE_SIZE
+
+    filters = dict(
+        start_from=start_from,
+        start_to=start_to,
+        space_name=space_name.value if space_name else None,
+        after=decode_cursor(cursor),
+        limit=limit + 1 if limit is not None else None
+    )
+
+    if FAST_JSON_RESPONSES:
+        reservations = await get_user_reservation_rows(
+            db, current_user.id, RESERVATION_RESPONSE_COLUMNS, include_cancelled, **filters
+        )
+    else:
+        reservations = await get_user_reservations(db, current_user.id, include_cancelled, **filters)
+
+    if limit is not None and len(reservations) > limit:
+        reservations = reservations[:limit]
+        last = reservations[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.start_datetime, last.id)
+
+    if FAST_JSON_RESPONSES:
+        # A returned Response does not pick up headers set on `response`.
+        headers = {
+            name: response.headers[name]
+            for name in ("ETag", NEXT_CURSOR_HEADER)
+            if name in response.headers
+        }
+        return reservation_rows_response(reservations, headers=headers)
+
+    return reservations
+
+def _export_response(session_factory, statement, export_format: ExportFormatEnum) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(session_factory, statement, export_format.value),
+        media_type=EXPORT_MEDIA_TYPES[export_format.value],
+        headers={
+            "Content-Disposition": f'attachment; filename="reservations.{export_format.value}"'
+        }
+    )
+
+@app.get("/reservations/export")
+async def export_my_reservations(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.ndjson, alias="format"),
+    start_from: Optional[datetime] = Query(None, alias="from"),
+    start_to: Optional[datetime] = Query(None, alias="to"),
+    current_user: CurrentUser = Depends(get_current_user),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    Streams all of the current user's reservations, cancelled ones included, as NDJSON or CSV.
+    """
+
+    statement = export_statement(current_user.id, start_from, start_to)
+    return _export_response(session_factory, statement, export_format)
+
+@app.get("/admin/reservations/export")
+async def export_all_reservations(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.ndjson, alias="format"),
+    start_from: Optional[datetime] = Query(None, alias="from"),
+    start_to: Optional[datetime] = Query(None, alias="to"),
+    current_user: CurrentUser = Depends(get_current_admin),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    Streams every user's reservations as NDJSON or CSV. Admins only.
+    """
+
+    statement = export_statement(None, start_from, start_to)
+    return _export_response(session_factory, statement, export_format)
 
 @app.post("/reservations", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
-def create_my_reservation(
+async def create_my_reservation(
     reservation: ReservationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await create_reservation(db, reservation, current_user.id)
+
+@app.post("/reservations/batch", response_model=ReservationBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_my_reservations_batch(
+    batch: ReservationBatchCreate,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Creates up to 100 reservations in one request.
+
+    With atomic=true (default) nothing is created unless every item is valid,
+    and the failing items are returned in the error detail. With atomic=false
+    valid items are created and the response is 207 when some items failed.
+    Only admins may set user_id to book on behalf of other users.
+    """
+
+    if current_user.role != "admin" and any(
+        item.user_id not in (None, current_user.id) for item in batch.reservations
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can create reservations for other users"
+        )
+
+    outcomes = await create_reservations_batch(db, batch.reservations, current_user.id, batch.atomic)
+
+    failures = [
+        {"index": index, "status_code": outcome.status_code, "detail": outcome.detail}
+        for index, outcome in enumerate(outcomes)
+        if isinstance(outcome, HTTPException)
+    ]
+
+    if batch.atomic and failures:
+        raise HTTPException(status_code=failures[0]["status_code"], detail=failures)
+
+    if failures:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+
+    return ReservationBatchResponse(results=[
+        ReservationBatchResult(
+            index=index,
+            status_code=outcome.status_code,
+            detail=outcome.detail
+        )
+        if isinstance(outcome, HTTPException)
+        else ReservationBatchResult(
+            index=index,
+            status_code=status.HTTP_201_CREATED,
+            reservation=outcome
+        )
+        for index, outcome in enumerate(outcomes)
+    ])
+
+@app.post("/reservations/series", response_model=ReservationSeriesResponse, status_code=status.HTTP_201_CREATED)
+async def create_my_reservation_series(
+    series: ReservationSeriesCreate,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return create_reservation(db, reservation, current_user.id)
+    db_series, reservations = await create_reservation_series(db, series, current_user.id)
+
+    response = ReservationSeriesResponse.model_validate(db_series)
+    response.reservations = [ReservationResponse.model_validate(reservation) for reservation in reservations]
+    return response
+
+@app.delete("/reservations/series/{series_id}", response_model=ReservationSeriesResponse)
+async def cancel_my_reservation_series(
+    series_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await cancel_reservation_series(db, series_id, current_user.id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Reservation series not found")
+
+    db_series, cancelled = result
+
+    response = ReservationSeriesResponse.model_validate(db_series)
+    response.reservations = [ReservationResponse.model_validate(reservation) for reservation in cancelled]
+    return response
 
 @app.get("/reservations/{reservation_id}", response_model=ReservationResponse)
-def get_my_reservation(
+async def get_my_reservation(
     reservation_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
+    etag = reservations_etag(
+        current_user.id,
+        await get_reservations_version(db, current_user.id),
+        f"reservation:{reservation_id}"
+    )
+    if if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
-    reservation = get_reservation_by_id(db, reservation_id, current_user.id)
+    reservation = await get_reservation_by_id(db, reservation_id, current_user.id)
     if not reservation:
         raise HTTPException(status_code=404, detail="Reservation not found")
     return reservation
 
 
 @app.put("/reservations/{reservation_id}", response_model=ReservationResponse)
-def update_my_reservation(
+async def update_my_reservation(
     reservation_id: int,
     reservation_update: ReservationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
 
-    reservation = update_reservation(db, reservation_id, reservation_update, current_user.id)
+    reservation = await update_reservation(db, reservation_id, reservation_update, current_user.id)
     if not reservation:
         raise HTTPException(status_code=404, detail="Reservation not found")
     return reservation
 
 @app.delete("/reservations/{reservation_id}", response_model=ReservationResponse)
-def cancel_my_reservation(
+async def cancel_my_reservation(
     reservation_id: int,
-    current_user: User = Depends(get_current_user),  
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),  
+    db: AsyncSession = Depends(get_async_db)
 ):
 
-    reservation = delete_reservation(db, reservation_id, current_user.id)
+    reservation = await delete_reservation(db, reservation_id, current_user.id)
     if not reservation:
         raise HTTPException(status_code=404, detail="Reservation not found")
-    return reservation
\ No newline at end of file
+    return reservation
+
+@app.get("/admin/diagnostics/pool")
+async def get_pool_diagnostics(current_user: CurrentUser = Depends(get_current_admin)):
+    """
+    Connection pool settings, checkout counts and checkout wait times. Admins only.
+    """
+    return pool_diagnostics()
+
+@app.get("/admin/utilization", response_model=UtilizationResponse)
+async def get_utilization(
+    start_day: date = Query(..., alias="from"),
+    end_day: date = Query(..., alias="to"),
+    granularity: str = "30m",
+    current_user: CurrentUser = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Business-hours utilization per space and time slot for the UTC days [from, to]. Admins only.
+    """
+    from app.utilization import parse_granularity
+
+    return await get_space_utilization(db, start_day, end_day, parse_granularity(granularity))
+
+@app.get("/spaces/{space_name}/availability", response_model=SpaceAvailabilityResponse)
+async def get_space_availability(
+    space_name: SpaceEnum,
+    day: date = Query(..., alias="date"),
+    utc_offset: str = Query("+00:00", pattern=r"^[+-](0\d|1[0-4]):[0-5]\d$"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    free_windows = await get_space_free_windows(db, space_name.value, day, offset_timezone(utc_offset))
+
+    return SpaceAvailabilityResponse(
+        space_name=space_name,
+        date=day,
+        free_windows=[
+            TimeWindow(start_datetime=start, end_datetime=end)
+            for start, end in free_windows
+        ]
+    )
@@ -0,0 +1,83 @@
+"""
+Maintenance commands, meant to run from cron or a one-off container.
+
+Usage:
+    python -m app.maintenance purge-idempotency-keys [--batch-size 1000]
+    python -m app.maintenance archive-reservations [--retention-days 365] [--batch-size 1000] [--drop-empty-partitions]
+    python -m app.maintenance create-partitions [--months-ahead 12]
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app.archive import ARCHIVE_RETENTION_DAYS, archive_reservations, purge_day_rows
+from app.database import SessionLocal
+from app.idempotency import purge_expired_keys
+from app.partitions import PARTITION_MONTHS_AHEAD, create_partitions, drop_empty_partitions
+
+
+def purge_idempotency_keys(args):
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_keys(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Deleted {deleted} expired idempotency keys.")
+
+
+def archive_old_reservations(args):
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=args.retention_days)
+
+        archived = archive_reservations(db, retention_days=args.retention_days, batch_size=args.batch_size, now=now)
+        print(f"Archived {archived} reservations.")
+
+        purged = purge_day_rows(db, before=cutoff.date(), batch_size=args.batch_size)
+        print(f"Deleted {purged} slot bitmap and daily usage rows before {cutoff.date()}.")
+
+        if args.drop_empty_partitions:
+            for name in drop_empty_partitions(db, before=cutoff.date()):
+                print(f"Dropped empty partition {name}.")
+    finally:
+        db.close()
+
+
+def create_reservation_partitions(args):
+    db = SessionLocal()
+    try:
+        created = create_partitions(db, months_ahead=args.months_ahead)
+    finally:
+        db.close()
+    print(f"Created {len(created)} partitions{': ' + ', '.join(created) if created else '.'}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance", description="Maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    purge = commands.add_parser("purge-idempotency-keys", help="delete expired Idempotency-Key records")
+    purge.add_argument("--batch-size", type=int, default=1000)
+    purge.set_defaults(handler=purge_idempotency_keys)
+
+    archive = commands.add_parser("archive-reservations", help="move old and cancelled reservations to reservations_archive")
+    archive.add_argument("--retention-days", type=int, default=ARCHIVE_RETENTION_DAYS)
+    archive.add_argument("--batch-size", type=int, default=1000)
+    archive.add_argument("--drop-empty-partitions", action="store_true", help="then drop emptied monthly partitions (Postgres)")
+    archive.set_defaults(handler=archive_old_reservations)
+
+    partitions = commands.add_parser("create-partitions", help="create the upcoming monthly reservations partitions (Postgres)")
+    partitions.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    partitions.set_defaults(handler=create_reservation_partitions)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Kept dependency-free and cheap enough to leave on in production: a
+histogram observation is a bisect plus a few additions under a lock, and
+label sets are bounded (route templates, function names, status codes).
+Each worker process exposes its own counters; Prometheus aggregates them.
+"""
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FUNCTION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+
+        for labels, counts, total, count in sorted(series):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+
+        return lines
+
+
+def _metric_name(name: str, metric_type: str) -> str:
+    if metric_type == "counter" and not name.endswith("_total"):
+        return f"{name}_total"
+    return name
+
+
+def _sample_lines(name: str, metric_type: str, documentation: str, label_names: Sequence[str], samples) -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(label_names, labels)} {_format_number(value)}")
+    return lines
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per HTTP request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS
+)
+function_duration = Histogram(
+    "app_function_duration_seconds",
+    "Latency of validators, CRUD functions and password hashing.",
+    ("kind", "function"),
+    FUNCTION_BUCKETS
+)
+
+HISTOGRAMS = (http_request_duration, http_request_db_queries, function_duration)
+
+
+def timed(kind: str):
+    """
+    Decorator recording the wrapped function's latency in app_function_duration_seconds.
+
+    Exceptions (e.g. a validator's HTTPException) are timed too.
+    """
+
+    def decorator(function):
+        labels = (kind, function.__name__)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                function_duration.observe(labels, perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+# A one-element list per request; greenlets spawned by the async engine and
+# threadpool calls run in a copy of the request context and share the list.
+_query_count: ContextVar[Optional[list]] = ContextVar("query_count", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request.
+
+    Requests are labelled with the matched route template (e.g.
+    /reservations/{reservation_id}), never the raw path, to keep cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        counter = [0]
+        token = _query_count.set(counter)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_count.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+
+            http_request_duration.observe((method, route_path, str(status_code)), perf_counter() - started)
+            http_request_db_queries.observe((method, route_path), counter[0])
+
+
+def _runtime_gauges() -> List[str]:
+    # Imported here so that timing validators and crud does not pull in auth settings.
+    from app.auth import token_cache
+    from app.database import pool_diagnostics
+    from app.user_cache import user_cache
+
+    pools = pool_diagnostics()
+    # Monotonic fields are counters, exported with the _total suffix so rate() applies.
+    pool_fields = (
+        ("checkouts", "counter"), ("checkins", "counter"), ("timeouts", "counter"), ("wait_seconds_total", "counter"),
+        ("wait_seconds_max", "gauge"), ("size", "gauge"), ("checkedout", "gauge"), ("overflow", "gauge")
+    )
+
+    lines = []
+    for field, metric_type in pool_fields:
+        samples = [((engine,), pools[engine][field]) for engine in ("sync", "async", "replica") if field in pools.get(engine, {})]
+        if samples:
+            lines += _sample_lines(
+                _metric_name(f"db_pool_{field}", metric_type), metric_type,
+                f"Connection pool {field.replace('_', ' ')}.", ("engine",), samples
+            )
+
+    caches = {"user": user_cache.stats(), "token": token_cache.stats()}
+    for field, metric_type in (("size", "gauge"), ("hits", "counter"), ("misses", "counter"), ("hit_rate", "gauge")):
+        samples = [((cache,), stats[field]) for cache, stats in caches.items()]
+        lines += _sample_lines(
+            _metric_name(f"cache_{field}", metric_type), metric_type,
+            f"In-process cache {field.replace('_', ' ')}.", ("cache",), samples
+        )
+
+    return lines
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    lines += _runtime_gauges()
+    return "\n".join(lines) + "\n"
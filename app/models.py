@@ -1,7 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey, LargeBinary, Index, Enum, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.schemas import SpaceEnum, StatusEnum
+
+# Native enums on Postgres (4 bytes per value), VARCHAR elsewhere. Built from
+# the values so the columns keep returning plain strings.
+ReservationStatus = Enum(*[member.value for member in StatusEnum], name="reservation_status")
+SpaceName = Enum(*[member.value for member in SpaceEnum], name="space_name")
+ACTIVE_ONLY = text("status = 'active'")
 
 class User(Base):
     __tablename__ = "users"
@@ -14,18 +21,108 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    reservations_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every reservation write, see app.etags
     reservations = relationship("Reservation", back_populates="owner")
     
+def booked_day(context):
+    """
+    Default of Reservation.usage_day: the calendar day of the start in the
+    offset it was booked with (see app.validators.usage_day).
+    """
+    return context.get_current_parameters()["start_datetime"].date()
+
 class Reservation(Base):
     __tablename__ = "reservations"
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    space_name = Column(String, nullable=False)  
+    space_name = Column(SpaceName, nullable=False)
     start_datetime = Column(DateTime(timezone=True), nullable=False)
     end_datetime = Column(DateTime(timezone=True), nullable=False)
-    status = Column(String, default="active")  # active, cancelled
+    usage_day = Column(Date, nullable=False, default=booked_day)  # user_daily_usage day the minutes count toward
+    status = Column(ReservationStatus, default="active")
+    series_id = Column(Integer, ForeignKey("reservation_series.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    owner = relationship("User", back_populates="reservations")
\ No newline at end of file
+    owner = relationship("User", back_populates="reservations")
+
+    __table_args__ = (
+        # Serves exports and listings that include cancelled reservations: keyset order on (start, id).
+        Index("ix_reservations_user_start", "user_id", "start_datetime", "id"),
+        # Partial indexes for availability and active listings;
+        # queries must spell the predicate as a literal (see validators.active).
+        Index(
+            "ix_reservations_active_space_start", "space_name", "start_datetime", "end_datetime",
+            postgresql_where=ACTIVE_ONLY, sqlite_where=ACTIVE_ONLY
+        ),
+        Index(
+            "ix_reservations_active_user_start", "user_id", "start_datetime", "id",
+            postgresql_where=ACTIVE_ONLY, sqlite_where=ACTIVE_ONLY
+        ),
+    )
+
+
+class ReservationArchive(Base):
+    __tablename__ = "reservations_archive"
+
+    # Rows moved out of reservations by app.archive, ids preserved.
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    space_name = Column(SpaceName, nullable=False)
+    start_datetime = Column(DateTime(timezone=True), nullable=False)
+    end_datetime = Column(DateTime(timezone=True), nullable=False)
+    status = Column(ReservationStatus)
+    series_id = Column(Integer, nullable=True)  # no foreign key: series may be removed later
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_reservations_archive_user_start", "user_id", "start_datetime"),
+    )
+
+
+class ReservationSeries(Base):
+    __tablename__ = "reservation_series"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    space_name = Column(String, nullable=False)
+    start_datetime = Column(DateTime(timezone=True), nullable=False)  # first occurrence
+    end_datetime = Column(DateTime(timezone=True), nullable=False)
+    frequency = Column(String, nullable=False)  # daily, weekly
+    interval = Column(Integer, nullable=False, default=1)
+    by_weekday = Column(String, nullable=True)  # comma separated, 0=Monday
+    until = Column(Date, nullable=True)
+    count = Column(Integer, nullable=True)
+    status = Column(String, default="active")  # active, cancelled
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class UserDailyUsage(Base):
+    __tablename__ = "user_daily_usage"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # reservations.usage_day
+    minutes = Column(Integer, nullable=False, default=0)  # active reserved minutes
+
+class SlotBitmap(Base):
+    __tablename__ = "slot_bitmaps"
+
+    scope = Column(String, primary_key=True)  # space, user
+    owner = Column(String, primary_key=True)  # space name or user id
+    day = Column(Date, primary_key=True)  # UTC calendar day
+    bits = Column(LargeBinary, nullable=False)  # one bit per reserved minute, see app.slots
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)  # client supplied Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)  # sha256 of method, path and body
+    status_code = Column(Integer, nullable=True)  # null while the first request is in progress
+    response_body = Column(LargeBinary, nullable=True)
+    media_type = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)  # when the current attempt claimed the key, see app.idempotency
@@ -0,0 +1,50 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# (start_datetime, id) of the last row of the previous page.
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(start_datetime: datetime, reservation_id: int) -> str:
+    """
+    Encodes the keyset position after a reservation as an opaque URL-safe string.
+    """
+    raw = f"{start_datetime.isoformat()}|{reservation_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Raises 400 if the cursor was not produced by this API.
+    """
+
+    if cursor is None:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, reservation_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(start), int(reservation_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """
+    Converts filter bounds to UTC; naive datetimes are treated as UTC.
+    """
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc)
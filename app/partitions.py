@@ -0,0 +1,128 @@
+"""
+Monthly partitions of the reservations table.
+
+On Postgres reservations is range-partitioned by start_datetime, one
+partition per UTC month (see migration 328f1abb0cbd). Partitions must exist
+before reservations are made for their month, otherwise rows land in
+reservations_default; run `python -m app.maintenance create-partitions`
+monthly. Elsewhere (SQLite in tests) the functions here do nothing.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARTITION_MONTHS_AHEAD = 12
+_PARTITION_NAME = re.compile(r"^reservations_y(\d{4})m(\d{2})$")
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"reservations_y{month.year}m{month.month:02d}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _create_partition(db: Session, month: date):
+    """
+    Creates the partition for a month and moves into it any rows of that
+    month already stored in reservations_default.
+
+    The table is created standalone, filled, then attached: attaching a range
+    that reservations_default still holds rows for would fail.
+    """
+
+    name = partition_name(month)
+    suffix = name[len("reservations"):]
+    lower = f"'{month.isoformat()} 00:00:00+00'"
+    upper = f"'{next_month(month).isoformat()} 00:00:00+00'"
+
+    db.execute(text(f"CREATE TABLE {name} (LIKE reservations INCLUDING DEFAULTS)"))
+    # Exclusion constraints are per partition; the names keep the
+    # reservations_no_*_overlap prefix that raise_for_overlap_violation matches.
+    for column, scope in (("space_name", "space"), ("user_id", "user")):
+        db.execute(text(
+            f"ALTER TABLE {name} ADD CONSTRAINT reservations_no_{scope}_overlap{suffix} "
+            f"EXCLUDE USING gist ({column} WITH =, tstzrange(start_datetime, end_datetime) WITH &&) "
+            f"WHERE (status = 'active')"
+        ))
+    db.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM reservations_default WHERE start_datetime >= {lower} AND start_datetime < {upper} RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ))
+    db.execute(text(f"ALTER TABLE reservations ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"))
+
+
+def existing_partitions(db: Session) -> Dict[date, str]:
+    """
+    Maps the first day of each month to its partition name.
+    """
+
+    names = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'reservations'"
+    )).scalars()
+
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """
+    Creates the missing partitions from the current month to months_ahead
+    months later, each in its own transaction. Returns the names of the
+    created partitions.
+    """
+
+    if not _is_postgres(db):
+        return []
+
+    existing = existing_partitions(db)
+    month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    created = []
+
+    for _ in range(months_ahead + 1):
+        if month not in existing:
+            _create_partition(db, month)
+            db.commit()
+            created.append(partition_name(month))
+        month = next_month(month)
+
+    return created
+
+
+def drop_empty_partitions(db: Session, before: date) -> List[str]:
+    """
+    Drops partitions whose whole month lies before `before` and that hold no
+    rows any more, typically after archive_reservations. Returns their names.
+    """
+
+    if not _is_postgres(db):
+        return []
+
+    dropped = []
+    for month, name in sorted(existing_partitions(db).items()):
+        if next_month(month) > before:
+            continue
+        if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            continue
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        dropped.append(name)
+
+    return dropped
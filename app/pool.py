@@ -0,0 +1,95 @@
+import threading
+from time import perf_counter
+from typing import Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    Checkout counters and latency for one engine's connection pool.
+
+    Wait time covers the whole Pool.connect() call: queueing for a free
+    connection, opening an overflow connection and the pre-ping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            stats = {
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            }
+
+        # Sizing is only available on queue pools (not on SQLite's default pools).
+        for name in ("size", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+
+        return stats
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Returns a subclass of `base` whose connect() feeds checkout latency and
+    timeouts into `metrics`. Pool.recreate() (engine.dispose()) builds the
+    replacement from the same class, so the metrics carry over.
+    """
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return base.connect(self)
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        finally:
+            metrics.record_wait(perf_counter() - started)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics):
+    """
+    Counts checkouts and checkins through pool events registered on the
+    engine, which also apply to pools recreated by engine.dispose().
+    """
+
+    event.listen(engine, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(engine, "checkin", lambda *args: metrics.record_checkin())
@@ -0,0 +1,68 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+MAX_OCCURRENCES = 366
+
+Occurrence = Tuple[datetime, datetime]
+
+
+def expand_occurrences(
+    start_datetime: datetime,
+    end_datetime: datetime,
+    frequency: str,
+    interval: int = 1,
+    by_weekday: Optional[Sequence[int]] = None,
+    until: Optional[date] = None,
+    count: Optional[int] = None
+) -> List[Occurrence]:
+    """
+    Expands an RRULE-style daily/weekly rule into concrete (start, end) occurrences.
+
+    Rules:
+    - The first occurrence is start_datetime/end_datetime.
+    - daily repeats every `interval` days.
+    - weekly repeats every `interval` weeks on `by_weekday` (0=Monday),
+      defaulting to the weekday of the first occurrence.
+    - Expansion stops after `count` occurrences or after the `until` date,
+      whichever comes first.
+    - A rule may not produce more than MAX_OCCURRENCES occurrences.
+    """
+
+    duration = end_datetime - start_datetime
+    limit = count if count is not None else MAX_OCCURRENCES + 1
+
+    if frequency == "daily":
+        candidates = (
+            start_datetime + timedelta(days=step * interval)
+            for step in range(limit)
+        )
+    else:
+        weekdays = sorted(set(by_weekday or [start_datetime.weekday()]))
+        week_start = start_datetime - timedelta(days=start_datetime.weekday())
+        candidates = (
+            week_start + timedelta(weeks=week * interval, days=weekday)
+            for week in range(limit)
+            for weekday in weekdays
+        )
+
+    occurrences = []
+
+    for occurrence_start in candidates:
+        if occurrence_start < start_datetime:
+            continue
+        if until is not None and occurrence_start.date() > until:
+            break
+        if len(occurrences) == limit:
+            break
+
+        occurrences.append((occurrence_start, occurrence_start + duration))
+
+    if len(occurrences) > MAX_OCCURRENCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A reservation series cannot have more than {MAX_OCCURRENCES} occurrences."
+        )
+
+    return occurrences
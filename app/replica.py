@@ -0,0 +1,25 @@
+"""
+Read-your-writes bookkeeping for replica routing.
+
+After a user's own mutation their reads go to the primary for
+REPLICA_STICKY_SECONDS. The window is per process; across workers
+app.dependencies.get_read_db also compares the user's reservations_version
+on the replica with the primary before trusting the replica.
+"""
+
+import os
+
+from app.cache import TTLCache
+
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_STICKY_USERS = int(os.getenv("REPLICA_STICKY_USERS", "10000"))
+
+recent_writers = TTLCache(maxsize=REPLICA_STICKY_USERS, ttl_seconds=REPLICA_STICKY_SECONDS)
+
+
+def mark_write(user_id: int):
+    recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id: int) -> bool:
+    return recent_writers.get(user_id) is not None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator, model_validator
+from datetime import date, datetime
 from typing import Optional, List
 from enum import Enum
 
@@ -31,6 +31,10 @@ class StatusEnum(str, Enum):
     active = "active"
     cancelled = "cancelled"
 
+class ExportFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
 class ReservationCreate(BaseModel):
     space_name: SpaceEnum
     start_datetime: datetime
@@ -47,11 +51,101 @@ class ReservationResponse(BaseModel):
     
     model_config = ORMConfig
 
+MAX_BATCH_SIZE = 100
+
+class ReservationBatchItem(ReservationCreate):
+    user_id: Optional[int] = None  # admins only; defaults to the current user
+
+class ReservationBatchCreate(BaseModel):
+    reservations: List[ReservationBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    atomic: bool = True
+
+class ReservationBatchResult(BaseModel):
+    index: int
+    status_code: int
+    reservation: Optional[ReservationResponse] = None
+    detail: Optional[str] = None
+
+class ReservationBatchResponse(BaseModel):
+    results: List[ReservationBatchResult]
+
+class FrequencyEnum(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+
+class ReservationSeriesCreate(ReservationCreate):
+    frequency: FrequencyEnum
+    interval: int = Field(1, ge=1, le=52)
+    by_weekday: Optional[List[int]] = Field(None, min_length=1, max_length=7)
+    until: Optional[date] = None
+    count: Optional[int] = Field(None, ge=1, le=366)
+
+    @field_validator("by_weekday")
+    @classmethod
+    def validate_weekdays(cls, value):
+        if value is not None and any(day < 0 or day > 6 for day in value):
+            raise ValueError("by_weekday values must be between 0 (Monday) and 6 (Sunday)")
+        return value
+
+    @model_validator(mode="after")
+    def require_until_or_count(self):
+        if self.until is None and self.count is None:
+            raise ValueError("Either until or count is required")
+        return self
+
+class ReservationSeriesResponse(BaseModel):
+    id: int
+    user_id: int
+    space_name: str
+    frequency: FrequencyEnum
+    interval: int
+    by_weekday: Optional[List[int]] = None
+    until: Optional[date] = None
+    count: Optional[int] = None
+    status: StatusEnum
+    reservations: List[ReservationResponse] = []
+
+    @field_validator("by_weekday", mode="before")
+    @classmethod
+    def split_weekdays(cls, value):
+        if isinstance(value, str):
+            return [int(day) for day in value.split(",")]
+        return value
+
+    model_config = ORMConfig
+
 class ReservationUpdate(BaseModel):
     space_name: Optional[SpaceEnum] = None
     start_datetime: Optional[datetime] = None
     end_datetime: Optional[datetime] = None
 
+class TimeWindow(BaseModel):
+    start_datetime: datetime
+    end_datetime: datetime
+
+class SpaceAvailabilityResponse(BaseModel):
+    space_name: SpaceEnum
+    date: date
+    free_windows: List[TimeWindow]
+
+class SlotUtilization(BaseModel):
+    slot: str  # HH:MM UTC start of the slot
+    utilization_percent: float
+
+class SpaceUtilization(BaseModel):
+    space_name: SpaceEnum
+    utilization_percent: float
+    peak_hours: List[SlotUtilization]
+    slots: List[SlotUtilization]
+
+class UtilizationResponse(BaseModel):
+    start_date: date
+    end_date: date
+    granularity_minutes: int
+    utilization_percent: float
+    peak_hours: List[SlotUtilization]
+    spaces: List[SpaceUtilization]
+
 class UserResponse(BaseModel):
     id: int
     email: EmailStr
@@ -1,9 +1,67 @@
-from passlib.context import CryptContext
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from fastapi import HTTPException, status
 
+from app.metrics import timed
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    The passlib context, built on first use so startup does not import passlib.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# bcrypt releases the GIL while hashing, so a small thread pool runs hashes in
+# parallel without blocking the event loop. Requests beyond the workers plus
+# the queue limit are rejected instead of piling up behind a login storm.
+HASHING_WORKERS = int(os.getenv("HASHING_WORKERS", "2"))
+HASHING_QUEUE_LIMIT = int(os.getenv("HASHING_QUEUE_LIMIT", "8"))
+HASHING_RETRY_AFTER_SECONDS = int(os.getenv("HASHING_RETRY_AFTER_SECONDS", "1"))
+
+hashing_executor = ThreadPoolExecutor(
+    max_workers=HASHING_WORKERS,
+    thread_name_prefix="password-hashing"
+)
+_hashing_slots = threading.BoundedSemaphore(HASHING_WORKERS + HASHING_QUEUE_LIMIT)
+
+@timed("security")
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
+@timed("security")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+async def _run_in_hashing_executor(function, *args):
+    """
+    Runs a hashing call on the bounded executor.
+
+    Raises a 503 with Retry-After when every worker is busy and the queue is full.
+    """
+
+    if not _hashing_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy. Please retry shortly.",
+            headers={"Retry-After": str(HASHING_RETRY_AFTER_SECONDS)}
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hashing_executor, function, *args)
+    finally:
+        _hashing_slots.release()
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hashing_executor(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hashing_executor(verify_password, plain_password, hashed_password)
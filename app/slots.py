@@ -0,0 +1,184 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import SlotBitmap
+
+MINUTES_PER_DAY = 24 * 60
+BITMAP_BYTES = MINUTES_PER_DAY // 8
+
+SPACE_SCOPE = "space"
+USER_SCOPE = "user"
+
+# (scope, owner, day): owner is the space name or the user id as text.
+BitmapKey = Tuple[str, str, date]
+
+
+def lock_order(key: BitmapKey):
+    """
+    Sort key giving every transaction the same row lock order: by day, then
+    scope and owner. A multi-day update and a batch locking one day at a time
+    therefore never wait on each other in opposite orders.
+    """
+    scope, owner, day = key
+    return day, scope, owner
+
+
+def minute_mask(first_minute: int, last_minute: int) -> int:
+    """
+    Returns an int with bits [first_minute, last_minute) set.
+    """
+    return ((1 << (last_minute - first_minute)) - 1) << first_minute
+
+
+def reservation_masks(start_datetime: datetime, end_datetime: datetime) -> Dict[date, int]:
+    """
+    Rasterizes a reservation into one minute mask per UTC day it touches.
+
+    Bit n of a day mask stands for minute n after UTC midnight. Naive datetimes
+    are treated as UTC, like app.validators.reservation_day.
+    """
+
+    start = _as_utc(start_datetime)
+    end = _as_utc(end_datetime)
+    masks = {}
+
+    while start < end:
+        day = start.date()
+        next_midnight = datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        piece_end = min(end, next_midnight)
+
+        first_minute = start.hour * 60 + start.minute
+        last_minute = first_minute + int((piece_end - start).total_seconds() // 60)
+
+        masks[day] = minute_mask(first_minute, last_minute)
+        start = piece_end
+
+    return masks
+
+
+def slot_masks(
+    user_id: int,
+    space_name: str,
+    start_datetime: datetime,
+    end_datetime: datetime
+) -> Dict[BitmapKey, int]:
+    """
+    Returns the space and user bitmap keys a reservation occupies, with its mask for each.
+    """
+
+    masks = {}
+
+    for day, mask in reservation_masks(start_datetime, end_datetime).items():
+        masks[(SPACE_SCOPE, space_name, day)] = mask
+        masks[(USER_SCOPE, str(user_id), day)] = mask
+
+    return masks
+
+
+def reserved_minutes(bits: int) -> int:
+    return bits.bit_count()
+
+
+def claim_slots(bitmaps: Dict[BitmapKey, int], masks: Dict[BitmapKey, int]) -> Dict[BitmapKey, int]:
+    claimed = dict(bitmaps)
+    for key, mask in masks.items():
+        claimed[key] = claimed.get(key, 0) | mask
+    return claimed
+
+
+def release_slots(bitmaps: Dict[BitmapKey, int], masks: Dict[BitmapKey, int]) -> Dict[BitmapKey, int]:
+    released = dict(bitmaps)
+    for key, mask in masks.items():
+        released[key] = released.get(key, 0) & ~mask
+    return released
+
+
+def encode_bitmap(bits: int) -> bytes:
+    return bits.to_bytes(BITMAP_BYTES, "little")
+
+
+def decode_bitmap(data: bytes) -> int:
+    return int.from_bytes(data, "little")
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _insert(db: Session):
+    return postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+def load_slot_bitmaps(
+    db: Session,
+    keys: Iterable[BitmapKey],
+    for_update: bool = False
+) -> Dict[BitmapKey, int]:
+    """
+    Loads the persisted bitmaps for the given keys; missing keys map to 0.
+
+    With for_update=True the rows are created if missing and locked with
+    SELECT ... FOR UPDATE (PostgreSQL), so the check and the following
+    store_slot_bitmaps happen atomically per space/user and day. This is the
+    reservation locking strategy: writers touching the same (space, day) or
+    (user, day) are serialized on those rows, everything else runs in
+    parallel. Rows are locked in lock_order, and every write path locks them
+    before the user_daily_usage and users rows it updates. On SQLite the initial INSERT
+    takes the database write lock, which serializes writers as a whole.
+    """
+
+    keys = sorted(set(keys), key=lock_order)
+    if not keys:
+        return {}
+
+    if for_update:
+        statement = _insert(db)(SlotBitmap).values([
+            {"scope": scope, "owner": owner, "day": day, "bits": encode_bitmap(0)}
+            for scope, owner, day in keys
+        ])
+        db.execute(statement.on_conflict_do_nothing())
+
+    # An OR of primary key equalities rather than a row-value IN: SQLite only
+    # resolves the former through the primary key index.
+    query = db.query(SlotBitmap.scope, SlotBitmap.owner, SlotBitmap.day, SlotBitmap.bits).filter(
+        or_(*(
+            and_(SlotBitmap.scope == scope, SlotBitmap.owner == owner, SlotBitmap.day == day)
+            for scope, owner, day in keys
+        ))
+    ).order_by(SlotBitmap.day, SlotBitmap.scope, SlotBitmap.owner)
+
+    if for_update:
+        query = query.with_for_update()
+
+    bitmaps = {key: 0 for key in keys}
+    for scope, owner, day, bits in query:
+        bitmaps[(scope, owner, day)] = decode_bitmap(bits)
+
+    return bitmaps
+
+
+def store_slot_bitmaps(db: Session, bitmaps: Dict[BitmapKey, int]):
+    """
+    Writes bitmaps back with a single multi-row upsert in the caller's transaction.
+    """
+
+    if not bitmaps:
+        return
+
+    statement = _insert(db)(SlotBitmap).values([
+        {"scope": scope, "owner": owner, "day": day, "bits": encode_bitmap(bits)}
+        for (scope, owner, day), bits in sorted(bitmaps.items(), key=lambda item: lock_order(item[0]))
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[SlotBitmap.scope, SlotBitmap.owner, SlotBitmap.day],
+        set_={"bits": statement.excluded.bits}
+    )
+
+    db.execute(statement)
@@ -0,0 +1,63 @@
+"""
+Startup work kept off the import path.
+
+Importing app.main only loads what is needed to build the routes; database
+drivers, python-jose, passlib and NumPy are loaded on first use. warm_up runs
+from the lifespan hook, in each worker process: in the background by default,
+so a freshly started container answers its first request right away, or
+before the worker accepts traffic when WARM_UP_BEFORE_SERVING is set (the
+gunicorn config does this, since other workers keep serving meanwhile).
+NumPy is left out of the warm-up: only the admin analytics endpoint uses it.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_BEFORE_SERVING = os.getenv("WARM_UP_BEFORE_SERVING", "false").lower() in ("1", "true", "yes")
+
+
+def _warm_up_modules():
+    from app.database import get_engines
+    from app.security import get_pwd_context
+    import jose.jwt  # noqa: F401
+
+    get_engines()
+    # Loads the bcrypt backend and runs passlib's self-test, without hashing.
+    get_pwd_context().handler().get_backend()
+
+
+async def _warm_up_caches(session_factory):
+    from app.availability import availability_index
+    from app.schemas import SpaceEnum
+
+    today = datetime.now(timezone.utc).date()
+    # Also opens the worker's first pooled connection.
+    async with session_factory() as db:
+        for space in SpaceEnum:
+            await db.run_sync(availability_index.busy_intervals, space.value, today)
+
+
+async def warm_up(session_factory) -> float:
+    """
+    Creates the engines, loads the hashing backend and fills today's
+    availability cache for every space. Returns the seconds spent.
+
+    Business rules:
+    - Runs in every worker process; nothing here is shared across forks.
+    - Failures are logged, not raised: every step is retried lazily by the
+      request that needs it.
+    """
+
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_warm_up_modules)
+        await _warm_up_caches(session_factory)
+    except Exception:
+        logger.exception("Startup warm-up failed")
+
+    return time.perf_counter() - started
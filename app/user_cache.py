@@ -0,0 +1,69 @@
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.cache import TTLCache
+from app.models import User
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    The authenticated user fields route handlers need, without the ORM User.
+    """
+    id: int
+    role: str
+    is_active: bool
+
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl_seconds=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """
+    Drops a user from the cache. Call it after changing role or is_active
+    outside the ORM (bulk UPDATEs, raw SQL); ORM updates are handled below.
+    """
+    user_cache.invalidate(user_id)
+
+
+# Changed users are collected at flush and dropped from the cache only once the
+# transaction commits: dropping them at flush would let a concurrent request
+# re-cache the old row before the change is visible.
+PENDING_INVALIDATIONS = "invalidated_user_ids"
+
+
+def _invalidate_after_commit(target):
+    session = object_session(target)
+    if session is None:
+        invalidate_user(target.id)
+        return
+    session.info.setdefault(PENDING_INVALIDATIONS, set()).add(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_changed_user(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        _invalidate_after_commit(target)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    _invalidate_after_commit(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop(PENDING_INVALIDATIONS, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
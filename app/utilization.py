@@ -0,0 +1,186 @@
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Reservation
+from app.schemas import SpaceEnum
+from app.validators import BUSINESS_OPEN, BUSINESS_CLOSE, active, overlapping
+
+MINUTES_PER_DAY = 24 * 60
+MAX_UTILIZATION_DAYS = 366
+PEAK_SLOTS = 3
+
+SPACES = [space.value for space in SpaceEnum]
+# Maps names to SPACES positions with a vectorized searchsorted over the sorted names.
+_SORTED_SPACES = np.array(sorted(SPACES))
+_SORTED_TO_SPACE = np.array([SPACES.index(name) for name in _SORTED_SPACES])
+
+_GRANULARITY_PATTERN = re.compile(r"^(\d+)(m|h)$")
+
+
+def parse_granularity(granularity: str) -> int:
+    """
+    Parses "15m", "30m", "1h"... into minutes.
+
+    Slots must tile the business day exactly, so they are aligned to the opening hour.
+    """
+
+    match = _GRANULARITY_PATTERN.match(granularity)
+    minutes = int(match.group(1)) * (60 if match.group(2) == "h" else 1) if match else 0
+    business_minutes = _minute_of_day(BUSINESS_CLOSE) - _minute_of_day(BUSINESS_OPEN)
+
+    if minutes < 5 or business_minutes % minutes or _minute_of_day(BUSINESS_OPEN) % minutes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Granularity must be like 15m, 30m or 1h and evenly divide business hours."
+        )
+
+    return minutes
+
+
+def _minute_of_day(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _epoch_seconds(column, dialect_name: str):
+    # Timestamps leave the database as integers, so rows become NumPy arrays
+    # without converting a datetime object per reservation.
+    if dialect_name == "postgresql":
+        return cast(func.extract("epoch", column), Integer)
+    return cast(func.strftime("%s", column), Integer)
+
+
+def occupancy_matrix(
+    space_indexes: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    spaces: int,
+    days: int
+) -> np.ndarray:
+    """
+    Rasterizes reservations into a boolean (space, day, minute) occupancy matrix.
+
+    starts/ends are minute offsets from the first day's UTC midnight. Each
+    reservation adds +1 at its start and -1 at its end in a difference array;
+    a cumulative sum then gives the number of reservations covering each minute.
+    """
+
+    minutes = days * MINUTES_PER_DAY
+    row_offsets = space_indexes * (minutes + 1)
+    size = spaces * (minutes + 1)
+
+    difference = (
+        np.bincount(row_offsets + np.clip(starts, 0, minutes), minlength=size)
+        - np.bincount(row_offsets + np.clip(ends, 0, minutes), minlength=size)
+    ).reshape(spaces, minutes + 1)
+
+    covered = np.cumsum(difference[:, :minutes], axis=1) > 0
+    return covered.reshape(spaces, days, MINUTES_PER_DAY)
+
+
+def _slot_label(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def space_utilization(
+    db: Session,
+    start_day: date,
+    end_day: date,
+    granularity_minutes: int
+) -> Dict:
+    """
+    Computes business-hours utilization per space and slot for [start_day, end_day].
+
+    Business rules:
+    - Only active reservations count.
+    - Days are UTC days; utilization is the share of business-hours minutes
+      that are reserved, as a percentage.
+    - Peak slots are the slots of the day with the highest average utilization.
+    """
+
+    if end_day < start_day:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'."
+        )
+
+    days = (end_day - start_day).days + 1
+    if days > MAX_UTILIZATION_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The utilization range cannot exceed {MAX_UTILIZATION_DAYS} days."
+        )
+
+    range_start = datetime.combine(start_day, time.min, tzinfo=timezone.utc)
+    range_end = range_start + timedelta(days=days)
+    origin = int(range_start.timestamp())
+    dialect_name = db.get_bind().dialect.name
+
+    rows = db.execute(
+        select(
+            Reservation.space_name,
+            _epoch_seconds(Reservation.start_datetime, dialect_name),
+            _epoch_seconds(Reservation.end_datetime, dialect_name)
+        ).where(
+            active(),
+            *overlapping(range_start, range_end)
+        )
+    ).all()
+
+    if rows:
+        names, starts, ends = zip(*rows)
+        space_indexes = _SORTED_TO_SPACE[np.searchsorted(_SORTED_SPACES, np.array(names))]
+        starts = (np.array(starts, dtype=np.int64) - origin) // 60
+        ends = (np.array(ends, dtype=np.int64) - origin) // 60
+    else:
+        space_indexes = starts = ends = np.zeros(0, dtype=np.int64)
+
+    occupied = occupancy_matrix(space_indexes, starts, ends, len(SPACES), days)
+
+    opening = _minute_of_day(BUSINESS_OPEN)
+    closing = _minute_of_day(BUSINESS_CLOSE)
+    slots = (closing - opening) // granularity_minutes
+
+    # (space, day, slot, minute in slot) -> share of each slot that is reserved.
+    business = occupied[:, :, opening:closing].reshape(len(SPACES), days, slots, granularity_minutes)
+    slot_occupancy = business.mean(axis=3)
+
+    by_slot = slot_occupancy.mean(axis=1) * 100  # (space, slot)
+    by_space = slot_occupancy.mean(axis=(1, 2)) * 100
+    overall_by_slot = by_slot.mean(axis=0)
+
+    slot_labels = [_slot_label(opening + index * granularity_minutes) for index in range(slots)]
+
+    def peak(values: np.ndarray) -> List[Dict]:
+        order = np.argsort(-values, kind="stable")[:PEAK_SLOTS]
+        return [
+            {"slot": slot_labels[index], "utilization_percent": round(float(values[index]), 2)}
+            for index in order
+            if values[index] > 0
+        ]
+
+    return {
+        "start_date": start_day,
+        "end_date": end_day,
+        "granularity_minutes": granularity_minutes,
+        "utilization_percent": round(float(by_space.mean()), 2),
+        "peak_hours": peak(overall_by_slot),
+        "spaces": [
+            {
+                "space_name": space_name,
+                "utilization_percent": round(float(by_space[index]), 2),
+                "peak_hours": peak(by_slot[index]),
+                "slots": [
+                    {"slot": label, "utilization_percent": round(float(value), 2)}
+                    for label, value in zip(slot_labels, by_slot[index])
+                ]
+            }
+            for index, space_name in enumerate(SPACES)
+        ]
+    }
+
@@ -1,10 +1,16 @@
 # app/validators.py
 
-from datetime import datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from app.models import Reservation
+from sqlalchemy import and_, literal, or_
+from sqlalchemy.exc import IntegrityError
+from app.models import Reservation, UserDailyUsage
+from app.metrics import timed
+from app.slots import SPACE_SCOPE
 
 BUSINESS_OPEN = time(8, 0)
 BUSINESS_CLOSE = time(20, 0)
@@ -12,9 +18,61 @@ MIN_DURATION_MINUTES = 30
 MAX_DURATION_MINUTES = 8 * 60
 MAX_DAILY_DURATION_MINUTES = 8 * 60
 
+SPACE_OVERLAP_CONSTRAINT = "reservations_no_space_overlap"
+USER_OVERLAP_CONSTRAINT = "reservations_no_user_overlap"
+SPACE_OVERLAP_DETAIL = "This space is already reserved during the selected time range."
+USER_OVERLAP_DETAIL = "User already has another reservation during the selected time range."
+
 def normalize_datetime(dt: datetime) -> datetime:
     return dt.replace(second=0, microsecond=0)
 
+def reservation_day(dt: datetime) -> date:
+    """
+    Returns the UTC calendar day of the slot bitmaps and availability cache
+    entries a reservation is stored in.
+
+    Naive datetimes (as returned by SQLite) are treated as UTC.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.date()
+
+def usage_day(dt: datetime) -> date:
+    """
+    Returns the calendar day a reservation counts toward for the daily limit:
+    the day of its start in the offset the client sent, stored as
+    Reservation.usage_day and keying the user_daily_usage ledger.
+    """
+    return dt.date()
+
+def reservation_minutes(start_datetime: datetime, end_datetime: datetime) -> int:
+    return int((end_datetime - start_datetime).total_seconds() // 60)
+
+def overlapping(start_datetime: datetime, end_datetime: datetime) -> tuple:
+    """
+    Filter clauses selecting reservations that overlap [start_datetime, end_datetime).
+
+    No reservation lasts longer than MAX_DURATION_MINUTES, so the redundant
+    lower bound on start_datetime is always true for an overlap; it lets
+    Postgres prune the monthly partitions instead of scanning all history.
+    """
+    return (
+        Reservation.start_datetime < end_datetime,
+        Reservation.end_datetime > start_datetime,
+        Reservation.start_datetime > start_datetime - timedelta(minutes=MAX_DURATION_MINUTES)
+    )
+
+def active():
+    """
+    Filter clause selecting active reservations.
+
+    The value is inlined instead of bound: SQLite only matches the
+    `WHERE status = 'active'` partial indexes against a literal, and Postgres
+    cannot use them in a generic plan for a prepared statement.
+    """
+    return Reservation.status == literal("active", Reservation.status.type, literal_execute=True)
+
+@timed("validator")
 def validate_not_in_past(start_datetime: datetime):
     """
     Ensures reservations cannot be created in the past.
@@ -30,6 +88,7 @@ def validate_not_in_past(start_datetime: datetime):
             detail="Reservations cannot be created in the past."
         )
 
+@timed("validator")
 def validate_reservation_time(start_datetime: datetime, end_datetime: datetime):
     """
     Validates the temporal rules for a reservation.
@@ -86,6 +145,7 @@ def validate_reservation_time(start_datetime: datetime, end_datetime: datetime):
             detail="Maximum reservation duration is 8 hours."
         )
         
+@timed("validator")
 def validate_no_overlap(
     db: Session,
     user_id: int,
@@ -103,12 +163,14 @@ def validate_no_overlap(
     - Consecutive reservations are allowed when one reservation ends exactly when the next one begins.
     - Cancelled reservations are ignored.
     - When updating a reservation, the current reservation can be excluded from validation using reservation_id.
+
+    No request path calls this since the slot bitmaps (validate_slots_available)
+    took over; it is kept as the SQL baseline of bench/bench_overlap_check.py.
     """
     
     query = db.query(Reservation).filter(
         Reservation.status == "active",
-        Reservation.start_datetime < end_datetime,
-        Reservation.end_datetime > start_datetime,
+        *overlapping(start_datetime, end_datetime),
         or_(
             Reservation.space_name == space_name,
             Reservation.user_id == user_id
@@ -122,21 +184,117 @@ def validate_no_overlap(
 
     if existing_reservation:
         if existing_reservation.space_name == space_name:
-            detail = "This space is already reserved during the selected time range."
+            detail = SPACE_OVERLAP_DETAIL
         else:
-            detail = "User already has another reservation during the selected time range."
+            detail = USER_OVERLAP_DETAIL
 
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=detail
         )
 
+@timed("validator")
+def validate_slots_available(bitmaps: dict, masks: dict):
+    """
+    Prevents reservation conflicts using the minute bitmaps from app.slots.
+
+    Business rules are the same as validate_no_overlap, answered with a bitwise
+    AND per space/user and day instead of a range query:
+    - bitmaps holds the persisted occupancy of every key in masks.
+    - masks holds the minutes the new reservation needs.
+    - Space conflicts are reported before user conflicts.
+    """
+
+    conflicts = [key for key, mask in masks.items() if bitmaps.get(key, 0) & mask]
+
+    if not conflicts:
+        return
+
+    if any(scope == SPACE_SCOPE for scope, _, _ in conflicts):
+        detail = SPACE_OVERLAP_DETAIL
+    else:
+        detail = USER_OVERLAP_DETAIL
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=detail
+    )
+
+def raise_for_overlap_violation(error: IntegrityError):
+    """
+    Translates an exclusion constraint violation into the 409 raised by validate_no_overlap.
+
+    Any other integrity error is re-raised unchanged.
+    """
+
+    message = str(error.orig)
+
+    if SPACE_OVERLAP_CONSTRAINT in message:
+        detail = SPACE_OVERLAP_DETAIL
+    elif USER_OVERLAP_CONSTRAINT in message:
+        detail = USER_OVERLAP_DETAIL
+    else:
+        raise error
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=detail
+    ) from error
+
+@timed("validator")
+def validate_daily_minutes(total_minutes: int):
+    """
+    Rejects a user's day once its active reserved minutes would exceed the daily limit.
+    """
+
+    if total_minutes > MAX_DAILY_DURATION_MINUTES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Daily reservation limit exceeded. Users cannot reserve more than 8 hours per day."
+        )
+
+def lock_daily_usage(db: Session, keys: Iterable[Tuple[int, date]]) -> Dict[Tuple[int, date], int]:
+    """
+    Returns the reserved minutes of the given (user_id, day) ledger rows,
+    creating missing rows and locking them with SELECT ... FOR UPDATE
+    (PostgreSQL) in (user_id, day) order.
+
+    The slot bitmaps only serialize writers of one UTC day, but a client's
+    calendar day can span two; locking the ledger row serializes every
+    check of one user and day. Callers lock their slot bitmaps first.
+    """
+
+    keys = sorted(set(keys))
+    if not keys:
+        return {}
+
+    upsert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        upsert(UserDailyUsage)
+        .values([{"user_id": user_id, "day": day, "minutes": 0} for user_id, day in keys])
+        .on_conflict_do_nothing()
+    )
+
+    rows = db.query(UserDailyUsage.user_id, UserDailyUsage.day, UserDailyUsage.minutes).filter(
+        or_(*(
+            and_(UserDailyUsage.user_id == user_id, UserDailyUsage.day == day)
+            for user_id, day in keys
+        ))
+    ).order_by(UserDailyUsage.user_id, UserDailyUsage.day).with_for_update()
+
+    usage = {key: 0 for key in keys}
+    for user_id, day, minutes in rows:
+        usage[(user_id, day)] = minutes
+    return usage
+
+@timed("validator")
 def validate_daily_reservation_limit(
     db: Session,
     user_id: int,
     start_datetime: datetime,
     end_datetime: datetime,
-    reservation_id: int | None = None
+    reservation_id: int | None = None,
+    day: date | None = None
 ):
     """
     Enforces the maximum daily reservation limit per user.
@@ -146,45 +304,34 @@ def validate_daily_reservation_limit(
     - Only active reservations are considered.
     - Cancelled reservations do not count toward the limit.
     - When updating a reservation, the current reservation can be excluded from the calculation using reservation_id.
+
+    The calendar day is taken in the offset of start_datetime unless day (a
+    stored usage_day) is given. Reserved minutes are read from the locked
+    user_daily_usage row, which crud keeps in sync with reservation writes,
+    so the check is a primary key lookup.
     """
     
-    day_start = start_datetime.replace(
-        hour=0,
-        minute=0,
-        second=0,
-        microsecond=0
-    )
+    if day is None:
+        day = usage_day(start_datetime)
 
-    day_end = start_datetime.replace(
-        hour=23,
-        minute=59,
-        second=59,
-        microsecond=999999
-    )
-
-    query = db.query(Reservation).filter(
-        Reservation.user_id == user_id,
-        Reservation.status == "active",
-        Reservation.start_datetime >= day_start,
-        Reservation.start_datetime <= day_end
-    )
+    existing_minutes = lock_daily_usage(db, [(user_id, day)])[(user_id, day)]
 
     if reservation_id is not None:
-        query = query.filter(Reservation.id != reservation_id)
+        current = db.query(
+            Reservation.start_datetime,
+            Reservation.end_datetime,
+            Reservation.usage_day
+        ).filter(
+            Reservation.id == reservation_id,
+            active()
+        ).first()
 
-    existing_reservations = query.all()
+        if current and current.usage_day == day:
+            existing_minutes -= reservation_minutes(
+                current.start_datetime,
+                current.end_datetime
+            )
 
-    existing_minutes = sum(
-        (reservation.end_datetime - reservation.start_datetime).total_seconds() / 60
-        for reservation in existing_reservations
+    validate_daily_minutes(
+        existing_minutes + reservation_minutes(start_datetime, end_datetime)
     )
-
-    new_minutes = (end_datetime - start_datetime).total_seconds() / 60
-
-    total_minutes = existing_minutes + new_minutes
-
-    if total_minutes > MAX_DAILY_DURATION_MINUTES:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Daily reservation limit exceeded. Users cannot reserve more than 8 hours per day."
-        )
@@ -0,0 +1,165 @@
+"""
+Stress test for concurrent reservation creates.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql://... python -m bench.bench_concurrent_creates --threads 16 --attempts 50
+
+Runs crud.create_reservation from --threads threads, each with its own
+session, in two scenarios:
+
+- contended: every thread books random one-hour slots in the same space and day;
+- disjoint: each thread books its own space and days.
+
+Checks afterwards that no two active reservations overlap per space or per
+user, and prints a JSON report with throughput, outcomes and latency.
+Defaults to a temporary SQLite file, which serializes all writers; use
+Postgres to see the per-(space, day) row locks let disjoint writers run in parallel.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+from sqlalchemy import and_, create_engine, insert, select
+from sqlalchemy.orm import aliased, sessionmaker
+
+from app import crud
+from app.database import Base
+from app.models import Reservation, User
+from app.schemas import ReservationCreate, SpaceEnum
+
+FIRST_DAY = datetime(2031, 6, 2, tzinfo=timezone.utc)
+SPACES = [space.value for space in SpaceEnum]
+
+
+def build_sessionmaker(url: str, threads: int):
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+    else:
+        engine = create_engine(url, pool_size=threads, max_overflow=0)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def reset(Session, users: int):
+    engine = Session.kw["bind"]
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with Session() as db:
+        db.execute(insert(User), [
+            {"email": f"stress{i}@example.com", "username": f"stress{i}", "hashed_password": "x", "role": "user"}
+            for i in range(users)
+        ])
+        db.commit()
+
+
+def overlapping_pairs(Session, column: str) -> int:
+    other = aliased(Reservation)
+    with Session() as db:
+        return len(db.execute(
+            select(Reservation.id).join(other, and_(
+                getattr(Reservation, column) == getattr(other, column),
+                Reservation.id < other.id,
+                Reservation.start_datetime < other.end_datetime,
+                other.start_datetime < Reservation.end_datetime,
+                Reservation.status == "active",
+                other.status == "active"
+            ))
+        ).all())
+
+
+def run(Session, threads: int, attempts: int, contended: bool) -> dict:
+    reset(Session, threads)
+    barrier = threading.Barrier(threads)
+    outcomes = {"created": 0, "conflicts": 0, "errors": 0}
+    timings = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        rng = random.Random(index)
+        user_id = index + 1
+        space_name = SPACES[0] if contended else SPACES[index % len(SPACES)]
+        barrier.wait()
+
+        for attempt in range(attempts):
+            if contended:
+                day = FIRST_DAY
+                start = day + timedelta(hours=8 + rng.randrange(11), minutes=30 * rng.randrange(2))
+            else:
+                # Threads sharing a space get disjoint day ranges.
+                day = FIRST_DAY + timedelta(days=(index // len(SPACES)) * attempts + attempt)
+                start = day + timedelta(hours=9)
+
+            started = time.perf_counter()
+            with Session() as db:
+                try:
+                    crud.create_reservation(
+                        db,
+                        ReservationCreate(space_name=space_name, start_datetime=start, end_datetime=start + timedelta(hours=1)),
+                        user_id
+                    )
+                    outcome = "created"
+                except HTTPException as error:
+                    outcome = "conflicts" if error.status_code == 409 else "errors"
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                outcomes[outcome] += 1
+                timings.append(elapsed * 1000)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        **outcomes,
+        "elapsed_seconds": round(elapsed, 3),
+        "attempts_per_second": round(len(timings) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "space_double_bookings": overlapping_pairs(Session, "space_name"),
+        "user_double_bookings": overlapping_pairs(Session, "user_id")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=12)
+    parser.add_argument("--attempts", type=int, default=25, help="creates per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{directory}/stress.db")
+        Session = build_sessionmaker(url, args.threads)
+
+        report = {
+            "database": Session.kw["bind"].dialect.name,
+            "threads": args.threads,
+            "attempts_per_thread": args.attempts,
+            "contended": run(Session, args.threads, args.attempts, contended=True),
+            "disjoint": run(Session, args.threads, args.attempts, contended=False)
+        }
+        Session.kw["bind"].dispose()
+
+    print(json.dumps(report, indent=2))
+
+    if report["contended"]["space_double_bookings"] or report["disjoint"]["user_double_bookings"]:
+        raise SystemExit("double bookings detected")
+
+
+if __name__ == "__main__":
+    main()
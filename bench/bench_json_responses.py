@@ -0,0 +1,132 @@
+"""
+Compares the Pydantic response_model path with the FAST_JSON_RESPONSES path.
+
+Usage:
+    python -m bench.bench_json_responses --rows 10000 --repeat 5
+
+Seeds one user with --rows reservations (in-memory SQLite by default, or
+BENCH_DATABASE_URL) and times, for the whole list:
+
+- pydantic: ORM objects -> FastAPI's serialize_response for
+  List[ReservationResponse] -> JSONResponse;
+- fast: column tuples -> FastJSONResponse (orjson).
+
+Prints a JSON report with the median query, serialization and total time of each path.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.crud import user_reservations_statement
+from app.database import Base, to_async_url
+from app.fast_json import RESERVATION_RESPONSE_COLUMNS, reservation_rows_response
+from app.main import app
+from app.models import Reservation, User
+from app.schemas import SpaceEnum
+
+FIRST_DAY = datetime(2031, 1, 1, tzinfo=timezone.utc)
+SPACES = [space.value for space in SpaceEnum]
+
+
+def listing_response_field():
+    for route in app.routes:
+        if getattr(route, "path", None) == "/reservations" and "GET" in route.methods:
+            return route.response_field
+    raise LookupError("GET /reservations route not found")
+
+
+async def seed(Session, rows: int):
+    async with Session() as db:
+        await db.run_sync(lambda sync_db: Base.metadata.create_all(sync_db.connection()))
+        await db.execute(insert(User), [{"email": "bench@example.com", "username": "bench", "hashed_password": "x", "role": "user"}])
+        await db.execute(insert(Reservation), [
+            {
+                "user_id": 1,
+                "space_name": SPACES[index % len(SPACES)],
+                "start_datetime": FIRST_DAY + timedelta(hours=index),
+                "end_datetime": FIRST_DAY + timedelta(hours=index, minutes=45),
+                "status": "active"
+            }
+            for index in range(rows)
+        ])
+        await db.commit()
+
+
+async def pydantic_path(Session, field):
+    started = time.perf_counter()
+    async with Session() as db:
+        reservations = (await db.execute(user_reservations_statement(1))).scalars().all()
+    queried = time.perf_counter()
+
+    content = await serialize_response(field=field, response_content=reservations)
+    body = JSONResponse(content).body
+    return queried - started, time.perf_counter() - queried, len(body)
+
+
+async def fast_path(Session, field):
+    started = time.perf_counter()
+    async with Session() as db:
+        statement = user_reservations_statement(1).with_only_columns(*RESERVATION_RESPONSE_COLUMNS)
+        rows = (await db.execute(statement)).all()
+    queried = time.perf_counter()
+
+    body = reservation_rows_response(rows).body
+    return queried - started, time.perf_counter() - queried, len(body)
+
+
+async def run(rows: int, repeat: int) -> dict:
+    url = to_async_url(os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    if url.startswith("sqlite"):
+        engine = create_async_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_async_engine(url)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(Session, rows)
+    field = listing_response_field()
+
+    report = {"database": engine.dialect.name, "rows": rows, "repeat": repeat}
+    for name, path in (("pydantic", pydantic_path), ("fast", fast_path)):
+        await path(Session, field)  # warm up
+        samples = [await path(Session, field) for _ in range(repeat)]
+        query_ms = statistics.median(sample[0] for sample in samples) * 1000
+        serialize_ms = statistics.median(sample[1] for sample in samples) * 1000
+        report[name] = {
+            "query_ms": round(query_ms, 2),
+            "serialize_ms": round(serialize_ms, 2),
+            "total_ms": round(query_ms + serialize_ms, 2),
+            "body_bytes": samples[0][2]
+        }
+
+    report["speedup"] = round(report["pydantic"]["total_ms"] / report["fast"]["total_ms"], 2)
+    await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
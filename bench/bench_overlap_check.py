@@ -0,0 +1,135 @@
+"""
+Compares the SQL range-scan overlap check with the slot bitmap check.
+
+Usage:
+    python -m bench.bench_overlap_check --reservations 20000 --checks 2000
+
+Seeds an isolated database (in-memory SQLite by default, or BENCH_DATABASE_URL)
+and prints a JSON report with the mean and p95 latency of each strategy.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Reservation, User
+from app.schemas import SpaceEnum
+from app.slots import claim_slots, load_slot_bitmaps, slot_masks, store_slot_bitmaps
+from app.validators import validate_no_overlap, validate_slots_available
+
+FIRST_DAY = datetime(2030, 1, 1, tzinfo=timezone.utc)
+SPACES = [space.value for space in SpaceEnum]
+
+
+def build_session(url: str):
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def seed(db, reservations: int, users: int, days: int):
+    db.execute(insert(User), [
+        {"email": f"bench{i}@example.com", "username": f"bench{i}", "hashed_password": "x", "role": "user"}
+        for i in range(users)
+    ])
+
+    rows = []
+    bitmaps = {}
+    # Each space/day gets consecutive one-hour blocks, so the seeded data never overlaps.
+    for i in range(reservations):
+        space_index, slot = divmod(i, days * 12)
+        day, hour = divmod(slot, 12)
+        start = FIRST_DAY + timedelta(days=day, hours=8 + hour)
+        end = start + timedelta(hours=1)
+        space_name = SPACES[space_index % len(SPACES)]
+        user_id = (i % users) + 1
+
+        rows.append({
+            "user_id": user_id,
+            "space_name": space_name,
+            "start_datetime": start,
+            "end_datetime": end,
+            "status": "active"
+        })
+        bitmaps = claim_slots(bitmaps, slot_masks(user_id, space_name, start, end))
+
+    db.execute(insert(Reservation), rows)
+    store_slot_bitmaps(db, bitmaps)
+    db.commit()
+
+
+def candidates(checks: int, users: int, days: int):
+    rng = random.Random(42)
+    for _ in range(checks):
+        start = FIRST_DAY + timedelta(days=rng.randrange(days), hours=8 + rng.randrange(11), minutes=30)
+        yield rng.randrange(users) + 1, rng.choice(SPACES), start, start + timedelta(hours=1)
+
+
+def measure(check, items):
+    timings = []
+    conflicts = 0
+    for item in items:
+        started = time.perf_counter()
+        try:
+            check(*item)
+        except HTTPException:
+            conflicts += 1
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 4),
+        "conflicts": conflicts
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reservations", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--checks", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = build_session(os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    seed(db, args.reservations, args.users, args.days)
+    items = list(candidates(args.checks, args.users, args.days))
+
+    def sql_check(user_id, space_name, start, end):
+        validate_no_overlap(db, user_id, space_name, start, end)
+
+    def bitmap_check(user_id, space_name, start, end):
+        masks = slot_masks(user_id, space_name, start, end)
+        validate_slots_available(load_slot_bitmaps(db, masks), masks)
+
+    report = {
+        "database": db.get_bind().dialect.name,
+        "reservations": args.reservations,
+        "checks": args.checks,
+        "validate_no_overlap": measure(sql_check, items),
+        "validate_slots_available": measure(bitmap_check, items)
+    }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Time-to-first-response of a freshly started server.
+
+Usage:
+    python -m bench.cold_start --runs 5
+    DATABASE_URL=postgresql://... python -m bench.cold_start --output cold_start.json
+
+Each run starts `uvicorn app.main:app` in a new process and records, from the
+moment the process is spawned:
+
+- first_response_ms: until GET /health first answers 200;
+- register_ms, login_ms, list_ms: the latency of the first POST /register,
+  POST /login and GET /reservations, which pay for anything startup deferred
+  and the warm-up has not finished yet.
+
+Without DATABASE_URL a temporary SQLite file is created for each run. Prints a
+JSON report with the median, min and max of each measurement; save runs with
+--output to track them across changes.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+POLL_INTERVAL_SECONDS = 0.005
+STARTUP_TIMEOUT_SECONDS = 30
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(url: str, data: bytes = None, headers: dict = None, content_type: str = None):
+    headers = dict(headers or {})
+    if content_type:
+        headers["Content-Type"] = content_type
+    with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers), timeout=30) as response:
+        return response.status, response.read()
+
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    status, body = function(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000, status, body
+
+
+def create_tables(url: str):
+    from sqlalchemy import create_engine
+
+    from app.database import Base
+    from app import models  # noqa: F401
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+
+def run_once(env: dict, run: int) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+
+    try:
+        while True:
+            try:
+                request(f"{base_url}/health")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise SystemExit("server exited during startup")
+                if time.perf_counter() - started > STARTUP_TIMEOUT_SECONDS:
+                    raise SystemExit("server did not answer in time")
+                time.sleep(POLL_INTERVAL_SECONDS)
+        first_response_ms = (time.perf_counter() - started) * 1000
+
+        email = f"coldstart{run}-{os.getpid()}@example.com"
+        password = "coldstart123"
+        register_ms, _, _ = timed(
+            request,
+            f"{base_url}/register",
+            json.dumps({"email": email, "username": f"coldstart{run}_{os.getpid()}", "password": password}).encode(),
+            content_type="application/json"
+        )
+        login_ms, _, body = timed(
+            request,
+            f"{base_url}/login",
+            urllib.parse.urlencode({"username": email, "password": password}).encode(),
+            content_type="application/x-www-form-urlencoded"
+        )
+        token = json.loads(body)["access_token"]
+        list_ms, _, _ = timed(request, f"{base_url}/reservations", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "first_response_ms": first_response_ms,
+        "register_ms": register_ms,
+        "login_ms": login_ms,
+        "list_ms": list_ms
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    temporary_database = "DATABASE_URL" not in os.environ
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "cold-start-secret-key")
+    env = dict(os.environ)
+
+    samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(args.runs):
+            if temporary_database:
+                env["DATABASE_URL"] = f"sqlite:///{directory}/cold_start_{run}.db"
+                create_tables(env["DATABASE_URL"])
+            samples.append(run_once(env, run))
+
+    report = {
+        "database": "sqlite (temporary)" if temporary_database else env["DATABASE_URL"].split("@")[-1],
+        "runs": args.runs,
+        **{
+            name: {
+                "median": round(statistics.median(sample[name] for sample in samples), 1),
+                "min": round(min(sample[name] for sample in samples), 1),
+                "max": round(max(sample[name] for sample in samples), 1)
+            }
+            for name in samples[0]
+        }
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
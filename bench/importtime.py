@@ -0,0 +1,106 @@
+"""
+Import-time profile of the application.
+
+Usage:
+    python -m bench.importtime --runs 5 --top 20
+    python -m bench.importtime --output importtime.json
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+prints a JSON report with the median total import time, the top-level
+packages and modules that cost the most, and which of the modules that
+startup defers (database drivers, python-jose, passlib, NumPy) were loaded anyway.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Loaded on first use or by app.startup.warm_up, never by importing the app.
+DEFERRED_MODULES = ["numpy", "jose", "passlib", "psycopg2", "asyncpg"]
+
+
+def profile(module: str, env: dict) -> list:
+    """
+    Returns (name, self_us, cumulative_us, depth) for every module imported by `import module`.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def summarize(runs: list, module: str, top: int) -> dict:
+    totals = []
+    package_times = defaultdict(list)
+    module_times = defaultdict(list)
+
+    for entries in runs:
+        totals.append(next(cumulative for name, _, cumulative, _ in entries if name == module))
+
+        by_package = defaultdict(int)
+        for name, self_us, cumulative, depth in entries:
+            by_package[name.split(".")[0]] += self_us
+            module_times[name].append(cumulative)
+        for package, self_us in by_package.items():
+            package_times[package].append(self_us)
+
+    def median_ms(values) -> float:
+        return round(statistics.median(values) / 1000, 2)
+
+    packages = sorted(package_times.items(), key=lambda item: -statistics.median(item[1]))
+    modules = sorted(
+        (item for item in module_times.items() if item[0] != module),
+        key=lambda item: -statistics.median(item[1])
+    )
+    loaded = {name for name, _, _, _ in runs[0]}
+
+    return {
+        "module": module,
+        "runs": len(runs),
+        "total_ms": median_ms(totals),
+        "packages": [{"package": name, "self_ms": median_ms(values)} for name, values in packages[:top]],
+        "modules": [{"module": name, "cumulative_ms": median_ms(values)} for name, values in modules[:top]],
+        "deferred_modules_loaded": [name for name in DEFERRED_MODULES if name in loaded]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "importtime-secret-key")
+
+    runs = [profile(args.module, env) for _ in range(args.runs)]
+    output = json.dumps(summarize(runs, args.module, args.top), indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Load test for the reservation API.
+
+Usage:
+    python -m bench.loadtest --users 20 --reservations 2000 --concurrency 10 --iterations 20
+    python -m bench.loadtest --base-url http://localhost:8000 --concurrency 50
+
+Seeds --users users (through tests.helpers.create_authenticated_user) and
+--reservations reservations, then runs --concurrency workers that each repeat
+the login -> create -> list -> update -> cancel flow --iterations times.
+
+Without --base-url the app runs in-process against DATABASE_URL (a fresh
+SQLite file by default; point it at a local Postgres to compare), with the
+tables recreated first. Prints a JSON report with req/s and p50/p95/p99
+latency per endpoint; save runs with --output to compare before and after.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./loadtest.db")
+os.environ.setdefault("SECRET_KEY", "loadtest-secret-key")
+
+import httpx
+
+from app.schemas import MAX_BATCH_SIZE, SpaceEnum
+from tests.helpers import create_authenticated_user, unique_email, unique_username
+
+SPACES = [space.value for space in SpaceEnum]
+SEED_FIRST_DAY = datetime(2031, 1, 1, tzinfo=timezone.utc)
+SEED_HOURS_PER_DAY = 8  # stays within the daily reservation limit
+LOAD_HOURS_PER_DAY = 12  # business hours, 08:00-20:00
+PASSWORD = "loadtest123"
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def slot(day: datetime, hour: int, minutes: int = 60):
+    start = day + timedelta(hours=8 + hour)
+    return start, start + timedelta(minutes=minutes)
+
+
+def seed(client, users: int, reservations: int):
+    """
+    Registers users and gives each an even share of one-hour reservations.
+
+    Users sharing a space are given disjoint day ranges, so nothing overlaps.
+    Returns the seeded accounts and the first day free for the load phase.
+    """
+
+    accounts = []
+    for index in range(users):
+        email = unique_email("load")
+        headers = create_authenticated_user(
+            client,
+            email=email,
+            username=unique_username("load"),
+            password=PASSWORD
+        )
+        accounts.append({"email": email, "headers": headers})
+
+    per_user = math.ceil(reservations / users) if users else 0
+    days_per_user = math.ceil(per_user / SEED_HOURS_PER_DAY)
+    remaining = reservations
+
+    for index, account in enumerate(accounts):
+        space_name = SPACES[index % len(SPACES)]
+        first_day = SEED_FIRST_DAY + timedelta(days=(index // len(SPACES)) * days_per_user)
+        items = []
+
+        for number in range(min(per_user, remaining)):
+            start, end = slot(first_day + timedelta(days=number // SEED_HOURS_PER_DAY), number % SEED_HOURS_PER_DAY)
+            items.append({
+                "space_name": space_name,
+                "start_datetime": start.isoformat(),
+                "end_datetime": end.isoformat()
+            })
+
+        remaining -= len(items)
+
+        for offset in range(0, len(items), MAX_BATCH_SIZE):
+            response = client.post(
+                "/reservations/batch",
+                headers=account["headers"],
+                json={"reservations": items[offset:offset + MAX_BATCH_SIZE]}
+            )
+            response.raise_for_status()
+
+    seeded_days = math.ceil(users / len(SPACES)) * days_per_user
+    return accounts, SEED_FIRST_DAY + timedelta(days=seeded_days + 1)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[label] = {
+                "requests": len(values),
+                "errors": self.errors[label],
+                "requests_per_second": round(len(values) / elapsed, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 3)
+            }
+
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "total_requests": total,
+            "requests_per_second": round(total / elapsed, 2),
+            "errors": sum(self.errors.values()),
+            "endpoints": endpoints
+        }
+
+
+async def run_flow(client: httpx.AsyncClient, recorder: Recorder, account: dict, start, end):
+    login = await recorder.request(client, "POST /login", "POST", "/login", data={
+        "username": account["email"],
+        "password": PASSWORD
+    })
+    if login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    created = await recorder.request(client, "POST /reservations", "POST", "/reservations", headers=headers, json={
+        "space_name": account["space_name"],
+        "start_datetime": start.isoformat(),
+        "end_datetime": end.isoformat()
+    })
+
+    await recorder.request(client, "GET /reservations", "GET", "/reservations", headers=headers)
+
+    if created.status_code != 201:
+        return
+    reservation_id = created.json()["id"]
+
+    await recorder.request(
+        client, "PUT /reservations/{reservation_id}", "PUT", f"/reservations/{reservation_id}",
+        headers=headers,
+        json={
+            "start_datetime": start.isoformat(),
+            "end_datetime": (start + timedelta(minutes=30)).isoformat()
+        }
+    )
+    await recorder.request(
+        client, "DELETE /reservations/{reservation_id}", "DELETE", f"/reservations/{reservation_id}",
+        headers=headers
+    )
+
+
+async def run_load(client: httpx.AsyncClient, accounts, first_day: datetime, concurrency: int, iterations: int) -> dict:
+    """
+    Runs the workers. Every flow books a distinct (space, day, hour) slot taken
+    from a shared counter, so flows never conflict with each other.
+    """
+
+    recorder = Recorder()
+    slots = itertools.count()
+
+    async def worker(index: int):
+        account = accounts[index % len(accounts)]
+        for _ in range(iterations):
+            number = next(slots)
+            day = first_day + timedelta(days=number // (len(SPACES) * LOAD_HOURS_PER_DAY))
+            start, end = slot(day, (number // len(SPACES)) % LOAD_HOURS_PER_DAY)
+            flow_account = dict(account, space_name=SPACES[number % len(SPACES)])
+            await run_flow(client, recorder, flow_account, start, end)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return recorder.report(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--reservations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=20, help="flows per worker")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    config["database"] = None if args.base_url else os.environ["DATABASE_URL"].split("@")[-1]
+
+    if args.base_url:
+        with httpx.Client(base_url=args.base_url, timeout=60) as client:
+            accounts, first_day = seed(client, args.users, args.reservations)
+
+        async def remote_load():
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+                return await run_load(client, accounts, first_day, args.concurrency, args.iterations)
+
+        report = asyncio.run(remote_load())
+    else:
+        from fastapi.testclient import TestClient
+
+        from app.database import Base, engine
+        from app.main import app
+
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+        # Seeding and load share the TestClient's event loop, so pooled async
+        # connections are never used from a different loop.
+        with TestClient(app) as client:
+            accounts, first_day = seed(client, args.users, args.reservations)
+
+            async def local_load():
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as async_client:
+                    return await run_load(async_client, accounts, first_day, args.concurrency, args.iterations)
+
+            report = client.portal.call(local_load)
+
+    report = {"config": config, **report}
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
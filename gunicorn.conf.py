@@ -0,0 +1,60 @@
+"""
+Production serving: gunicorn managing Uvicorn workers.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every setting can be overridden through the environment variables below.
+Each worker has its own connection pools, so the database must accept
+WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections from the API.
+"""
+
+import math
+import os
+
+
+def _cpu_count() -> int:
+    """
+    CPUs available to this container: the cgroup v2 CPU quota if one is set,
+    else the CPU affinity mask. os.cpu_count() alone reports the host's CPUs.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+# Uvicorn workers are async, so one per core is enough.
+workers = int(os.getenv("WEB_CONCURRENCY", str(_cpu_count())))
+
+# Import the app once in the master; workers fork with it already loaded.
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+# Heartbeat files on tmpfs: a slow overlay filesystem can get workers killed.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+# Workers warm their engines and caches before taking traffic; the other
+# workers keep serving while one restarts.
+raw_env = [f"WARM_UP_BEFORE_SERVING={os.getenv('WARM_UP_BEFORE_SERVING', 'true')}"]
+
+
+def post_fork(server, worker):
+    from app.database import reset_engines_after_fork
+
+    reset_engines_after_fork()
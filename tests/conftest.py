@@ -1,13 +1,20 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.database import Base, get_db
+from app.auth import token_cache
+from app.availability import availability_index
+from app.database import Base, get_db, get_async_db, get_async_session_factory
 from app.main import app
+from app.replica import recent_writers
+from app.user_cache import user_cache
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -21,6 +28,16 @@ TestingSessionLocal = sessionmaker(
 )
 
 
+# TestClient runs each request on its own event loop, so async connections
+# must not be pooled across requests.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False
+)
+
+
 def override_get_db():
     db = TestingSessionLocal()
     try:
@@ -29,13 +46,28 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+def override_get_async_session_factory():
+    return TestingAsyncSessionLocal
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_async_session_factory] = override_get_async_session_factory
 
 
 @pytest.fixture(autouse=True)
 def reset_database():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    availability_index.clear()
+    user_cache.clear()
+    token_cache.clear()
+    recent_writers.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
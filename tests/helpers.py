@@ -14,7 +14,8 @@ def create_authenticated_user(
     prefix: str = "test",
     email: str | None = None,
     username: str | None = None,
-    password: str = "testpass123"
+    password: str = "testpass123",
+    role: str = "user"
 ):
     email = email or unique_email(prefix)
     username = username or unique_username(prefix)
@@ -22,7 +23,8 @@ def create_authenticated_user(
     register_response = client.post("/register", json={
         "email": email,
         "username": username,
-        "password": password
+        "password": password,
+        "role": role
     })
 
     assert register_response.status_code == 201
@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.archive import archive_reservations, purge_day_rows
+from app.models import Reservation, ReservationArchive, SlotBitmap, User, UserDailyUsage
+from app.partitions import create_partitions, drop_empty_partitions
+from tests.conftest import TestingSessionLocal
+from tests.helpers import create_authenticated_user
+
+NOW = datetime(2030, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def add_reservation(db, user_id, start, status="active", updated_at=None):
+    reservation = Reservation(
+        user_id=user_id,
+        space_name="desk_1",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        status=status,
+        created_at=start - timedelta(days=30),
+        updated_at=updated_at
+    )
+    db.add(reservation)
+    db.flush()
+    return reservation.id
+
+
+def user_id_for(db):
+    return db.execute(select(User.id)).scalar_one()
+
+
+def test_archive_moves_old_and_cancelled_reservations(client):
+    create_authenticated_user(client, "archive")
+    db = TestingSessionLocal()
+    try:
+        user_id = user_id_for(db)
+        old = add_reservation(db, user_id, NOW - timedelta(days=400))
+        old_cancelled = add_reservation(
+            db, user_id, NOW + timedelta(days=10), status="cancelled", updated_at=NOW - timedelta(days=400)
+        )
+        recently_cancelled = add_reservation(
+            db, user_id, NOW + timedelta(days=10), status="cancelled", updated_at=NOW - timedelta(days=1)
+        )
+        future = add_reservation(db, user_id, NOW + timedelta(days=20))
+        db.commit()
+
+        assert archive_reservations(db, retention_days=365, now=NOW) == 2
+
+        remaining = db.execute(select(Reservation.id).order_by(Reservation.id)).scalars().all()
+        archived = db.execute(select(ReservationArchive).order_by(ReservationArchive.id)).scalars().all()
+        assert remaining == [recently_cancelled, future]
+        assert [row.id for row in archived] == [old, old_cancelled]
+        assert [row.status for row in archived] == ["active", "cancelled"]
+        assert all(row.archived_at is not None for row in archived)
+    finally:
+        db.close()
+
+
+def test_archive_runs_in_batches(client):
+    create_authenticated_user(client, "archive_batches")
+    db = TestingSessionLocal()
+    try:
+        user_id = user_id_for(db)
+        for day in range(5):
+            add_reservation(db, user_id, NOW - timedelta(days=400 + day))
+        db.commit()
+
+        assert archive_reservations(db, retention_days=365, batch_size=2, now=NOW) == 5
+        assert db.execute(select(Reservation.id)).first() is None
+        assert archive_reservations(db, retention_days=365, batch_size=2, now=NOW) == 0
+    finally:
+        db.close()
+
+
+def test_archive_changes_listing_etag(client):
+    headers = create_authenticated_user(client, "archive_etag")
+    db = TestingSessionLocal()
+    try:
+        add_reservation(db, user_id_for(db), NOW - timedelta(days=400))
+        db.commit()
+        etag = client.get("/reservations", headers=headers).headers["ETag"]
+
+        archive_reservations(db, retention_days=365, now=NOW)
+    finally:
+        db.close()
+
+    response = client.get("/reservations", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_purge_day_rows_deletes_bitmaps_and_usage_before_the_cutoff(client):
+    create_authenticated_user(client, "archive_day_rows")
+    db = TestingSessionLocal()
+    try:
+        user_id = user_id_for(db)
+        cutoff = date(2030, 6, 1)
+        for day in (cutoff - timedelta(days=2), cutoff - timedelta(days=1), cutoff):
+            db.add(SlotBitmap(scope="space", owner="desk_1", day=day, bits=b"\x01"))
+            db.add(SlotBitmap(scope="user", owner=str(user_id), day=day, bits=b"\x01"))
+            db.add(UserDailyUsage(user_id=user_id, day=day, minutes=60))
+        db.commit()
+
+        assert purge_day_rows(db, before=cutoff, batch_size=1) == 6
+        assert db.execute(select(SlotBitmap.day).distinct()).scalars().all() == [cutoff]
+        assert db.execute(select(UserDailyUsage.day)).scalars().all() == [cutoff]
+        assert purge_day_rows(db, before=cutoff) == 0
+    finally:
+        db.close()
+
+
+def test_partition_maintenance_is_a_no_op_on_sqlite():
+    db = TestingSessionLocal()
+    try:
+        assert create_partitions(db) == []
+        assert drop_empty_partitions(db, date(2030, 1, 1)) == []
+    finally:
+        db.close()
@@ -1,3 +1,12 @@
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import security
+from app.auth import create_access_token, token_cache, verify_access_token
 from tests.helpers import unique_email, unique_username
 
 
@@ -68,4 +77,49 @@ def test_protected_endpoint(client):
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == email
-    assert data["username"] == username
\ No newline at end of file
+    assert data["username"] == username
+
+
+def test_login_returns_503_when_hashing_pool_is_saturated(client, monkeypatch):
+    email = unique_email()
+
+    client.post("/register", json={
+        "email": email,
+        "username": unique_username("busy"),
+        "password": "busypass123"
+    })
+
+    monkeypatch.setattr(security, "_hashing_slots", threading.Semaphore(0))
+
+    response = client.post("/login", data={
+        "username": email,
+        "password": "busypass123"
+    })
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(security.HASHING_RETRY_AFTER_SECONDS)
+
+
+def _token_user():
+    return SimpleNamespace(id=1, email="cache@example.com", role="user", username="cache")
+
+
+def test_verified_token_is_served_from_cache():
+    token = create_access_token(_token_user())
+
+    first = verify_access_token(token)
+    second = verify_access_token(token)
+
+    assert first == second
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["size"] == 1
+
+
+def test_expired_token_is_not_cached():
+    token = create_access_token(_token_user(), expires_delta=timedelta(seconds=-1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        verify_access_token(token)
+
+    assert exc_info.value.status_code == 401
+    assert token_cache.stats()["size"] == 0
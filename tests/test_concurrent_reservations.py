@@ -0,0 +1,194 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import and_, select
+from sqlalchemy.orm import aliased
+
+from app import crud
+from app.models import Reservation, UserDailyUsage
+from app.schemas import ReservationCreate, UserCreate
+from app.slots import USER_SCOPE, load_slot_bitmaps, lock_order, reserved_minutes
+from tests.conftest import TestingSessionLocal
+
+START = datetime(2030, 12, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def _create_users(count):
+    db = TestingSessionLocal()
+    try:
+        return [
+            crud.create_user(
+                db,
+                UserCreate(email=f"racer{index}@example.com", username=f"racer{index}", password="x"),
+                hashed_password="x"
+            ).id
+            for index in range(count)
+        ]
+    finally:
+        db.close()
+
+
+def _at_once(actions):
+    """
+    Runs the actions at once, one thread and session each. An action takes
+    the session and returns its success status code; failures are the status
+    code of the HTTPException it raised.
+    """
+
+    barrier = threading.Barrier(len(actions))
+    outcomes = []
+
+    def run(action):
+        db = TestingSessionLocal()
+        try:
+            barrier.wait()
+            outcomes.append(action(db))
+        except HTTPException as error:
+            outcomes.append(error.status_code)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sorted(outcomes)
+
+
+def _create_reservation(db, user_id, space_name, start):
+    return crud.create_reservation(
+        db,
+        ReservationCreate(space_name=space_name, start_datetime=start, end_datetime=start + timedelta(hours=1)),
+        user_id
+    )
+
+
+def _create(user_id, space_name, start):
+    def action(db):
+        _create_reservation(db, user_id, space_name, start)
+        return 201
+    return action
+
+
+def _cancel(user_id, reservation_id):
+    def action(db):
+        crud.delete_reservation(db, reservation_id, user_id)
+        return 200
+    return action
+
+
+def _race(attempts):
+    """
+    Runs (user_id, space_name, start) create attempts at once.
+    """
+
+    return _at_once([_create(*attempt) for attempt in attempts])
+
+
+def _ledger_and_bitmap_minutes(user_id, day):
+    db = TestingSessionLocal()
+    try:
+        ledger = db.query(UserDailyUsage.minutes).filter(
+            UserDailyUsage.user_id == user_id,
+            UserDailyUsage.day == day
+        ).scalar()
+        bitmaps = load_slot_bitmaps(db, [(USER_SCOPE, str(user_id), day)])
+        return ledger, reserved_minutes(bitmaps[(USER_SCOPE, str(user_id), day)])
+    finally:
+        db.close()
+
+
+def _overlapping_pairs(column):
+    other = aliased(Reservation)
+    db = TestingSessionLocal()
+    try:
+        return db.execute(
+            select(Reservation.id, other.id).join(other, and_(
+                getattr(Reservation, column) == getattr(other, column),
+                Reservation.id < other.id,
+                Reservation.start_datetime < other.end_datetime,
+                other.start_datetime < Reservation.end_datetime,
+                Reservation.status == "active",
+                other.status == "active"
+            ))
+        ).all()
+    finally:
+        db.close()
+
+
+def test_concurrent_creates_for_the_same_slot_book_it_once():
+    user_ids = _create_users(8)
+
+    outcomes = _race([(user_id, "meeting_room_b", START) for user_id in user_ids])
+
+    assert outcomes == [201] + [409] * 7
+    assert _overlapping_pairs("space_name") == []
+
+
+def test_concurrent_creates_for_one_user_respect_user_overlap():
+    [user_id] = _create_users(1)
+    spaces = ["desk_1", "desk_2", "desk_3", "meeting_room_a"]
+
+    outcomes = _race([(user_id, space_name, START) for space_name in spaces])
+
+    assert outcomes == [201, 409, 409, 409]
+    assert _overlapping_pairs("user_id") == []
+
+
+def test_concurrent_creates_for_different_spaces_all_succeed():
+    user_ids = _create_users(6)
+    spaces = ["desk_1", "desk_2", "desk_3", "meeting_room_a", "meeting_room_b", "conference_hall"]
+
+    outcomes = _race([
+        (user_id, space_name, START + timedelta(days=index))
+        for index, (user_id, space_name) in enumerate(zip(user_ids, spaces))
+    ])
+
+    assert outcomes == [201] * 6
+
+
+def test_concurrent_create_and_cancel_for_one_user_and_day_keep_the_ledger_exact():
+    [user_id] = _create_users(1)
+    db = TestingSessionLocal()
+    try:
+        existing = [_create_reservation(db, user_id, "desk_1", START + timedelta(hours=hour)).id for hour in (0, 1, 2)]
+    finally:
+        db.close()
+
+    outcomes = _at_once(
+        [_cancel(user_id, reservation_id) for reservation_id in existing]
+        + [_create(user_id, "desk_2", START + timedelta(hours=hour)) for hour in (4, 5, 6)]
+    )
+
+    assert outcomes == [200] * 3 + [201] * 3
+    assert _ledger_and_bitmap_minutes(user_id, START.date()) == (180, 180)
+
+
+def test_concurrent_cancels_of_one_reservation_release_it_once():
+    [user_id] = _create_users(1)
+    db = TestingSessionLocal()
+    try:
+        _create_reservation(db, user_id, "desk_1", START + timedelta(hours=2))
+        reservation_id = _create_reservation(db, user_id, "desk_1", START).id
+    finally:
+        db.close()
+
+    outcomes = _at_once([_cancel(user_id, reservation_id) for _ in range(4)])
+
+    assert outcomes == [200] * 4
+    assert _ledger_and_bitmap_minutes(user_id, START.date()) == (60, 60)
+
+
+def test_lock_order_sorts_by_day_first():
+    day_one = START.date()
+    day_two = day_one + timedelta(days=1)
+    keys = [("user", "1", day_two), ("space", "desk_1", day_two), ("user", "1", day_one)]
+
+    assert sorted(keys, key=lock_order) == [
+        ("user", "1", day_one),
+        ("space", "desk_1", day_two),
+        ("user", "1", day_two)
+    ]
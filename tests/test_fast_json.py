@@ -0,0 +1,38 @@
+from app import main
+from tests.helpers import create_authenticated_user
+
+
+def test_fast_json_listing_matches_the_pydantic_listing(client, monkeypatch):
+    headers = create_authenticated_user(client, "fastjson")
+    for day in (3, 4, 5):
+        client.post(
+            "/reservations",
+            headers=headers,
+            json={
+                "space_name": "desk_1",
+                "start_datetime": f"2031-02-0{day}T08:00:00Z",
+                "end_datetime": f"2031-02-0{day}T09:30:00Z"
+            }
+        )
+
+    regular = client.get("/reservations?limit=2", headers=headers)
+
+    monkeypatch.setattr(main, "FAST_JSON_RESPONSES", True)
+    fast = client.get("/reservations?limit=2", headers=headers)
+
+    assert fast.status_code == 200
+    assert fast.json() == regular.json()
+    assert fast.headers["ETag"] == regular.headers["ETag"]
+    assert fast.headers["X-Next-Cursor"] == regular.headers["X-Next-Cursor"]
+    assert fast.headers["content-type"] == "application/json"
+
+
+def test_listing_keeps_its_openapi_response_schema(client):
+    schema = client.get("/openapi.json").json()
+    listing = schema["paths"]["/reservations"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert listing == {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/ReservationResponse"},
+        "title": "Response Get My Reservations Reservations Get"
+    }
@@ -0,0 +1,180 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.idempotency import IDEMPOTENCY_LOCK_SECONDS, _claim_key, purge_expired_keys, request_fingerprint
+from app.models import IdempotencyKey, Reservation
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+from tests.helpers import create_authenticated_user
+
+RESERVATION = {
+    "space_name": "desk_2",
+    "start_datetime": "2030-12-09T08:00:00Z",
+    "end_datetime": "2030-12-09T09:00:00Z"
+}
+
+
+def _reservation_count():
+    db = TestingSessionLocal()
+    try:
+        return db.query(Reservation).count()
+    finally:
+        db.close()
+
+
+def test_retry_with_same_key_replays_the_stored_response(client):
+    headers = {**create_authenticated_user(client, "retry"), "Idempotency-Key": "create-1"}
+
+    first = client.post("/reservations", headers=headers, json=RESERVATION)
+    retry = client.post("/reservations", headers=headers, json=RESERVATION)
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert _reservation_count() == 1
+
+
+def test_key_reused_with_a_different_body_is_rejected(client):
+    headers = {**create_authenticated_user(client, "reuse"), "Idempotency-Key": "create-2"}
+
+    client.post("/reservations", headers=headers, json=RESERVATION)
+    response = client.post("/reservations", headers=headers, json={**RESERVATION, "space_name": "desk_3"})
+
+    assert response.status_code == 422
+    assert _reservation_count() == 1
+
+
+def test_failed_request_releases_the_key(client):
+    headers = {**create_authenticated_user(client, "failed"), "Idempotency-Key": "create-3"}
+    invalid = {**RESERVATION, "end_datetime": "2030-12-09T07:00:00Z"}
+
+    assert client.post("/reservations", headers=headers, json=invalid).status_code == 400
+    assert client.post("/reservations", headers=headers, json=invalid).status_code == 400
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(IdempotencyKey).count() == 0
+    finally:
+        db.close()
+
+
+def _leave_in_progress(key, locked_at, request_hash=None):
+    """
+    Records key as claimed at locked_at by a request that never finished.
+    """
+    body = json.dumps(RESERVATION).encode()
+    db = TestingSessionLocal()
+    try:
+        db.add(IdempotencyKey(
+            user_id=1,
+            key=key,
+            request_hash=request_hash or request_fingerprint("POST", "/reservations", "", body),
+            expires_at=locked_at + timedelta(days=1),
+            locked_at=locked_at
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return body
+
+
+def test_key_left_in_progress_is_taken_over_after_the_lock_expires(client):
+    headers = {**create_authenticated_user(client, "stale"), "Idempotency-Key": "create-4",
+               "Content-Type": "application/json"}
+    stale = datetime.now(timezone.utc) - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS + 1)
+    body = _leave_in_progress("create-4", stale)
+
+    response = client.post("/reservations", headers=headers, content=body)
+    retry = client.post("/reservations", headers=headers, content=body)
+
+    assert response.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert _reservation_count() == 1
+
+
+def test_key_in_progress_within_the_lock_is_not_taken_over(client):
+    headers = {**create_authenticated_user(client, "busy"), "Idempotency-Key": "create-5",
+               "Content-Type": "application/json"}
+    body = _leave_in_progress("create-5", datetime.now(timezone.utc))
+
+    response = client.post("/reservations", headers=headers, content=body)
+
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert _reservation_count() == 0
+
+
+def test_expired_key_is_taken_over_by_one_retry_only(client):
+    create_authenticated_user(client, "expired")
+    now = datetime.now(timezone.utc)
+    _leave_in_progress("create-6", now - timedelta(days=2), request_hash="old")
+
+    async def claim_twice():
+        async with TestingAsyncSessionLocal() as first, TestingAsyncSessionLocal() as second:
+            return [
+                await _claim_key(first, 1, "create-6", "new", now),
+                await _claim_key(second, 1, "create-6", "new", now)
+            ]
+
+    taken, existing = asyncio.run(claim_twice())
+
+    assert taken is None
+    assert existing.request_hash == "new"
+    assert existing.status_code is None
+
+
+def test_purge_deletes_only_expired_keys_in_batches(client):
+    create_authenticated_user(client, "purge")
+    now = datetime.now(timezone.utc)
+
+    db = TestingSessionLocal()
+    try:
+        db.add_all([
+            IdempotencyKey(user_id=1, key=f"old-{index}", request_hash="x", expires_at=now - timedelta(minutes=1))
+            for index in range(5)
+        ] + [
+            IdempotencyKey(user_id=1, key="fresh", request_hash="x", expires_at=now + timedelta(hours=1))
+        ])
+        db.commit()
+
+        assert purge_expired_keys(db, batch_size=2) == 5
+        assert [row.key for row in db.query(IdempotencyKey)] == ["fresh"]
+    finally:
+        db.close()
+
+
+def test_claim_reraises_integrity_errors_other_than_the_duplicate_key(client):
+    create_authenticated_user(client, "deleted_user")
+
+    async def claim_for_missing_user():
+        async with TestingAsyncSessionLocal() as db:
+            await db.execute(text("PRAGMA foreign_keys = ON"))
+            await _claim_key(db, 999, "create-8", "hash", datetime.now(timezone.utc))
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(claim_for_missing_user())
+
+
+def test_claim_gives_up_after_a_few_attempts(client, monkeypatch):
+    create_authenticated_user(client, "purged")
+    now = datetime.now(timezone.utc)
+    _leave_in_progress("create-9", now)
+
+    async def get_purged(*args, **kwargs):
+        return None
+
+    async def claim():
+        async with TestingAsyncSessionLocal() as db:
+            monkeypatch.setattr(db, "get", get_purged)
+            await _claim_key(db, 1, "create-9", "hash", now)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(claim())
+
+    assert exc_info.value.status_code == 409
@@ -0,0 +1,49 @@
+from app.metrics import Histogram
+from tests.helpers import create_authenticated_user
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), (0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5.0)
+
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_metrics_endpoint_reports_routes_validators_and_queries(client):
+    headers = create_authenticated_user(client, "metrics")
+
+    response = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-10-01T08:00:00Z",
+            "end_datetime": "2030-10-01T09:00:00Z"
+        }
+    )
+    assert response.status_code == 201
+    client.get(f"/reservations/{response.json()['id']}", headers=headers)
+
+    metrics = client.get("/metrics")
+
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    body = metrics.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/reservations",status="201"}' in body
+    assert 'route="/reservations/{reservation_id}",status="200"' in body
+    assert 'app_function_duration_seconds_count{kind="validator",function="validate_reservation_time"}' in body
+    assert 'app_function_duration_seconds_count{kind="crud",function="create_reservation"}' in body
+    assert 'app_function_duration_seconds_count{kind="security",function="verify_password"}' in body
+    assert 'http_request_db_queries_count{method="POST",route="/reservations"}' in body
+    assert '# TYPE cache_hits_total counter' in body
+    assert 'cache_hits_total{cache="user"}' in body
+    assert '# TYPE db_pool_checkouts_total counter' in body
+    assert 'db_pool_checkouts_total{engine="async"}' in body
+    assert '# TYPE db_pool_checkedout gauge' in body
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from app.pool import PoolMetrics, instrument_engine, instrumented_pool_class
+from tests.helpers import create_authenticated_user
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts():
+    metrics = PoolMetrics()
+    engine = create_engine(
+        "sqlite://",
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01
+    )
+    instrument_engine(engine, metrics)
+
+    connection = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    connection.close()
+
+    stats = metrics.snapshot(engine.pool)
+    assert stats["checkouts"] == 1
+    assert stats["checkins"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.01
+    assert stats["size"] == 1
+    assert stats["checkedout"] == 0
+
+
+def test_pool_diagnostics_requires_admin(client):
+    credentials = {
+        role: create_authenticated_user(client, role, role=role)
+        for role in ("user", "admin")
+    }
+
+    assert client.get("/admin/diagnostics/pool", headers=credentials["user"]).status_code == 403
+
+    response = client.get("/admin/diagnostics/pool", headers=credentials["admin"])
+    assert response.status_code == 200
+    assert set(response.json()) == {"settings", "sync", "async"}
@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.availability import availability_index
+from app.validators import validate_daily_reservation_limit
+from tests.conftest import TestingSessionLocal, async_engine, engine
+from tests.helpers import create_authenticated_user
+
+START = datetime(2030, 12, 16, 10, 0, tzinfo=timezone.utc)
+END = START + timedelta(hours=1)
+USER_START_INDEXES = ("ix_reservations_active_user_start", "ix_reservations_user_start")
+
+
+@contextmanager
+def query_plans():
+    """
+    Collects the SQLite query plan of every SELECT on reservations run inside
+    the block, by the sync or the async engine, one string per statement.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM reservations" in statement:
+            statements.append((statement, parameters))
+
+    plans = []
+    engines = (engine, async_engine.sync_engine)
+    for listened in engines:
+        event.listen(listened, "before_cursor_execute", capture)
+    try:
+        yield plans
+    finally:
+        for listened in engines:
+            event.remove(listened, "before_cursor_execute", capture)
+
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append("; ".join(row[3] for row in rows))
+
+
+def run(function, *args, **kwargs):
+    db = TestingSessionLocal()
+    try:
+        return function(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def book(client, headers, hours):
+    for hour in hours:
+        response = client.post("/reservations", headers=headers, json={
+            "space_name": "desk_1",
+            "start_datetime": (START + timedelta(hours=hour)).isoformat(),
+            "end_datetime": (START + timedelta(hours=hour, minutes=30)).isoformat()
+        })
+        assert response.status_code == 201
+
+
+def test_daily_limit_on_update_reads_the_current_reservation_by_primary_key():
+    with query_plans() as plans:
+        run(validate_daily_reservation_limit, 1, START, END, reservation_id=1)
+
+    assert plans == ["SEARCH reservations USING INTEGER PRIMARY KEY (rowid=?)"]
+
+
+def test_availability_searches_the_space_partial_index():
+    with query_plans() as plans:
+        run(availability_index.busy_intervals, "desk_1", START.date())
+
+    assert plans == [
+        "SEARCH reservations USING INDEX ix_reservations_active_space_start "
+        "(space_name=? AND start_datetime>? AND start_datetime<?)"
+    ]
+
+
+def test_listing_pages_search_a_user_start_index_in_order(client):
+    headers = create_authenticated_user(client, "plans")
+    book(client, headers, [0, 1, 2])
+
+    with query_plans() as plans:
+        first = client.get("/reservations", headers=headers, params={"limit": 2})
+        client.get("/reservations", headers=headers, params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+    # Under LIMIT, SQLite costs the partial and the full (user_id, start_datetime, id)
+    # index alike and picks by creation order, which follows the hash seed.
+    # No "USE TEMP B-TREE FOR ORDER BY" either way: both yield (start, id) order.
+    assert len(plans) == 2
+    assert plans[0] in [f"SEARCH reservations USING INDEX {index} (user_id=?)" for index in USER_START_INDEXES]
+    assert plans[1] in [
+        f"SEARCH reservations USING INDEX {index} (user_id=? AND start_datetime>?)" for index in USER_START_INDEXES
+    ]
+
+
+def test_listing_with_cancelled_reads_the_user_index_in_order(client):
+    headers = create_authenticated_user(client, "plans_cancelled")
+    book(client, headers, [0])
+
+    with query_plans() as plans:
+        client.get("/reservations", headers=headers, params={"include_cancelled": True})
+
+    assert plans == ["SEARCH reservations USING INDEX ix_reservations_user_start (user_id=?)"]
+
+
+def test_cancels_spell_the_active_predicate_as_a_literal(client):
+    headers = create_authenticated_user(client, "plans_series")
+    book(client, headers, [0])
+    series = client.post("/reservations/series", headers=headers, json={
+        "space_name": "desk_2",
+        "start_datetime": (START + timedelta(days=1)).isoformat(),
+        "end_datetime": (END + timedelta(days=1)).isoformat(),
+        "frequency": "daily",
+        "count": 2
+    })
+    assert series.status_code == 201
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE reservations"):
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        reservation_id = client.get("/reservations", headers=headers).json()[0]["id"]
+        assert client.delete(f"/reservations/{reservation_id}", headers=headers).status_code == 200
+        assert client.delete(f"/reservations/series/{series.json()['id']}", headers=headers).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 2
+    assert all("reservations.status = 'active'" in statement for statement in statements)
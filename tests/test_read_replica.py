@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import Base, get_replica_session_factory
+from app.main import app
+from app.models import Reservation, User
+from app.replica import recent_writers
+from tests.conftest import engine as primary_engine
+from tests.helpers import create_authenticated_user
+
+RESERVATION = {
+    "space_name": "conference_hall",
+    "start_datetime": "2030-12-16T10:00:00Z",
+    "end_datetime": "2030-12-16T11:00:00Z"
+}
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    url = f"sqlite:///{tmp_path}/replica.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1), poolclass=NullPool)
+    app.dependency_overrides[get_replica_session_factory] = lambda: async_sessionmaker(async_engine, autoflush=False)
+    yield engine
+
+    del app.dependency_overrides[get_replica_session_factory]
+    engine.dispose()
+
+
+def replicate(replica_engine):
+    """
+    Copies users and reservations from the primary, like a caught-up replica.
+    """
+    with primary_engine.connect() as primary, replica_engine.begin() as replica:
+        for table in (User.__table__, Reservation.__table__):
+            replica.execute(table.delete())
+            rows = [dict(row._mapping) for row in primary.execute(select(table))]
+            if rows:
+                replica.execute(insert(table), rows)
+
+
+def listed_spaces(client, headers):
+    return [reservation["space_name"] for reservation in client.get("/reservations", headers=headers).json()]
+
+
+def test_caught_up_replica_serves_reads(client, replica_engine):
+    headers = create_authenticated_user(client, "replica")
+    reservation_id = client.post("/reservations", headers=headers, json=RESERVATION).json()["id"]
+    replicate(replica_engine)
+    recent_writers.clear()
+
+    # Only the replica's copy says desk_1.
+    with replica_engine.begin() as replica:
+        replica.execute(update(Reservation).values(space_name="desk_1"))
+
+    assert listed_spaces(client, headers) == ["desk_1"]
+    assert client.get(f"/reservations/{reservation_id}", headers=headers).json()["space_name"] == "desk_1"
+    assert client.get("/me", headers=headers).json()["reservations"][0]["space_name"] == "desk_1"
+
+
+def test_own_writes_are_read_from_the_primary(client, replica_engine):
+    headers = create_authenticated_user(client, "replicasticky")
+    replicate(replica_engine)
+
+    client.post("/reservations", headers=headers, json=RESERVATION)
+
+    # Within the sticky window, the stale replica is not consulted.
+    assert listed_spaces(client, headers) == ["conference_hall"]
+
+    # Another worker would not know about the write; the version check catches the lag.
+    recent_writers.clear()
+    assert listed_spaces(client, headers) == ["conference_hall"]
+
+
+def test_replica_missing_the_user_falls_back_to_the_primary(client, replica_engine):
+    headers = create_authenticated_user(client, "replicalag")
+
+    response = client.get("/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["reservations"] == []
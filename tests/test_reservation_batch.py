@@ -0,0 +1,145 @@
+from tests.helpers import create_authenticated_user
+
+
+def test_create_reservation_batch(client):
+    headers = create_authenticated_user(client, "batch")
+
+    response = client.post(
+        "/reservations/batch",
+        headers=headers,
+        json={
+            "reservations": [
+                {
+                    "space_name": "meeting_room_a",
+                    "start_datetime": "2030-08-01T08:00:00Z",
+                    "end_datetime": "2030-08-01T10:00:00Z"
+                },
+                {
+                    "space_name": "meeting_room_a",
+                    "start_datetime": "2030-08-02T08:00:00Z",
+                    "end_datetime": "2030-08-02T10:00:00Z"
+                }
+            ]
+        }
+    )
+
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [201, 201]
+    assert results[0]["reservation"]["start_datetime"].startswith("2030-08-01T08:00:00")
+    assert results[1]["reservation"]["status"] == "active"
+
+    listed = client.get("/reservations", headers=headers)
+    assert len(listed.json()) == 2
+
+
+def test_atomic_batch_rejects_intra_batch_conflicts(client):
+    headers = create_authenticated_user(client, "atomic")
+
+    response = client.post(
+        "/reservations/batch",
+        headers=headers,
+        json={
+            "reservations": [
+                {
+                    "space_name": "desk_1",
+                    "start_datetime": "2030-08-03T08:00:00Z",
+                    "end_datetime": "2030-08-03T10:00:00Z"
+                },
+                {
+                    "space_name": "desk_2",
+                    "start_datetime": "2030-08-03T09:00:00Z",
+                    "end_datetime": "2030-08-03T11:00:00Z"
+                }
+            ]
+        }
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == [
+        {
+            "index": 1,
+            "status_code": 409,
+            "detail": "User already has another reservation during the selected time range."
+        }
+    ]
+
+    listed = client.get("/reservations", headers=headers)
+    assert listed.json() == []
+
+
+def test_non_atomic_batch_reports_per_item_results(client):
+    headers = create_authenticated_user(client, "peritem")
+    other_headers = create_authenticated_user(client, "peritem2")
+
+    existing = client.post(
+        "/reservations",
+        headers=other_headers,
+        json={
+            "space_name": "conference_hall",
+            "start_datetime": "2030-08-04T08:00:00Z",
+            "end_datetime": "2030-08-04T12:00:00Z"
+        }
+    )
+
+    assert existing.status_code == 201
+
+    response = client.post(
+        "/reservations/batch",
+        headers=headers,
+        json={
+            "atomic": False,
+            "reservations": [
+                {
+                    "space_name": "conference_hall",
+                    "start_datetime": "2030-08-04T11:00:00Z",
+                    "end_datetime": "2030-08-04T13:00:00Z"
+                },
+                {
+                    "space_name": "conference_hall",
+                    "start_datetime": "2030-08-04T12:00:00Z",
+                    "end_datetime": "2030-08-04T16:00:00Z"
+                },
+                {
+                    "space_name": "desk_3",
+                    "start_datetime": "2030-08-04T16:00:00Z",
+                    "end_datetime": "2030-08-04T20:00:00Z"
+                },
+                {
+                    "space_name": "desk_3",
+                    "start_datetime": "2030-08-04T07:00:00Z",
+                    "end_datetime": "2030-08-04T08:00:00Z"
+                }
+            ]
+        }
+    )
+
+    assert response.status_code == 207
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [409, 201, 201, 400]
+    assert results[0]["detail"] == "This space is already reserved during the selected time range."
+    assert results[3]["detail"] == "Reservations cannot start before 08:00."
+
+    listed = client.get("/reservations", headers=headers)
+    assert len(listed.json()) == 2
+
+
+def test_batch_for_other_users_requires_admin(client):
+    headers = create_authenticated_user(client, "notadmin")
+
+    response = client.post(
+        "/reservations/batch",
+        headers=headers,
+        json={
+            "reservations": [
+                {
+                    "user_id": 999,
+                    "space_name": "desk_1",
+                    "start_datetime": "2030-08-05T08:00:00Z",
+                    "end_datetime": "2030-08-05T10:00:00Z"
+                }
+            ]
+        }
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,62 @@
+from tests.helpers import create_authenticated_user
+
+RESERVATION = {
+    "space_name": "conference_hall",
+    "start_datetime": "2030-12-16T10:00:00Z",
+    "end_datetime": "2030-12-16T11:00:00Z"
+}
+
+
+def test_unchanged_reservations_return_304(client):
+    headers = create_authenticated_user(client, "etag")
+    reservation_id = client.post("/reservations", headers=headers, json=RESERVATION).json()["id"]
+
+    listed = client.get("/reservations", headers=headers)
+    single = client.get(f"/reservations/{reservation_id}", headers=headers)
+
+    assert listed.headers["ETag"] != single.headers["ETag"]
+
+    not_modified = client.get("/reservations", headers={**headers, "If-None-Match": listed.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    not_modified = client.get(
+        f"/reservations/{reservation_id}",
+        headers={**headers, "If-None-Match": single.headers["ETag"]}
+    )
+    assert not_modified.status_code == 304
+
+
+def test_reservation_writes_change_the_etag(client):
+    headers = create_authenticated_user(client, "etagwrite")
+    reservation_id = client.post("/reservations", headers=headers, json=RESERVATION).json()["id"]
+    etag = client.get("/reservations", headers=headers).headers["ETag"]
+
+    client.put(
+        f"/reservations/{reservation_id}",
+        headers=headers,
+        json={"start_datetime": "2030-12-16T12:00:00Z", "end_datetime": "2030-12-16T13:00:00Z"}
+    )
+
+    response = client.get("/reservations", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["start_datetime"].startswith("2030-12-16T12:00:00")
+
+    etag = response.headers["ETag"]
+    client.delete(f"/reservations/{reservation_id}", headers=headers)
+
+    assert client.get("/reservations", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_etag_depends_on_query_parameters(client):
+    headers = create_authenticated_user(client, "etagquery")
+    client.post("/reservations", headers=headers, json=RESERVATION)
+
+    all_etag = client.get("/reservations", headers=headers).headers["ETag"]
+    response = client.get(
+        "/reservations?include_cancelled=true",
+        headers={**headers, "If-None-Match": all_etag}
+    )
+
+    assert response.status_code == 200
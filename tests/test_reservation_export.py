@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from tests.helpers import create_authenticated_user
+
+
+def _create_reservations(client, headers, space_name, days):
+    for day in days:
+        response = client.post(
+            "/reservations",
+            headers=headers,
+            json={
+                "space_name": space_name,
+                "start_datetime": f"2030-09-{day:02d}T08:00:00Z",
+                "end_datetime": f"2030-09-{day:02d}T09:00:00Z"
+            }
+        )
+        assert response.status_code == 201
+
+
+def test_export_my_reservations_as_ndjson(client):
+    headers = create_authenticated_user(client, "exporter")
+    other_headers = create_authenticated_user(client, "other")
+    _create_reservations(client, headers, "desk_1", [3, 2])
+    _create_reservations(client, other_headers, "desk_2", [2])
+
+    response = client.get("/reservations/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["start_datetime"] for row in rows] == [
+        "2030-09-02T08:00:00Z",
+        "2030-09-03T08:00:00Z"
+    ]
+    assert {row["space_name"] for row in rows} == {"desk_1"}
+
+
+def test_export_my_reservations_as_csv(client):
+    headers = create_authenticated_user(client, "csvexport")
+    _create_reservations(client, headers, "desk_3", [4, 5])
+
+    response = client.get("/reservations/export?format=csv", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert rows[0]["space_name"] == "desk_3"
+    assert rows[0]["status"] == "active"
+
+
+def test_admin_export_covers_all_users(client):
+    headers = create_authenticated_user(client, "plain")
+    _create_reservations(client, headers, "desk_1", [6])
+    _create_reservations(client, create_authenticated_user(client, "second"), "desk_2", [6])
+
+    forbidden = client.get("/admin/reservations/export", headers=headers)
+    assert forbidden.status_code == 403
+
+    response = client.get("/admin/reservations/export", headers=create_authenticated_user(client, "admin", role="admin"))
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 2
@@ -1,3 +1,8 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.validators import raise_for_overlap_violation
 from tests.helpers import create_authenticated_user
 
 
@@ -193,4 +198,188 @@ def test_cancelled_reservations_do_not_count_toward_daily_limit(client):
         }
     )
 
-    assert second.status_code == 201
\ No newline at end of file
+    assert second.status_code == 201
+
+
+def test_space_exclusion_violation_maps_to_conflict():
+    error = IntegrityError(
+        "INSERT INTO reservations",
+        {},
+        Exception(
+            'conflicting key value violates exclusion constraint '
+            '"reservations_no_space_overlap"'
+        )
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        raise_for_overlap_violation(error)
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == (
+        "This space is already reserved during the selected time range."
+    )
+
+
+def test_user_exclusion_violation_maps_to_conflict():
+    error = IntegrityError(
+        "INSERT INTO reservations",
+        {},
+        Exception(
+            'conflicting key value violates exclusion constraint '
+            '"reservations_no_user_overlap"'
+        )
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        raise_for_overlap_violation(error)
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == (
+        "User already has another reservation during the selected time range."
+    )
+
+
+def test_unrelated_integrity_errors_are_reraised():
+    error = IntegrityError(
+        "INSERT INTO reservations",
+        {},
+        Exception("null value in column \"user_id\"")
+    )
+
+    with pytest.raises(IntegrityError):
+        raise_for_overlap_violation(error)
+
+
+def test_updated_reservation_is_not_double_counted_toward_daily_limit(client):
+    headers = create_authenticated_user(client, prefix="ledger")
+
+    first = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-07-01T08:00:00Z",
+            "end_datetime": "2030-07-01T12:00:00Z"
+        }
+    )
+
+    assert first.status_code == 201
+
+    second = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-07-01T13:00:00Z",
+            "end_datetime": "2030-07-01T17:00:00Z"
+        }
+    )
+
+    assert second.status_code == 201
+
+    update = client.put(
+        f"/reservations/{first.json()['id']}",
+        headers=headers,
+        json={
+            "start_datetime": "2030-07-01T09:00:00Z",
+            "end_datetime": "2030-07-01T12:00:00Z"
+        }
+    )
+
+    assert update.status_code == 200
+
+    third = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-07-01T17:00:00Z",
+            "end_datetime": "2030-07-01T18:00:00Z"
+        }
+    )
+
+    assert third.status_code == 201
+
+    fourth = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-07-01T18:00:00Z",
+            "end_datetime": "2030-07-01T18:30:00Z"
+        }
+    )
+
+    assert fourth.status_code == 409
+
+
+def test_daily_limit_counts_the_calendar_day_in_the_request_offset(client):
+    headers = create_authenticated_user(client, prefix="offset_day")
+
+    first = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-07-02T08:00:00-05:00",
+            "end_datetime": "2030-07-02T16:00:00-05:00"
+        }
+    )
+
+    assert first.status_code == 201
+
+    # 00:00-01:00 UTC on July 3rd, but still July 2nd for this client.
+    same_local_day = {
+        "space_name": "desk_1",
+        "start_datetime": "2030-07-02T19:00:00-05:00",
+        "end_datetime": "2030-07-02T20:00:00-05:00"
+    }
+
+    second = client.post("/reservations", headers=headers, json=same_local_day)
+
+    assert second.status_code == 409
+
+    cancel = client.delete(f"/reservations/{first.json()['id']}", headers=headers)
+
+    assert cancel.status_code == 200
+
+    third = client.post("/reservations", headers=headers, json=same_local_day)
+
+    assert third.status_code == 201
+
+    next_local_day = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-07-03T08:00:00-05:00",
+            "end_datetime": "2030-07-03T16:00:00-05:00"
+        }
+    )
+
+    assert next_local_day.status_code == 201
+
+
+def test_update_checks_the_daily_limit_on_the_stored_calendar_day(client):
+    headers = create_authenticated_user(client, prefix="stored_day")
+
+    # At +14:00 the morning of July 5th is still July 4th in UTC.
+    for space_name, start, end in (
+        ("desk_1", "2030-07-04T09:00:00+14:00", "2030-07-04T17:00:00+14:00"),
+        ("desk_1", "2030-07-05T10:00:00+14:00", "2030-07-05T17:00:00+14:00"),
+        ("desk_2", "2030-07-05T08:00:00+14:00", "2030-07-05T09:00:00+14:00")
+    ):
+        response = client.post(
+            "/reservations",
+            headers=headers,
+            json={"space_name": space_name, "start_datetime": start, "end_datetime": end}
+        )
+        assert response.status_code == 201
+
+    update = client.put(
+        f"/reservations/{response.json()['id']}",
+        headers=headers,
+        json={"space_name": "desk_3"}
+    )
+
+    assert update.status_code == 200
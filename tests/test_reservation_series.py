@@ -0,0 +1,136 @@
+from datetime import date, datetime, timezone
+
+from app.recurrence import expand_occurrences
+from tests.helpers import create_authenticated_user
+
+
+def test_expand_weekly_occurrences_on_weekdays():
+    occurrences = expand_occurrences(
+        datetime(2030, 9, 2, 9, 0, tzinfo=timezone.utc),
+        datetime(2030, 9, 2, 10, 0, tzinfo=timezone.utc),
+        "weekly",
+        by_weekday=[0, 2],
+        until=date(2030, 9, 11)
+    )
+
+    assert [start.date() for start, _ in occurrences] == [
+        date(2030, 9, 2),
+        date(2030, 9, 4),
+        date(2030, 9, 9),
+        date(2030, 9, 11)
+    ]
+    assert all((end - start).seconds == 3600 for start, end in occurrences)
+
+
+def test_create_daily_reservation_series(client):
+    headers = create_authenticated_user(client, "series")
+
+    response = client.post(
+        "/reservations/series",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-09-02T09:00:00Z",
+            "end_datetime": "2030-09-02T17:00:00Z",
+            "frequency": "daily",
+            "count": 5
+        }
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["frequency"] == "daily"
+    assert data["status"] == "active"
+    assert len(data["reservations"]) == 5
+    assert data["reservations"][4]["start_datetime"].startswith("2030-09-06T09:00:00")
+
+    listed = client.get("/reservations", headers=headers)
+    assert len(listed.json()) == 5
+
+
+def test_series_is_rejected_when_an_occurrence_conflicts(client):
+    headers = create_authenticated_user(client, "seriesconflict")
+    other_headers = create_authenticated_user(client, "seriesother")
+
+    existing = client.post(
+        "/reservations",
+        headers=other_headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-09-16T10:00:00Z",
+            "end_datetime": "2030-09-16T11:00:00Z"
+        }
+    )
+
+    assert existing.status_code == 201
+
+    response = client.post(
+        "/reservations/series",
+        headers=headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-09-02T09:00:00Z",
+            "end_datetime": "2030-09-02T12:00:00Z",
+            "frequency": "weekly",
+            "until": "2030-09-30"
+        }
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == [
+        {
+            "index": 2,
+            "start_datetime": "2030-09-16T09:00:00+00:00",
+            "status_code": 409,
+            "detail": "This space is already reserved during the selected time range."
+        }
+    ]
+
+    listed = client.get("/reservations", headers=headers)
+    assert listed.json() == []
+
+
+def test_cancel_reservation_series(client):
+    headers = create_authenticated_user(client, "seriescancel")
+
+    created = client.post(
+        "/reservations/series",
+        headers=headers,
+        json={
+            "space_name": "meeting_room_b",
+            "start_datetime": "2030-09-02T08:00:00Z",
+            "end_datetime": "2030-09-02T16:00:00Z",
+            "frequency": "weekly",
+            "by_weekday": [0, 1, 2, 3, 4],
+            "count": 10
+        }
+    )
+
+    assert created.status_code == 201
+
+    response = client.delete(
+        f"/reservations/series/{created.json()['id']}",
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "cancelled"
+    assert data["by_weekday"] == [0, 1, 2, 3, 4]
+    assert len(data["reservations"]) == 10
+    assert {reservation["status"] for reservation in data["reservations"]} == {"cancelled"}
+
+    listed = client.get("/reservations", headers=headers)
+    assert listed.json() == []
+
+    rebooked = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "meeting_room_b",
+            "start_datetime": "2030-09-03T08:00:00Z",
+            "end_datetime": "2030-09-03T16:00:00Z"
+        }
+    )
+
+    assert rebooked.status_code == 201
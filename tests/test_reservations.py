@@ -50,6 +50,71 @@ def test_get_my_reservations(client):
     assert len(response.json()) == 2
 
 
+
+def test_get_my_reservations_paginates_with_cursor(client):
+    headers = create_authenticated_user(client, "paged")
+
+    for day in (15, 13, 14, 16, 17):
+        response = client.post(
+            "/reservations",
+            headers=headers,
+            json={
+                "space_name": "desk_2" if day == 16 else "desk_1",
+                "start_datetime": f"2030-06-{day}T08:00:00Z",
+                "end_datetime": f"2030-06-{day}T09:00:00Z"
+            }
+        )
+        assert response.status_code == 201
+
+    first_page = client.get("/reservations?limit=2", headers=headers)
+    assert first_page.status_code == 200
+    assert [r["start_datetime"][:10] for r in first_page.json()] == ["2030-06-13", "2030-06-14"]
+
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(f"/reservations?limit=2&cursor={cursor}", headers=headers)
+    assert [r["start_datetime"][:10] for r in second_page.json()] == ["2030-06-15", "2030-06-16"]
+
+    cursor = second_page.headers["X-Next-Cursor"]
+    last_page = client.get(f"/reservations?limit=2&cursor={cursor}", headers=headers)
+    assert [r["start_datetime"][:10] for r in last_page.json()] == ["2030-06-17"]
+    assert "X-Next-Cursor" not in last_page.headers
+
+    filtered = client.get(
+        "/reservations",
+        headers=headers,
+        params={"from": "2030-06-14T00:00:00Z", "to": "2030-06-17T00:00:00Z", "space_name": "desk_1"}
+    )
+    assert [r["start_datetime"][:10] for r in filtered.json()] == ["2030-06-14", "2030-06-15"]
+
+    invalid = client.get("/reservations?cursor=not-a-cursor", headers=headers)
+    assert invalid.status_code == 400
+
+def test_get_my_reservations_pages_only_when_asked(client, monkeypatch):
+    monkeypatch.setattr("app.main.DEFAULT_PAGE_SIZE", 2)
+    headers = create_authenticated_user(client, "unpaged")
+
+    for day in (13, 14, 15, 16):
+        response = client.post(
+            "/reservations",
+            headers=headers,
+            json={
+                "space_name": "desk_1",
+                "start_datetime": f"2030-06-{day}T08:00:00Z",
+                "end_datetime": f"2030-06-{day}T09:00:00Z"
+            }
+        )
+        assert response.status_code == 201
+
+    everything = client.get("/reservations", headers=headers)
+    assert len(everything.json()) == 4
+    assert "X-Next-Cursor" not in everything.headers
+
+    first_page = client.get("/reservations?limit=1", headers=headers)
+    cursor = first_page.headers["X-Next-Cursor"]
+    default_page = client.get(f"/reservations?cursor={cursor}", headers=headers)
+    assert [r["start_datetime"][:10] for r in default_page.json()] == ["2030-06-14", "2030-06-15"]
+    assert "X-Next-Cursor" in default_page.headers
+
 def test_update_reservation(client):
     headers = create_authenticated_user(client, "update")
 
@@ -144,4 +209,45 @@ def test_user_cannot_access_other_user_reservation(client):
         headers=headers2
     )
 
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_cancelling_an_offset_reservation_frees_its_slots(client):
+    headers = create_authenticated_user(client, "offset_cancel")
+    other_headers = create_authenticated_user(client, "offset_cancel2")
+
+    created = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_3",
+            "start_datetime": "2030-06-20T08:00:00-05:00",
+            "end_datetime": "2030-06-20T10:00:00-05:00"
+        }
+    )
+    assert created.status_code == 201
+    assert created.json()["start_datetime"][:19] == "2030-06-20T13:00:00"
+
+    cancelled = client.delete(f"/reservations/{created.json()['id']}", headers=headers)
+    assert cancelled.status_code == 200
+
+    rebooked = client.post(
+        "/reservations",
+        headers=other_headers,
+        json={
+            "space_name": "desk_3",
+            "start_datetime": "2030-06-20T13:00:00Z",
+            "end_datetime": "2030-06-20T15:00:00Z"
+        }
+    )
+    assert rebooked.status_code == 201
+
+    own_rebooking = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-06-20T08:00:00-05:00",
+            "end_datetime": "2030-06-20T10:00:00-05:00"
+        }
+    )
+    assert own_rebooking.status_code == 201
@@ -0,0 +1,59 @@
+from datetime import date, datetime, timezone
+
+from app.slots import (
+    claim_slots,
+    decode_bitmap,
+    encode_bitmap,
+    release_slots,
+    reservation_masks,
+    reserved_minutes,
+    slot_masks
+)
+
+
+def test_reservation_masks_use_minutes_after_utc_midnight():
+    masks = reservation_masks(
+        datetime(2030, 7, 10, 8, 0, tzinfo=timezone.utc),
+        datetime(2030, 7, 10, 9, 30, tzinfo=timezone.utc)
+    )
+
+    mask = masks[date(2030, 7, 10)]
+    assert reserved_minutes(mask) == 90
+    assert mask >> (8 * 60) & 1
+    assert not mask >> (9 * 60 + 30) & 1
+
+
+def test_reservation_masks_split_at_utc_midnight():
+    masks = reservation_masks(
+        datetime.fromisoformat("2030-07-10T20:00:00-05:00"),
+        datetime.fromisoformat("2030-07-10T20:30:00-05:00")
+    )
+
+    assert masks == {date(2030, 7, 11): ((1 << 30) - 1) << 60}
+
+    masks = reservation_masks(
+        datetime(2030, 7, 10, 23, 30, tzinfo=timezone.utc),
+        datetime(2030, 7, 11, 0, 30, tzinfo=timezone.utc)
+    )
+
+    assert sorted(masks) == [date(2030, 7, 10), date(2030, 7, 11)]
+    assert reserved_minutes(masks[date(2030, 7, 10)]) == 30
+    assert reserved_minutes(masks[date(2030, 7, 11)]) == 30
+
+
+def test_consecutive_reservations_do_not_share_bits():
+    first = reservation_masks(datetime(2030, 7, 10, 8, 0), datetime(2030, 7, 10, 12, 0))
+    second = reservation_masks(datetime(2030, 7, 10, 12, 0), datetime(2030, 7, 10, 16, 0))
+
+    assert first[date(2030, 7, 10)] & second[date(2030, 7, 10)] == 0
+
+
+def test_claim_and_release_round_trip():
+    masks = slot_masks(7, "desk_1", datetime(2030, 7, 10, 8, 0), datetime(2030, 7, 10, 9, 0))
+
+    claimed = claim_slots({}, masks)
+    assert claimed[("space", "desk_1", date(2030, 7, 10))] == masks[("user", "7", date(2030, 7, 10))]
+    assert decode_bitmap(encode_bitmap(claimed[("user", "7", date(2030, 7, 10))])) == claimed[("user", "7", date(2030, 7, 10))]
+
+    released = release_slots(claimed, masks)
+    assert set(released.values()) == {0}
@@ -0,0 +1,160 @@
+from tests.helpers import create_authenticated_user
+
+
+def test_space_availability_without_reservations(client):
+    headers = create_authenticated_user(client, "available")
+
+    response = client.get(
+        "/spaces/meeting_room_a/availability?date=2030-07-05",
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["space_name"] == "meeting_room_a"
+    assert data["date"] == "2030-07-05"
+    assert data["free_windows"] == [
+        {
+            "start_datetime": "2030-07-05T08:00:00Z",
+            "end_datetime": "2030-07-05T20:00:00Z"
+        }
+    ]
+
+
+def test_space_availability_excludes_reserved_ranges(client):
+    headers = create_authenticated_user(client, "busy")
+
+    other_headers = create_authenticated_user(client, "busy2")
+
+    reservations = [
+        (headers, "10:00", "12:00"),
+        (headers, "12:00", "13:00"),
+        (other_headers, "19:00", "20:00")
+    ]
+
+    for owner_headers, start, end in reservations:
+        response = client.post(
+            "/reservations",
+            headers=owner_headers,
+            json={
+                "space_name": "meeting_room_a",
+                "start_datetime": f"2030-07-06T{start}:00Z",
+                "end_datetime": f"2030-07-06T{end}:00Z"
+            }
+        )
+        assert response.status_code == 201
+
+    response = client.get(
+        "/spaces/meeting_room_a/availability?date=2030-07-06",
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["free_windows"] == [
+        {
+            "start_datetime": "2030-07-06T08:00:00Z",
+            "end_datetime": "2030-07-06T10:00:00Z"
+        },
+        {
+            "start_datetime": "2030-07-06T13:00:00Z",
+            "end_datetime": "2030-07-06T19:00:00Z"
+        }
+    ]
+
+
+def test_space_availability_reflects_cancellations(client):
+    headers = create_authenticated_user(client, "freed")
+
+    create_response = client.post(
+        "/reservations",
+        headers=headers,
+        json={
+            "space_name": "desk_1",
+            "start_datetime": "2030-07-07T08:00:00Z",
+            "end_datetime": "2030-07-07T12:00:00Z"
+        }
+    )
+
+    assert create_response.status_code == 201
+
+    before = client.get(
+        "/spaces/desk_1/availability?date=2030-07-07",
+        headers=headers
+    )
+
+    assert len(before.json()["free_windows"]) == 1
+    assert before.json()["free_windows"][0]["start_datetime"] == "2030-07-07T12:00:00Z"
+
+    client.delete(
+        f"/reservations/{create_response.json()['id']}",
+        headers=headers
+    )
+
+    after = client.get(
+        "/spaces/desk_1/availability?date=2030-07-07",
+        headers=headers
+    )
+
+    assert after.json()["free_windows"] == [
+        {
+            "start_datetime": "2030-07-07T08:00:00Z",
+            "end_datetime": "2030-07-07T20:00:00Z"
+        }
+    ]
+
+
+def test_space_availability_windows_in_the_client_offset_can_be_booked(client):
+    headers = create_authenticated_user(client, "offset")
+    other_headers = create_authenticated_user(client, "offset2")
+
+    # 17:00-18:00 at +09:00, whose business hours start at 23:00 UTC the day before.
+    busy = client.post(
+        "/reservations",
+        headers=other_headers,
+        json={
+            "space_name": "desk_2",
+            "start_datetime": "2030-07-08T08:00:00Z",
+            "end_datetime": "2030-07-08T09:00:00Z"
+        }
+    )
+
+    assert busy.status_code == 201
+
+    response = client.get(
+        "/spaces/desk_2/availability",
+        params={"date": "2030-07-08", "utc_offset": "+09:00"},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    windows = response.json()["free_windows"]
+    assert windows == [
+        {
+            "start_datetime": "2030-07-08T08:00:00+09:00",
+            "end_datetime": "2030-07-08T17:00:00+09:00"
+        },
+        {
+            "start_datetime": "2030-07-08T18:00:00+09:00",
+            "end_datetime": "2030-07-08T20:00:00+09:00"
+        }
+    ]
+
+    booked = client.post(
+        "/reservations",
+        headers=headers,
+        json={"space_name": "desk_2", **windows[1]}
+    )
+
+    assert booked.status_code == 201
+
+
+def test_space_availability_rejects_malformed_offsets(client):
+    headers = create_authenticated_user(client, "bad_offset")
+
+    response = client.get(
+        "/spaces/desk_2/availability",
+        params={"date": "2030-07-08", "utc_offset": "+25:00"},
+        headers=headers
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,84 @@
+from app.cache import TTLCache
+from app.models import User
+from app.user_cache import CurrentUser, user_cache
+from tests.conftest import TestingSessionLocal
+from tests.helpers import create_authenticated_user
+
+
+def test_current_user_is_served_from_cache(client):
+    headers = create_authenticated_user(client, "cached")
+
+    assert client.get("/reservations", headers=headers).status_code == 200
+    misses = user_cache.stats()["misses"]
+
+    assert client.get("/reservations", headers=headers).status_code == 200
+    stats = user_cache.stats()
+
+    assert stats["misses"] == misses
+    assert stats["hits"] >= 1
+
+
+def test_deactivating_user_invalidates_cache(client):
+    headers = create_authenticated_user(client, "deactivated")
+    assert client.get("/reservations", headers=headers).status_code == 200
+
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email.like("deactivated_%")).first()
+        user.is_active = False
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.get("/reservations", headers=headers)
+    assert response.status_code == 403
+
+
+def test_user_is_invalidated_when_the_change_commits(client):
+    headers = create_authenticated_user(client, "flushed")
+    assert client.get("/reservations", headers=headers).status_code == 200
+
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email.like("flushed_%")).first()
+        user.role = "admin"
+        db.flush()
+
+        # A request that read the row before the commit caches the old role.
+        user_cache.set(user.id, CurrentUser(id=user.id, role="user", is_active=True))
+        db.commit()
+
+        assert user_cache.get(user.id) is None
+    finally:
+        db.close()
+
+
+def test_rolled_back_change_leaves_the_cache_alone(client):
+    headers = create_authenticated_user(client, "rolled_back")
+    assert client.get("/reservations", headers=headers).status_code == 200
+
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email.like("rolled_back_%")).first()
+        user.is_active = False
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert user_cache.get(user.id) is not None
+    finally:
+        db.close()
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl_seconds=-1)
+    assert cache.get("d") is None
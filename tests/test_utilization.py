@@ -0,0 +1,63 @@
+import numpy as np
+
+from app.utilization import occupancy_matrix
+from tests.helpers import create_authenticated_user
+
+
+def test_occupancy_matrix_rasterizes_intervals_across_days():
+    occupied = occupancy_matrix(
+        np.array([0, 1, 0]),
+        np.array([60, 1430, 90]),
+        np.array([120, 1450, 100]),
+        spaces=2,
+        days=2
+    )
+
+    assert occupied.shape == (2, 2, 1440)
+    assert occupied[0, 0].sum() == 60
+    assert occupied[1, 0, 1430:].all() and occupied[1, 1, :10].all()
+    assert occupied[1].sum() == 20
+
+
+def test_admin_utilization_reports_percentages_and_peaks(client):
+    headers = create_authenticated_user(client, "busy")
+
+    for day in (1, 2):
+        response = client.post(
+            "/reservations",
+            headers=headers,
+            json={
+                "space_name": "meeting_room_a",
+                "start_datetime": f"2030-11-0{day}T09:00:00Z",
+                "end_datetime": f"2030-11-0{day}T12:00:00Z"
+            }
+        )
+        assert response.status_code == 201
+
+    assert client.get(
+        "/admin/utilization?from=2030-11-01&to=2030-11-02",
+        headers=headers
+    ).status_code == 403
+
+    response = client.get(
+        "/admin/utilization?from=2030-11-01&to=2030-11-02&granularity=1h",
+        headers=create_authenticated_user(client, "admin", role="admin")
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    room = next(space for space in data["spaces"] if space["space_name"] == "meeting_room_a")
+
+    assert data["granularity_minutes"] == 60
+    assert room["utilization_percent"] == 25.0  # 3 of 12 business hours
+    assert [slot["slot"] for slot in room["peak_hours"]] == ["09:00", "10:00", "11:00"]
+    assert room["slots"][1] == {"slot": "09:00", "utilization_percent": 100.0}
+
+
+def test_utilization_rejects_invalid_granularity(client):
+    response = client.get(
+        "/admin/utilization?from=2030-11-01&to=2030-11-02&granularity=7m",
+        headers=create_authenticated_user(client, "admin", role="admin")
+    )
+
+    assert response.status_code == 400